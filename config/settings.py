@@ -2,10 +2,8 @@ import functools
 import json
 import os
 from abc import ABC
-from typing import Any
+from typing import Optional
 
-import boto3
-from botocore.config import Config as BotoConfig
 from pydantic import ConfigDict, SecretStr
 from pydantic_settings import BaseSettings
 
@@ -20,6 +18,140 @@ class AbstractSettings(BaseSettings, ABC):
 
     open_search_domain: str = os.getenv("OPENSEARCH_DOMAIN", "localhost")
     opensearch_port: int = int(os.getenv("OPENSEARCH_PORT", "80"))
+    # Connections kept per process; match it to the request threads of a worker.
+    opensearch_pool_maxsize: int = int(os.getenv("OPENSEARCH_POOL_MAXSIZE", "40"))
+    # Gzips request bodies (index/bulk calls). opensearch-py also advertises
+    # gzip support for responses whenever request compression is enabled.
+    # scripts/benchmark_compression.py measures the bytes and time saved.
+    opensearch_request_compression: bool = (
+        os.getenv("OPENSEARCH_REQUEST_COMPRESSION", "true").lower() == "true"
+    )
+    # Asks OpenSearch for gzipped responses (search/export results) even when
+    # request bodies are sent uncompressed.
+    opensearch_response_compression: bool = (
+        os.getenv("OPENSEARCH_RESPONSE_COMPRESSION", "true").lower() == "true"
+    )
+    # Routes writes and CNPJ-filtered reads to a single shard per tenant.
+    opensearch_cnpj_routing: bool = (
+        os.getenv("OPENSEARCH_CNPJ_ROUTING", "true").lower() == "true"
+    )
+    # First month (YYYY.MM) whose indices only hold routed audits. Reads that
+    # may hit earlier months stay unrouted, so audits stored before routing
+    # (and not reindexed since) are still found. Unset when every stored
+    # audit is routed.
+    opensearch_routing_cutover: Optional[str] = (
+        os.getenv("OPENSEARCH_ROUTING_CUTOVER") or None
+    )
+    # JSON list of high-volume CNPJs whose audits live in dedicated indices.
+    opensearch_dedicated_tenants: list[str] = json.loads(
+        os.getenv("OPENSEARCH_DEDICATED_TENANTS", "[]")
+    )
+    jwt_auth_enabled: bool = os.getenv("JWT_AUTH_ENABLED", "false").lower() == "true"
+    jwks_cache_ttl_seconds: int = int(os.getenv("JWKS_CACHE_TTL_SECONDS", "3600"))
+    # Minimum time between two JWKS downloads of an issuer on unknown kids.
+    jwks_min_refresh_interval_seconds: int = int(
+        os.getenv("JWKS_MIN_REFRESH_INTERVAL_SECONDS", "60")
+    )
+    # Verified tokens whose claims are kept in memory until they expire.
+    jwt_claims_cache_size: int = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "1024"))
+    secret_cache_ttl_seconds: int = int(os.getenv("SECRET_CACHE_TTL_SECONDS", "300"))
+    metrics_namespace: str = os.getenv("METRICS_NAMESPACE", "audit_api")
+    metrics_flush_interval_seconds: int = int(
+        os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "10")
+    )
+    # JSON list of the steps run at Lambda init and on every lambdawarmer ping.
+    # Available: container, search_engine, secrets, models.
+    warmup_steps: list[str] = json.loads(
+        os.getenv("WARMUP_STEPS", '["container", "search_engine", "secrets", "models"]')
+    )
+    # Production server (presentation/api/boot_server.py).
+    server_host: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    server_port: int = int(os.getenv("SERVER_PORT", "8000"))
+    server_workers: int = int(os.getenv("SERVER_WORKERS", str(os.cpu_count() or 1)))
+    # Time given to in-flight requests (e.g. audit writes) after a SIGTERM.
+    server_graceful_timeout_seconds: int = int(
+        os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", "30")
+    )
+    server_worker_timeout_seconds: int = int(
+        os.getenv("SERVER_WORKER_TIMEOUT_SECONDS", "60")
+    )
+    # Above the load balancer idle timeout, so it never reuses a closed socket.
+    server_keepalive_seconds: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "75"))
+    # Recycles a worker after this many requests; 0 disables it.
+    server_max_requests: int = int(os.getenv("SERVER_MAX_REQUESTS", "0"))
+    rate_limit_enabled: bool = (
+        os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+    )
+    # Sustained audits per second and burst allowed to each application.
+    rate_limit_application_rate: float = float(
+        os.getenv("RATE_LIMIT_APPLICATION_RATE", "100")
+    )
+    rate_limit_application_burst: float = float(
+        os.getenv("RATE_LIMIT_APPLICATION_BURST", "200")
+    )
+    # JSON object of per-application limits, e.g. {"billing": {"rate": 500,
+    # "burst": 1000}}.
+    rate_limit_application_overrides: dict[str, dict[str, float]] = json.loads(
+        os.getenv("RATE_LIMIT_APPLICATION_OVERRIDES", "{}")
+    )
+    # Per-CNPJ limits; a rate of 0 disables them.
+    rate_limit_cnpj_rate: float = float(os.getenv("RATE_LIMIT_CNPJ_RATE", "0"))
+    rate_limit_cnpj_burst: float = float(os.getenv("RATE_LIMIT_CNPJ_BURST", "0"))
+    rate_limit_max_buckets: int = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "10000"))
+    # The live tail fans audits out within a process, so it is only served by
+    # single worker servers; multi-worker servers refuse to start with it and
+    # Lambda environments never enable it.
+    live_tail_enabled: bool = os.getenv("LIVE_TAIL_ENABLED", "false").lower() == "true"
+    # Audits buffered per live tail subscriber before the oldest are dropped.
+    live_tail_queue_size: int = int(os.getenv("LIVE_TAIL_QUEUE_SIZE", "1000"))
+    live_tail_heartbeat_seconds: int = int(
+        os.getenv("LIVE_TAIL_HEARTBEAT_SECONDS", "15")
+    )
+    # API responses smaller than this many bytes are sent uncompressed.
+    response_compression_minimum_size: int = int(
+        os.getenv("RESPONSE_COMPRESSION_MINIMUM_SIZE", "1024")
+    )
+    response_compression_level: int = int(os.getenv("RESPONSE_COMPRESSION_LEVEL", "6"))
+    # Seals ingested audits into a tamper-evident chain of Merkle checkpoints.
+    integrity_enabled: bool = os.getenv("INTEGRITY_ENABLED", "false").lower() == "true"
+    integrity_batch_size: int = int(os.getenv("INTEGRITY_BATCH_SIZE", "1000"))
+    # Batches of low-traffic applications are sealed after this long.
+    integrity_max_batch_age_seconds: int = int(
+        os.getenv("INTEGRITY_MAX_BATCH_AGE_SECONDS", "60")
+    )
+    # Parallel slices the audits of a month are streamed in when verified.
+    integrity_verify_slices: int = int(os.getenv("INTEGRITY_VERIFY_SLICES", "4"))
+    # Local path or `s3://bucket/prefix` closed months are archived to as
+    # Parquet; empty disables the archive.
+    archive_uri: str = os.getenv("ARCHIVE_URI", "")
+    # Months kept on OpenSearch, the current one included; searches starting
+    # earlier also read the archive.
+    archive_hot_retention_months: int = int(
+        os.getenv("ARCHIVE_HOT_RETENTION_MONTHS", "13")
+    )
+    archive_row_group_size: int = int(os.getenv("ARCHIVE_ROW_GROUP_SIZE", "100000"))
+    archive_compression: str = os.getenv("ARCHIVE_COMPRESSION", "zstd")
+    # Parallel slices a month is streamed and written in when archived.
+    archive_slices: int = int(os.getenv("ARCHIVE_SLICES", "4"))
+    # JSON list of chatty event types whose identical audits (same application,
+    # cnpj, actor and resource) are coalesced within a window.
+    coalescing_event_types: list[str] = json.loads(
+        os.getenv("COALESCING_EVENT_TYPES", "[]")
+    )
+    coalescing_window_seconds: int = int(os.getenv("COALESCING_WINDOW_SECONDS", "5"))
+    coalescing_max_windows: int = int(os.getenv("COALESCING_MAX_WINDOWS", "10000"))
+    # Delay for a schema registered on a process to be enforced on the others.
+    event_schema_cache_ttl_seconds: int = int(
+        os.getenv("EVENT_SCHEMA_CACHE_TTL_SECONDS", "60")
+    )
+    # Margin left to recent writes to become searchable before being rolled up.
+    rollup_settle_seconds: int = int(os.getenv("ROLLUP_SETTLE_SECONDS", "60"))
+    # Days aggregated in parallel by the daily rollup job.
+    rollup_workers: int = int(os.getenv("ROLLUP_WORKERS", "4"))
+    # Records the distinct actors and resource ids of the written audits for
+    # the typeahead; the values last seen by a process are not written again.
+    typeahead_enabled: bool = os.getenv("TYPEAHEAD_ENABLED", "true").lower() == "true"
+    typeahead_cache_size: int = int(os.getenv("TYPEAHEAD_CACHE_SIZE", "100000"))
 
 
 class Settings(AbstractSettings):
@@ -28,27 +160,6 @@ class Settings(AbstractSettings):
     AUTH0_SECRET_ARN: SecretStr
     DATABASE_SECRET_ARN: SecretStr
 
-    @property
-    @functools.lru_cache
-    def auth0_tenants(self) -> dict:
-        secret_value = _secret_value_from_arn(self.AUTH0_SECRET_ARN.get_secret_value())
-
-        return secret_value
-
-    @property
-    @functools.lru_cache
-    def database_uri(self) -> str:
-        secret_value = _secret_value_from_arn(
-            self.DATABASE_SECRET_ARN.get_secret_value()
-        )
-
-        user = secret_value["username"]
-        password = secret_value["password"]
-        database_name = secret_value["dbname"]
-        database_host = secret_value["host"]
-
-        return f"mysql+pymysql://{user}:{password}@{database_host}/{database_name}"
-
 
 class LocalSettings(AbstractSettings):
     """
@@ -60,33 +171,6 @@ class LocalSettings(AbstractSettings):
         super().__init__(*args, **kwargs)
 
 
-def _secret_value_from_arn(secret_arn: str) -> dict[str, Any]:
-    """Returns the secret value from the given secret ARN.
-
-    Parameters
-    ----------
-    secret_arn_variable : str
-        The name of the environment variable containing the secret ARN.
-
-    Returns
-    -------
-    Dict[str, Any]
-        The secret value.
-    """
-    client = boto3.client(
-        "secretsmanager",
-        config=BotoConfig(
-            connect_timeout=3,
-            read_timeout=3,
-        ),
-    )
-
-    secret = client.get_secret_value(SecretId=secret_arn)
-    secret_value = json.loads(secret["SecretString"])
-
-    return secret_value
-
-
 @functools.lru_cache
 def _load_settings(env: str) -> Settings:
     """Loads the settings based on the given environment.
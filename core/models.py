@@ -1,5 +1,5 @@
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import date, datetime, timezone
+from typing import Literal, Optional
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
@@ -55,3 +55,365 @@ class SampleModel(DomainBaseModel):
     children: Optional[list[SampleChildModel]] = Field(
         description="list of children of the Sample", default=[]
     )
+
+
+class AuditModel(BaseModel):
+    """
+    Represents an audit event stored in the search engine.
+    Searches may project only some fields, so all of them but the id are
+    optional and only the returned ones are set.
+
+    Attributes
+    ----------
+    id : str
+        The identifier of the audit document.
+    actor : Optional[str]
+        Who performed the audited action.
+    event_type : Optional[str]
+        The kind of the audited action.
+    application : Optional[str]
+        The application that emitted the audit.
+    cnpj : Optional[str]
+        The tenant (CNPJ) the audit belongs to.
+    resource_id : Optional[str]
+        The identifier of the resource affected by the action.
+    timestamp : Optional[str]
+        When the action happened.
+    metadata : Optional[dict]
+        Free-form details of the action.
+    ingested_at : Optional[str]
+        When the audit was stored.
+    integrity : Optional[dict]
+        The integrity stamp of the audit, when integrity mode is enabled.
+    coalesced : Optional[dict]
+        How many identical audits this one stands for, when repeats of its
+        event type are coalesced.
+    """
+
+    id: str = Field(description="Identifier of the audit document.")
+    actor: Optional[str] = Field(default=None, description="Who did the action.")
+    event_type: Optional[str] = Field(default=None, description="Kind of action.")
+    application: Optional[str] = Field(default=None, description="Emitting app.")
+    cnpj: Optional[str] = Field(default=None, description="Tenant CNPJ.")
+    resource_id: Optional[str] = Field(default=None, description="Affected resource.")
+    timestamp: Optional[str] = Field(default=None, description="When it happened.")
+    metadata: Optional[dict] = Field(default=None, description="Action details.")
+    ingested_at: Optional[str] = Field(default=None, description="When it was stored.")
+    integrity: Optional[dict] = Field(default=None, description="Integrity stamp.")
+    coalesced: Optional[dict] = Field(default=None, description="Coalesced repeats.")
+
+
+class AuditEventFilters(BaseModel):
+    """
+    Represents the exact-match filters of audit events
+
+    Attributes
+    ----------
+    application : Optional[str]
+        Restricts to the audits of an application.
+    cnpj : Optional[str]
+        Restricts to the audits of a tenant.
+    actor : Optional[str]
+        Restricts to the audits performed by an actor.
+    event_type : Optional[str]
+        Restricts to an event type.
+    resource_id : Optional[str]
+        Restricts to the audits of a resource.
+    """
+
+    application: Optional[str] = Field(default=None, description="Application name.")
+    cnpj: Optional[str] = Field(default=None, description="Tenant CNPJ.")
+    actor: Optional[str] = Field(default=None, description="Actor of the audits.")
+    event_type: Optional[str] = Field(default=None, description="Event type.")
+    resource_id: Optional[str] = Field(default=None, description="Resource id.")
+
+
+class AuditSearchFilters(AuditEventFilters):
+    """
+    Represents the filters of an audit search
+
+    Attributes
+    ----------
+    start_date : Optional[date]
+        Only audits that happened on or after this date.
+    end_date : Optional[date]
+        Only audits that happened on or before this date.
+    """
+
+    start_date: Optional[date] = Field(default=None, description="Lower date bound.")
+    end_date: Optional[date] = Field(default=None, description="Upper date bound.")
+
+    def has_valid_date_range(self) -> bool:
+        """Whether `start_date` is not after `end_date`, when both are set."""
+        if self.start_date and self.end_date:
+            return self.start_date <= self.end_date
+
+        return True
+
+
+class IntegrityStamp(BaseModel):
+    """
+    Ties an audit to the integrity batch that seals it
+
+    Attributes
+    ----------
+    hash : str
+        SHA-256 of the canonical JSON of the audit.
+    batch : str
+        The identifier of the batch the audit belongs to.
+    month : str
+        The month (YYYY.MM) of the audit index and of the batch.
+    """
+
+    hash: str = Field(description="SHA-256 of the canonical audit.")
+    batch: str = Field(description="Identifier of the integrity batch.")
+    month: str = Field(description="Month (YYYY.MM) of the audit index.")
+
+
+class CoalescedSummary(BaseModel):
+    """
+    Repeats of an audit merged into it
+
+    Attributes
+    ----------
+    count : int
+        The number of identical audits, the stored one included.
+    first_timestamp : str
+        The timestamp of the first of them.
+    last_timestamp : str
+        The timestamp of the last of them.
+    recorded_at : Optional[str]
+        When the repeats were recorded on the stored audit, so the rollups
+        of its day are refreshed.
+    integrity : Optional[IntegrityStamp]
+        Ties the summary to the integrity batch that seals it.
+    """
+
+    count: int = Field(description="Identical audits, the stored one included.")
+    first_timestamp: str = Field(description="Timestamp of the first of them.")
+    last_timestamp: str = Field(description="Timestamp of the last of them.")
+    recorded_at: Optional[str] = Field(
+        default=None, description="When the repeats were recorded."
+    )
+    integrity: Optional[IntegrityStamp] = Field(
+        default=None, description="Integrity batch sealing the summary."
+    )
+
+
+class IntegrityCheckpoint(BaseModel):
+    """
+    Seals a batch of audits: the Merkle root of their hashes, chained to the
+    previous checkpoint of the same chain
+
+    Attributes
+    ----------
+    batch : str
+        The identifier of the sealed batch.
+    chain : str
+        The identifier of the chain (one per writing process).
+    sequence : int
+        The position of the checkpoint in its chain.
+    application : str
+        The application of the sealed audits.
+    month : str
+        The month (YYYY.MM) of the sealed audits.
+    count : int
+        The number of sealed audits.
+    root : str
+        The Merkle root of the audit hashes.
+    previous_hash : Optional[str]
+        The hash of the previous checkpoint of the chain.
+    hash : str
+        The hash of this checkpoint, linking the next one.
+    sealed_at : datetime
+        When the batch was sealed.
+    """
+
+    batch: str = Field(description="Identifier of the sealed batch.")
+    chain: str = Field(description="Identifier of the chain.")
+    sequence: int = Field(description="Position of the checkpoint in its chain.")
+    application: str = Field(description="Application of the sealed audits.")
+    month: str = Field(description="Month (YYYY.MM) of the sealed audits.")
+    count: int = Field(description="Number of sealed audits.")
+    root: str = Field(description="Merkle root of the audit hashes.")
+    previous_hash: Optional[str] = Field(description="Previous checkpoint hash.")
+    hash: str = Field(description="Hash of this checkpoint.")
+    sealed_at: datetime = Field(description="When the batch was sealed.")
+
+
+class IntegrityReport(BaseModel):
+    """
+    Outcome of the integrity verification of an application month
+
+    Attributes
+    ----------
+    application : str
+        The verified application.
+    month : str
+        The verified month (YYYY.MM).
+    valid : bool
+        Whether no tampering nor inconsistency was found.
+    audits : int
+        The number of scanned audits.
+    checkpoints : int
+        The number of checkpoints of the month.
+    tampered_audits : list[str]
+        Audits whose content or coalesced repeats no longer match their
+        stamped hash.
+    mismatched_batches : list[str]
+        Sealed batches whose audits no longer produce the sealed root, i.e.
+        audits were removed, added or altered along with their stamp.
+    broken_chains : list[str]
+        Chains with a missing, reordered or altered checkpoint.
+    unsealed_batches : list[str]
+        Batches with audits but no checkpoint yet.
+    unstamped_audits : int
+        Audits written without integrity stamp; they fail the verification
+        of a month with checkpoints.
+    """
+
+    application: str = Field(description="Verified application.")
+    month: str = Field(description="Verified month (YYYY.MM).")
+    valid: bool = Field(description="Whether no inconsistency was found.")
+    audits: int = Field(description="Number of scanned audits.")
+    checkpoints: int = Field(description="Number of checkpoints of the month.")
+    tampered_audits: list[str] = Field(description="Audits not matching their hash.")
+    mismatched_batches: list[str] = Field(description="Batches not matching root.")
+    broken_chains: list[str] = Field(description="Chains with broken links.")
+    unsealed_batches: list[str] = Field(description="Batches without checkpoint.")
+    unstamped_audits: int = Field(description="Audits without integrity stamp.")
+
+
+class BulkWriteReport(BaseModel):
+    """
+    Progress, and eventually outcome, of a bulk write job
+
+    Attributes
+    ----------
+    tasks : int
+        The number of tasks of the job.
+    completed_tasks : int
+        The tasks done, including those completed by a previous run.
+    resumed_tasks : int
+        The tasks skipped because a previous run completed them.
+    written : int
+        The audits written by this run.
+    failed : int
+        The audits this run could not write.
+    elapsed_seconds : float
+        The duration of this run so far.
+    audits_per_second : float
+        The write throughput of this run.
+    """
+
+    tasks: int = Field(description="Number of tasks of the job.")
+    completed_tasks: int = Field(description="Tasks done, previous runs included.")
+    resumed_tasks: int = Field(description="Tasks completed by a previous run.")
+    written: int = Field(description="Audits written by this run.")
+    failed: int = Field(description="Audits this run could not write.")
+    elapsed_seconds: float = Field(description="Duration of this run so far.")
+    audits_per_second: float = Field(description="Write throughput of this run.")
+
+
+MetadataFieldType = Literal[
+    "keyword", "text", "integer", "number", "boolean", "date", "object"
+]
+
+
+class EventSchema(BaseModel):
+    """
+    Metadata schema an application declares for one of its event types
+
+    Attributes
+    ----------
+    application : str
+        The application emitting the event type.
+    event_type : str
+        The described event type.
+    fields : dict[str, MetadataFieldType]
+        The type of each metadata field.
+    required : list[str]
+        The fields every audit of the event type must carry.
+    additional_fields : bool
+        Whether metadata fields not declared are accepted.
+    """
+
+    application: str = Field(description="Application emitting the event type.")
+    event_type: str = Field(description="Described event type.")
+    fields: dict[str, MetadataFieldType] = Field(description="Metadata field types.")
+    required: list[str] = Field(default_factory=list, description="Required fields.")
+    additional_fields: bool = Field(
+        default=True, description="Whether undeclared fields are accepted."
+    )
+
+
+class EventSchemaRegistration(BaseModel):
+    """
+    Outcome of the declaration of an event type schema
+
+    Attributes
+    ----------
+    mapping : dict
+        The mapping fragment applied to the indices of the application.
+    applied_to_current_indices : bool
+        Whether the indices of the current month got the mapping; when a
+        declared field was already mapped with another type, it only applies
+        from the indices of the next month.
+    """
+
+    mapping: dict = Field(description="Mapping applied to the application indices.")
+    applied_to_current_indices: bool = Field(
+        description="Whether the current month indices got the mapping."
+    )
+
+
+class DailyActivity(BaseModel):
+    """
+    Audits of a tenant and event type on a day (UTC)
+
+    Attributes
+    ----------
+    application : str
+        The application that emitted the audits.
+    cnpj : str
+        The tenant the audits belong to.
+    event_type : str
+        The event type of the audits.
+    day : date
+        The day the audits happened.
+    count : int
+        The number of audits.
+    distinct_actors : int
+        The number of distinct actors of the audits.
+    """
+
+    application: str = Field(description="Application that emitted the audits.")
+    cnpj: str = Field(description="Tenant CNPJ.")
+    event_type: str = Field(description="Event type.")
+    day: date = Field(description="Day the audits happened, in UTC.")
+    count: int = Field(description="Number of audits.")
+    distinct_actors: int = Field(description="Number of distinct actors.")
+
+
+class RollupReport(BaseModel):
+    """
+    Outcome of a run of the daily rollup job
+
+    Attributes
+    ----------
+    application : str
+        The rolled up application.
+    high_water_mark : Optional[str]
+        Audits ingested up to this moment are rolled up.
+    days : int
+        The days rolled up again by this run.
+    rollups : int
+        The daily summaries written by this run.
+    """
+
+    application: str = Field(description="Rolled up application.")
+    high_water_mark: Optional[str] = Field(
+        default=None, description="Audits ingested up to this moment are rolled up."
+    )
+    days: int = Field(description="Days rolled up again by this run.")
+    rollups: int = Field(description="Daily summaries written by this run.")
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+from core.models import AuditModel, AuditSearchFilters
+
+
+class AuditArchive(ABC):
+    @abstractmethod
+    def write_part(
+        self,
+        staging: str,
+        part: int,
+        documents: Iterable[tuple[str, dict]],
+    ) -> int:
+        """Writes a part of a month from its stored audits to the `staging`
+        area, out of reach of the searches, returning how many were written."""
+
+    @abstractmethod
+    def replace_month(self, application: str, month: str, staging: str) -> None:
+        """Swaps the parts written to `staging` in for the archived audits of
+        an application month, if any."""
+
+    @abstractmethod
+    def discard(self, staging: str) -> None:
+        """Removes the parts written to `staging`, if any."""
+
+    @abstractmethod
+    def search(
+        self,
+        filters: AuditSearchFilters,
+        size: int,
+        months: list[str],
+        includes: Optional[list[str]] = None,
+        excludes: Optional[list[str]] = None,
+    ) -> list[AuditModel]:
+        """Searches the archived audits of the given months (YYYY.MM)."""
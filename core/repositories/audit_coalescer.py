@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+
+class AuditCoalescer(ABC):
+    @abstractmethod
+    def coalesce(
+        self, data: CreateAuditInput, write: Callable[[CreateAuditInput], dict]
+    ) -> bool:
+        """Either writes the audit with `write`, returning True, or merges it
+        into an identical audit written shortly before, returning False."""
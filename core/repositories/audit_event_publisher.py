@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+
+class AuditEventPublisher(ABC):
+    @abstractmethod
+    def publish(self, data: CreateAuditInput) -> None:
+        pass
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from core.models import CoalescedSummary, IntegrityStamp
+
+if TYPE_CHECKING:
+    from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+
+class AuditIntegrityChain(ABC):
+    @abstractmethod
+    def stamp(self, data: CreateAuditInput) -> IntegrityStamp:
+        """Hashes an audit about to be written and reserves it a batch slot."""
+
+    @abstractmethod
+    def stamp_coalesced(
+        self, data: CreateAuditInput, summary: CoalescedSummary
+    ) -> IntegrityStamp:
+        """Hashes the repeats about to be recorded on a stored audit and
+        reserves them a batch slot of the audit month."""
+
+    @abstractmethod
+    def settle(self, stamp: IntegrityStamp, stored: bool) -> None:
+        """Releases the slot of a stamped audit or summary once its write is
+        over."""
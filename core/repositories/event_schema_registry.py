@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from pydantic import TypeAdapter
+
+from core.models import EventSchema, EventSchemaRegistration
+
+
+class EventSchemaRegistry(ABC):
+    @abstractmethod
+    def validator_for(self, application: str, event_type: str) -> Optional[TypeAdapter]:
+        """Returns the compiled metadata schema of an event type, if declared."""
+
+    @abstractmethod
+    def register(self, schema: EventSchema) -> EventSchemaRegistration:
+        """Declares or replaces the schema of an event type, returning the
+        mapping fragment applied to the indices of its application and
+        whether the current ones got it."""
+
+    @abstractmethod
+    def list_schemas(self, application: Optional[str] = None) -> list[EventSchema]:
+        """Returns the declared schemas, optionally of a single application."""
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+
+class JobCheckpoint(ABC):
+    @abstractmethod
+    def completed(self) -> set[str]:
+        """Returns the tasks completed by previous runs of the job."""
+
+    @abstractmethod
+    def complete(self, task: str) -> None:
+        """Durably records a task as completed."""
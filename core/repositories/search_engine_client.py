@@ -1,7 +1,21 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from core.models import (
+    AuditModel,
+    AuditSearchFilters,
+    CoalescedSummary,
+    DailyActivity,
+    EventSchema,
+    IntegrityCheckpoint,
+)
 
-from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+if TYPE_CHECKING:
+    from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
 
 
 @dataclass
@@ -9,3 +23,147 @@ class SearchEngineClient(ABC):
     @abstractmethod
     def upsert(self, data: CreateAuditInput) -> dict:
         pass
+
+    @abstractmethod
+    def bulk_upsert(
+        self,
+        data: list[CreateAuditInput],
+        ids: Optional[list[str]] = None,
+        month: Optional[str] = None,
+        index_suffix: str = "",
+    ) -> int:
+        """Writes audits in a single bulk request, returning how many were
+        written.
+
+        `ids` keeps the identifiers of rewritten audits, `month` (YYYY.MM)
+        forces their monthly index and `index_suffix` is appended to the
+        index names, to rewrite into new indices.
+        """
+
+    @abstractmethod
+    def delete_moved(
+        self,
+        data: list[CreateAuditInput],
+        ids: list[str],
+        month: str,
+        routings: Optional[list[Optional[str]]] = None,
+    ) -> int:
+        """Deletes the copies rewritten audits left in other indices of their
+        month (YYYY.MM) than the one `bulk_upsert` wrote them to, returning
+        how many were deleted.
+
+        `routings` are the routings the audits were stored with: the copies
+        of audits whose routing changed are also deleted from the index they
+        were written to, where they sit on another shard.
+        """
+
+    @abstractmethod
+    def update_coalesced(
+        self, updates: list[tuple[dict, str, CoalescedSummary]]
+    ) -> set[str]:
+        """Records on stored audits the repeats coalesced into them, returning
+        the ids of the audits not updated.
+
+        Each update holds the response of the `upsert` that stored the audit,
+        its CNPJ and its summary.
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        filters: AuditSearchFilters,
+        size: int,
+        includes: Optional[list[str]] = None,
+        excludes: Optional[list[str]] = None,
+    ) -> list[AuditModel]:
+        pass
+
+    @abstractmethod
+    def count(self, filters: AuditSearchFilters) -> int:
+        pass
+
+    @abstractmethod
+    def exists(self, filters: AuditSearchFilters) -> bool:
+        pass
+
+    @abstractmethod
+    def save_checkpoint(self, checkpoint: IntegrityCheckpoint) -> None:
+        pass
+
+    @abstractmethod
+    def list_checkpoints(
+        self, application: str, month: str
+    ) -> list[IntegrityCheckpoint]:
+        pass
+
+    @abstractmethod
+    def scan_month(
+        self,
+        application: str,
+        month: str,
+        slice_id: Optional[int] = None,
+        slices: Optional[int] = None,
+    ) -> Iterator[tuple[str, dict, Optional[str]]]:
+        """Streams the id, stored content and routing of every audit of an
+        application month, optionally restricted to one of `slices` disjoint
+        slices."""
+
+    @abstractmethod
+    def save_event_schema(self, schema: EventSchema) -> None:
+        pass
+
+    @abstractmethod
+    def list_event_schemas(
+        self, application: Optional[str] = None
+    ) -> list[EventSchema]:
+        pass
+
+    @abstractmethod
+    def put_metadata_mapping(self, application: str, mapping: dict) -> bool:
+        """Applies a mapping fragment to the future indices of an application
+        and, when compatible, to its current ones, returning whether the
+        current ones got it."""
+
+    @abstractmethod
+    def daily_activity(self, filters: AuditSearchFilters) -> Iterator[DailyActivity]:
+        """Aggregates the stored audits matching the filters per tenant,
+        keyed by its normalized CNPJ, event type and day, counting their
+        coalesced repeats."""
+
+    @abstractmethod
+    def ingested_days(
+        self, application: str, after: Optional[str], until: str
+    ) -> list[date]:
+        """Returns the days of the audits an application ingested, or whose
+        coalesced repeats it recorded, after `after`, or ever when None, and
+        up to `until`."""
+
+    @abstractmethod
+    def save_rollups(self, application: str, rollups: list[DailyActivity]) -> None:
+        pass
+
+    @abstractmethod
+    def search_rollups(self, filters: AuditSearchFilters) -> list[DailyActivity]:
+        pass
+
+    @abstractmethod
+    def get_rollup_high_water_mark(self, application: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def save_rollup_high_water_mark(
+        self, application: str, high_water_mark: str
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def suggest(
+        self,
+        lookup_field: str,
+        prefix: str,
+        size: int,
+        application: Optional[str] = None,
+        cnpj: Optional[str] = None,
+    ) -> list[str]:
+        """Returns distinct values of the audit field `lookup_field` (`actor`
+        or `resource_id`) starting with `prefix`, ignoring case."""
@@ -0,0 +1,4 @@
+def normalize_application(application: str) -> str:
+    """Returns an application name lowercased with underscores as hyphens, the
+    form it is keyed, limited and named in indices by."""
+    return application.lower().replace("_", "-")
@@ -0,0 +1,164 @@
+"""
+Parallel, resumable bulk writing of audits, shared by the reindex and
+backfill jobs.
+
+A job is split into named tasks, each producing batches of audits written
+through `SearchEngineClient.bulk_upsert`. Tasks run on a pool of workers and
+are recorded in a checkpoint once all their audits are written, so a job run
+again skips them.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from core.models import BulkWriteReport
+from core.repositories.job_checkpoint import JobCheckpoint
+from core.repositories.search_engine_client import SearchEngineClient
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+Item = TypeVar("Item")
+
+# A batch of audits, their identifiers when they keep them (rewritten or
+# imported again), the month (YYYY.MM) of the indices they go to, when not
+# the month they are written in, and the routings of the audits rewritten.
+AuditBatch = tuple[
+    list[CreateAuditInput],
+    Optional[list[str]],
+    Optional[str],
+    Optional[list[Optional[str]]],
+]
+
+
+@dataclass
+class BulkWriteTask:
+    """
+    `index_suffix` is appended to the names of the indices written to. When
+    the task `moves` stored audits, the copies they leave in other indices of
+    their month, or in the same index under another routing, are deleted once
+    their batch is written.
+    """
+
+    name: str
+    batches: Callable[[], Iterator[AuditBatch]]
+    index_suffix: str = ""
+    moves: bool = False
+
+
+@dataclass
+class BulkWriteJob:
+    """
+    Runs bulk write tasks on `workers` threads.
+
+    `throttle`, when given, is called with the size of every batch before it
+    is written and blocks to cap the write rate. `on_progress` receives the
+    report of the run after every batch.
+    """
+
+    search_engine_client: SearchEngineClient
+    checkpoint: JobCheckpoint
+    workers: int = 1
+    throttle: Optional[Callable[[int], None]] = None
+    on_progress: Optional[Callable[[BulkWriteReport], None]] = None
+    _tasks: int = field(default=0, init=False)
+    _completed_tasks: int = field(default=0, init=False)
+    _resumed_tasks: int = field(default=0, init=False)
+    _written: int = field(default=0, init=False)
+    _failed: int = field(default=0, init=False)
+    _started_at: float = field(default=0.0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def run(self, tasks: Iterable[BulkWriteTask]) -> BulkWriteReport:
+        """Runs the tasks not completed by a previous run.
+
+        Tasks are consumed lazily and at most twice as many as workers are in
+        flight, so tasks can be produced from a stream of any size.
+        """
+        self._started_at = time.monotonic()
+        completed = self.checkpoint.completed()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight: set[Future] = set()
+            for task in tasks:
+                with self._lock:
+                    self._tasks += 1
+                    if task.name in completed:
+                        self._completed_tasks += 1
+                        self._resumed_tasks += 1
+                        continue
+
+                if len(in_flight) >= 2 * self.workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    _raise_failures(done)
+                in_flight.add(executor.submit(self._run_task, task))
+
+            _raise_failures(wait(in_flight).done)
+
+        return self.report()
+
+    def report(self) -> BulkWriteReport:
+        with self._lock:
+            elapsed_seconds = time.monotonic() - self._started_at
+            return BulkWriteReport(
+                tasks=self._tasks,
+                completed_tasks=self._completed_tasks,
+                resumed_tasks=self._resumed_tasks,
+                written=self._written,
+                failed=self._failed,
+                elapsed_seconds=round(elapsed_seconds, 3),
+                audits_per_second=round(self._written / max(elapsed_seconds, 1e-9), 1),
+            )
+
+    def reject(self, count: int = 1) -> None:
+        """Counts audits not written because they are invalid; retrying them
+        would not help, so they do not keep their task from completing."""
+        self._record(written=0, failed=count)
+
+    def _run_task(self, task: BulkWriteTask) -> None:
+        task_failed = 0
+        for data, ids, month, routings in task.batches():
+            if self.throttle is not None:
+                self.throttle(len(data))
+
+            written = self.search_engine_client.bulk_upsert(
+                data=data, ids=ids, month=month, index_suffix=task.index_suffix
+            )
+            # Which audits failed is unknown, so the copies of a partially
+            # written batch are kept until the task is retried.
+            if task.moves and written == len(data):
+                self.search_engine_client.delete_moved(
+                    data=data, ids=ids, month=month, routings=routings
+                )
+            task_failed += len(data) - written
+            self._record(written=written, failed=len(data) - written)
+
+        # Audits keep their identifiers, so rewriting a task is idempotent: a
+        # task with failures is left for the next run to retry.
+        if task_failed:
+            return
+
+        self.checkpoint.complete(task.name)
+        with self._lock:
+            self._completed_tasks += 1
+
+    def _record(self, written: int, failed: int) -> None:
+        with self._lock:
+            self._written += written
+            self._failed += failed
+
+        if self.on_progress is not None:
+            self.on_progress(self.report())
+
+
+def batched(items: Iterable[Item], size: int) -> Iterator[list[Item]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _raise_failures(futures: Iterable[Future]) -> None:
+    for future in futures:
+        future.result()
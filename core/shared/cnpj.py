@@ -0,0 +1,13 @@
+import re
+
+
+def normalize_cnpj(cnpj: str) -> str:
+    """Returns a CNPJ with its punctuation stripped, the form audits are
+    stored, routed and filtered by."""
+    return re.sub(r"\D", "", cnpj)
+
+
+def cnpj_values(cnpj: str) -> list[str]:
+    """Returns the stored forms a CNPJ filter matches: the normalized one, and
+    the raw one for audits stored before CNPJs were normalized."""
+    return list(dict.fromkeys([normalize_cnpj(cnpj), cnpj]))
@@ -54,3 +54,59 @@ class ResourceNotFoundError(Exception):
 
     def __str__(self):
         return self.detail
+
+
+class UnauthorizedError(Exception):
+    """
+    Matches the Http 401 - Unauthorized.
+    By definition the 401 status indicates the request lacks valid authentication
+    credentials for the target resource. It is supposed to be retryable by the
+    request sender with new credentials.
+
+    Examples:
+        - When the request has no bearer token
+        - When the token signature, issuer, audience or expiration is invalid
+    """
+
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+
+    def __str__(self):
+        return self.detail
+
+
+class RateLimitExceededError(Exception):
+    """
+    Matches the Http 429 - Too Many Requests.
+    By definition the 429 status indicates the user has sent too many requests
+    in a given amount of time. It is supposed to be retryable by the request
+    sender after `retry_after` seconds.
+
+    Examples:
+        - When an application exceeds its ingest quota
+    """
+
+    def __init__(self, detail: str, retry_after: float) -> None:
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return self.detail
+
+
+class ServiceUnavailableError(Exception):
+    """
+    Matches the Http 503 - Service Unavailable.
+    By definition the 503 status indicates the server cannot handle the request
+    for now, usually because a dependency is down. It is supposed to be
+    retryable by the request sender.
+
+    Examples:
+        - When the identity provider keys cannot be fetched
+    """
+
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+
+    def __str__(self):
+        return self.detail
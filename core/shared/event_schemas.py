@@ -0,0 +1,133 @@
+"""
+Compilation of the metadata schemas declared per event type.
+
+A schema compiles to a pydantic `TypeAdapter`, built once and cached, and to
+the OpenSearch mapping of its metadata fields.
+"""
+
+import functools
+from datetime import datetime
+from typing import Optional
+
+from pydantic import ConfigDict, TypeAdapter
+from typing_extensions import NotRequired, Required, TypedDict
+
+from core.models import EventSchema, MetadataFieldType
+
+_PYTHON_TYPES: dict[MetadataFieldType, type] = {
+    "keyword": str,
+    "text": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "date": datetime,
+    "object": dict,
+}
+
+_MAPPING_TYPES: dict[MetadataFieldType, str] = {
+    "keyword": "keyword",
+    "text": "text",
+    "integer": "long",
+    "number": "double",
+    "boolean": "boolean",
+    "date": "date",
+    "object": "object",
+}
+
+
+def compile_schema(schema: EventSchema) -> TypeAdapter:
+    """Returns the validator of the metadata of an event type.
+
+    Compiling builds the pydantic-core validator, which is costly; adapters are
+    cached by schema content, so an unchanged schema is compiled only once.
+
+    Parameters
+    ----------
+    schema : EventSchema
+        The declared schema.
+
+    Returns
+    -------
+    TypeAdapter
+        Validates a metadata dict, see `validate_metadata`.
+    """
+    return _compile(
+        schema.event_type,
+        tuple(sorted(schema.fields.items())),
+        frozenset(schema.required),
+        schema.additional_fields,
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(
+    event_type: str,
+    fields: tuple[tuple[str, MetadataFieldType], ...],
+    required: frozenset[str],
+    additional_fields: bool,
+) -> TypeAdapter:
+    # A TypedDict accepts any metadata key, valid identifier or not.
+    metadata_type = TypedDict(
+        f"{event_type}Metadata",
+        {
+            name: (
+                Required[_PYTHON_TYPES[field_type]]
+                if name in required
+                else NotRequired[Optional[_PYTHON_TYPES[field_type]]]
+            )
+            for name, field_type in fields
+        },
+    )
+    metadata_type.__pydantic_config__ = ConfigDict(
+        extra="allow" if additional_fields else "forbid"
+    )
+
+    return TypeAdapter(metadata_type)
+
+
+def validate_metadata(adapter: TypeAdapter, metadata: dict) -> dict:
+    """Validates the metadata of an audit against its compiled schema.
+
+    Parameters
+    ----------
+    adapter : TypeAdapter
+        The compiled schema of the event type.
+    metadata : dict
+        The metadata of the audit.
+
+    Returns
+    -------
+    dict
+        The metadata with its declared fields coerced to their JSON form,
+        e.g. `"42"` to `42` for an integer field, and its other fields as is.
+
+    Raises
+    ------
+    pydantic.ValidationError
+        When the metadata does not match the schema.
+    """
+    declared = adapter.dump_python(adapter.validate_python(metadata), mode="json")
+
+    return {**metadata, **declared}
+
+
+def metadata_mapping(schemas: list[EventSchema]) -> dict:
+    """Builds the mapping fragment of the metadata fields of some schemas.
+
+    Parameters
+    ----------
+    schemas : list[EventSchema]
+        Schemas of the event types sharing an index, i.e. of one application.
+
+    Returns
+    -------
+    dict
+        `{"properties": {"metadata": {"properties": {...}}}}`.
+    """
+    properties = {
+        name: {"type": _MAPPING_TYPES[field_type]}
+        for schema in schemas
+        for name, field_type in schema.fields.items()
+    }
+
+    return {"properties": {"metadata": {"properties": properties}}}
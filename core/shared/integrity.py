@@ -0,0 +1,132 @@
+"""
+Hashing rules of the tamper-evident audit log.
+
+Every audit is hashed on ingest. Audits are sealed in batches: the Merkle root
+of a batch is stored in a checkpoint, and each checkpoint hashes the previous
+one of its chain, so altering, removing or inserting an audit or a checkpoint
+after the fact is detected by recomputing the hashes.
+
+The repeats coalesced into an audit are recorded after it is sealed, so they
+are hashed and sealed on their own, as a leaf bound to the hash of the audit.
+"""
+
+import hashlib
+from typing import Iterable, Optional
+
+import orjson
+
+# Fields of the stored audit left out of its hash: the stamp itself, and the
+# coalesced repeats recorded after the audit is sealed, sealed on their own.
+_UNHASHED_FIELDS = frozenset({"integrity", "coalesced"})
+
+
+def audit_hash(document: dict) -> str:
+    """Hashes an audit as stored, excluding its stamp and coalesced repeats.
+
+    Keys are sorted, so the hash does not depend on the field order of the
+    stored JSON.
+
+    Parameters
+    ----------
+    document : dict
+        The JSON-compatible content of the audit.
+
+    Returns
+    -------
+    str
+        The hex SHA-256 of the canonical JSON of the audit.
+    """
+    canonical = {
+        name: value for name, value in document.items() if name not in _UNHASHED_FIELDS
+    }
+
+    return hashlib.sha256(
+        orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+def coalesced_hash(audit_hash: str, summary: dict) -> str:
+    """Hashes the coalesced repeats recorded on an audit, excluding their
+    stamp.
+
+    The hash of the audit is part of it, so a summary moved to another audit
+    no longer matches its stamp.
+
+    Parameters
+    ----------
+    audit_hash : str
+        The hex hash of the audit the repeats were coalesced into.
+    summary : dict
+        The JSON-compatible content of the coalesced summary.
+
+    Returns
+    -------
+    str
+        The hex SHA-256 of the canonical JSON of the summary and audit hash.
+    """
+    canonical = {
+        "audit": audit_hash,
+        **{name: value for name, value in summary.items() if name != "integrity"},
+    }
+
+    return hashlib.sha256(
+        orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+def merkle_root(hashes: Iterable[str]) -> str:
+    """Returns the Merkle root of a batch of audit hashes.
+
+    Audits of a batch are written concurrently, so the leaves are sorted and
+    the root does not depend on the write order. An odd node is paired with
+    itself.
+
+    Parameters
+    ----------
+    hashes : Iterable[str]
+        The hex hashes of the audits of the batch.
+
+    Returns
+    -------
+    str
+        The hex root; the hash of nothing for an empty batch.
+    """
+    level = sorted(bytes.fromhex(value) for value in hashes)
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256(level[index] + level[index + 1]).digest()
+            for index in range(0, len(level), 2)
+        ]
+
+    return level[0].hex()
+
+
+def checkpoint_hash(
+    previous_hash: Optional[str], root: str, count: int, batch: str
+) -> str:
+    """Links a sealed batch to the previous checkpoint of its chain.
+
+    Parameters
+    ----------
+    previous_hash : Optional[str]
+        The hash of the previous checkpoint, None for the first one.
+    root : str
+        The Merkle root of the batch.
+    count : int
+        The number of audits of the batch.
+    batch : str
+        The identifier of the batch.
+
+    Returns
+    -------
+    str
+        The hex hash of the checkpoint.
+    """
+    link = f"{previous_hash or ''}:{root}:{count}:{batch}"
+
+    return hashlib.sha256(link.encode()).hexdigest()
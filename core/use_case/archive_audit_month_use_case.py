@@ -0,0 +1,97 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TypeAlias
+
+from pydantic import BaseModel, Field
+
+from core.repositories.audit_archive import AuditArchive
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.errors import InvalidParametersError, ResourceNotFoundError
+from core.use_case.base_use_case import BaseUseCase
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+    """
+
+    application: str
+    month: str = Field(pattern=r"^\d{4}\.\d{2}$")
+
+
+UseCaseOutput: TypeAlias = int
+
+
+@dataclass
+class ArchiveAuditMonthUseCase(BaseUseCase):
+    """
+    Use case for copying a closed month of audits to the cold storage archive.
+    """
+
+    search_engine_client: SearchEngineClient
+    audit_archive: AuditArchive
+    slices: int = 1
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        The month is streamed in `slices` disjoint slices, each written in
+        parallel to its own part in a staging area. Only once every part is
+        written do they replace the previous archive of the month, so a failed
+        run leaves it as it was. A month without audits in the hot indices
+        (e.g. dropped after a previous run) is never archived over its
+        archive. The hot indices are left untouched.
+
+        :param uc_input: The application and month to archive.
+        :return: The number of archived audits.
+        """
+        current_month = datetime.now(timezone.utc).strftime("%Y.%m")
+        if uc_input.month >= current_month:
+            raise InvalidParametersError("Only closed months can be archived")
+
+        staging = uuid.uuid4().hex
+        try:
+            with ThreadPoolExecutor(max_workers=self.slices) as executor:
+                archived = sum(
+                    executor.map(
+                        lambda slice_id: self._archive_slice(
+                            uc_input, staging, slice_id
+                        ),
+                        range(self.slices),
+                    )
+                )
+
+            if not archived:
+                raise ResourceNotFoundError(
+                    f"No audits of {uc_input.application} in {uc_input.month} "
+                    "to archive, its archive is left as is"
+                )
+
+            self.audit_archive.replace_month(
+                application=uc_input.application,
+                month=uc_input.month,
+                staging=staging,
+            )
+        finally:
+            self.audit_archive.discard(staging)
+
+        return archived
+
+    def _archive_slice(
+        self, uc_input: UseCaseInput, staging: str, slice_id: int
+    ) -> int:
+        documents = self.search_engine_client.scan_month(
+            application=uc_input.application,
+            month=uc_input.month,
+            slice_id=slice_id,
+            slices=self.slices,
+        )
+
+        return self.audit_archive.write_part(
+            staging=staging,
+            part=slice_id,
+            documents=((audit_id, document) for audit_id, document, _ in documents),
+        )
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import TypeAlias
+
+from pydantic import BaseModel
+
+from core.models import AuditSearchFilters
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.errors import InvalidParametersError
+from core.use_case.base_use_case import BaseUseCase
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+    """
+
+    filters: AuditSearchFilters
+
+
+UseCaseOutput: TypeAlias = bool
+
+
+@dataclass
+class AuditExistsUseCase(BaseUseCase):
+    """
+    Use case for checking whether any audit matches the filters.
+    """
+
+    search_engine_client: SearchEngineClient
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        :param uc_input: The filters the audit must match.
+        :return: Whether at least one audit matches.
+        """
+        if not uc_input.filters.has_valid_date_range():
+            raise InvalidParametersError("start_date must not be after end_date")
+
+        return self.search_engine_client.exists(filters=uc_input.filters)
@@ -0,0 +1,103 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, TypeAlias
+
+from pydantic import BaseModel, Field
+
+from core.models import BulkWriteReport
+from core.shared.bulk_write_job import AuditBatch, BulkWriteJob, BulkWriteTask, batched
+from core.shared.cnpj import normalize_cnpj
+from core.use_case.base_use_case import BaseUseCase
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+
+    `audits` is a stream of audits imported from another system, consumed
+    once. `source` names it uniquely, e.g. the absolute path of a file:
+    imported audits get identifiers derived from the source and their
+    position, so importing a source again overwrites them instead of
+    duplicating them.
+    """
+
+    source: str
+    audits: Iterable[Any]
+    batch_size: int = Field(default=1000, ge=1)
+
+
+UseCaseOutput: TypeAlias = BulkWriteReport
+
+
+@dataclass
+class BackfillAuditsUseCase(BaseUseCase):
+    """
+    Use case for importing historical audits through the bulk write path.
+    """
+
+    job: BulkWriteJob
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        Each batch of the stream is a task of the job, so batches are written
+        in parallel and a resumed run skips the batches already imported.
+        Audits go to the index of the month they happened in, and are
+        ingested now, so the rollups of their days are refreshed. Audits
+        failing validation are counted as failed.
+
+        :param uc_input: The source and its audits.
+        :return: The report of the run.
+        """
+        tasks = (
+            BulkWriteTask(
+                name=f"backfill/{uc_input.source}/{number}-of-{uc_input.batch_size}",
+                batches=self._batches(uc_input, number, batch),
+            )
+            for number, batch in enumerate(
+                batched(uc_input.audits, uc_input.batch_size)
+            )
+        )
+
+        return self.job.run(tasks)
+
+    def _batches(self, uc_input: UseCaseInput, number: int, batch: list[Any]):
+        def read() -> Iterator[AuditBatch]:
+            ingested_at = datetime.now(timezone.utc).isoformat()
+            source_id = hashlib.sha256(uc_input.source.encode()).hexdigest()[:16]
+            audits: dict[str, list[CreateAuditInput]] = defaultdict(list)
+            ids: dict[str, list[str]] = defaultdict(list)
+            for position, audit in enumerate(batch, start=number * uc_input.batch_size):
+                try:
+                    data = CreateAuditInput(
+                        **{**audit, "ingested_at": ingested_at, "integrity": None}
+                    )
+                    month = _month_of(data.timestamp)
+                except (TypeError, ValueError):
+                    # Invalid audits (ValidationError) and timestamps.
+                    self.job.reject()
+                    continue
+
+                audits[month].append(
+                    data.model_copy(update={"cnpj": normalize_cnpj(data.cnpj)})
+                )
+                ids[month].append(f"backfill-{source_id}-{position}")
+
+            for month, month_audits in audits.items():
+                yield month_audits, ids[month], month, None
+
+        return read
+
+
+def _month_of(timestamp: str) -> str:
+    """Returns the month (YYYY.MM) of an ISO timestamp, in UTC when it has an
+    offset."""
+    happened_at = datetime.fromisoformat(timestamp)
+    if happened_at.tzinfo is not None:
+        happened_at = happened_at.astimezone(timezone.utc)
+
+    return happened_at.strftime("%Y.%m")
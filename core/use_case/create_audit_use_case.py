@@ -1,9 +1,18 @@
 from dataclasses import dataclass
-from typing import TypeAlias
+from datetime import datetime, timezone
+from typing import Optional, TypeAlias
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
+from core.models import CoalescedSummary, IntegrityStamp
+from core.repositories.audit_coalescer import AuditCoalescer
+from core.repositories.audit_event_publisher import AuditEventPublisher
+from core.repositories.audit_integrity_chain import AuditIntegrityChain
+from core.repositories.event_schema_registry import EventSchemaRegistry
 from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.cnpj import normalize_cnpj
+from core.shared.errors import InvalidParametersError
+from core.shared.event_schemas import validate_metadata
 from core.use_case.base_use_case import BaseUseCase
 
 
@@ -19,6 +28,9 @@ class UseCaseInput(BaseModel):
     resource_id: str
     timestamp: str
     metadata: dict
+    ingested_at: Optional[str] = None
+    integrity: Optional[IntegrityStamp] = None
+    coalesced: Optional[CoalescedSummary] = None
 
 
 UseCaseOutput: TypeAlias = None
@@ -31,14 +43,72 @@ class CreateAuditUseCase(BaseUseCase):
     """
 
     search_engine_client: SearchEngineClient
+    event_publisher: Optional[AuditEventPublisher] = None
+    integrity_chain: Optional[AuditIntegrityChain] = None
+    coalescer: Optional[AuditCoalescer] = None
+    schema_registry: Optional[EventSchemaRegistry] = None
 
     def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
         """
         Execute the use case.
 
+        The CNPJ is stored normalized, the form audits are routed and
+        filtered by. The metadata of event types with a declared schema is
+        validated and coerced; other event types keep free-form metadata.
+        Repeats of an audit coalesced into a previous one are not stored nor
+        published; they only add to the count of the stored audit.
+
         :param audit: The audit to create.
         :return: The created audit.
         """
-        self.search_engine_client.upsert(
-            data=uc_input,
+        update = {
+            "cnpj": normalize_cnpj(uc_input.cnpj),
+            "ingested_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if self.schema_registry is not None:
+            update["metadata"] = self._validated_metadata(uc_input)
+        uc_input = uc_input.model_copy(update=update)
+
+        if self.coalescer is None:
+            self._upsert(uc_input)
+        elif not self.coalescer.coalesce(data=uc_input, write=self._upsert):
+            return
+
+        if self.event_publisher is not None:
+            self.event_publisher.publish(data=uc_input)
+
+    def _validated_metadata(self, uc_input: UseCaseInput) -> dict:
+        validator = self.schema_registry.validator_for(
+            application=uc_input.application, event_type=uc_input.event_type
         )
+        if validator is None:
+            return uc_input.metadata
+
+        try:
+            return validate_metadata(validator, uc_input.metadata)
+        except ValidationError as exc:
+            errors = "; ".join(
+                f"metadata.{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in exc.errors()
+            )
+            raise InvalidParametersError(
+                f"Invalid metadata for {uc_input.event_type}: {errors}"
+            ) from exc
+
+    def _upsert(self, uc_input: UseCaseInput) -> dict:
+        if self.integrity_chain is None:
+            return self.search_engine_client.upsert(data=uc_input)
+
+        stamp = self.integrity_chain.stamp(uc_input)
+        stored = False
+        try:
+            response = self.search_engine_client.upsert(
+                data=uc_input.model_copy(update={"integrity": stamp})
+            )
+            stored = True
+        finally:
+            # A write failing after reaching OpenSearch leaves an audit out of
+            # its batch root; the verification reports that batch.
+            self.integrity_chain.settle(stamp, stored=stored)
+
+        return response
@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Optional, TypeAlias
+
+from pydantic import BaseModel
+
+from core.models import EventSchema
+from core.repositories.event_schema_registry import EventSchemaRegistry
+from core.use_case.base_use_case import BaseUseCase
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+    """
+
+    application: Optional[str] = None
+
+
+UseCaseOutput: TypeAlias = list[EventSchema]
+
+
+@dataclass
+class ListEventSchemasUseCase(BaseUseCase):
+    """
+    Use case for listing the declared event type schemas.
+    """
+
+    schema_registry: EventSchemaRegistry
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        :param uc_input: The application whose schemas are listed, if any.
+        :return: The declared schemas.
+        """
+        return self.schema_registry.list_schemas(application=uc_input.application)
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import TypeAlias
+
+from core.models import EventSchema, EventSchemaRegistration
+from core.repositories.event_schema_registry import EventSchemaRegistry
+from core.use_case.base_use_case import BaseUseCase
+
+UseCaseInput: TypeAlias = EventSchema
+UseCaseOutput: TypeAlias = EventSchemaRegistration
+
+
+@dataclass
+class RegisterEventSchemaUseCase(BaseUseCase):
+    """
+    Use case for declaring the metadata schema of an event type.
+    """
+
+    schema_registry: EventSchemaRegistry
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        :param uc_input: The schema of the event type.
+        :return: The mapping fragment applied to the indices of the
+            application, and whether the current ones got it.
+        """
+        return self.schema_registry.register(schema=uc_input)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Iterator, TypeAlias
+
+from pydantic import BaseModel, Field, ValidationError
+
+from core.models import BulkWriteReport
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.bulk_write_job import AuditBatch, BulkWriteJob, BulkWriteTask, batched
+from core.use_case.base_use_case import BaseUseCase
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+
+    Every audit of the months is rewritten to the index the current naming and
+    routing rules assign, with `index_suffix` appended. Rewriting into the
+    same indices moves the audits whose index or routing changed (e.g. a
+    tenant made dedicated, or audits stored before CNPJ routing): once
+    written with their new index and routing, their previous copy is
+    deleted. A mapping or routing change needs a suffix and an alias
+    swap; the source indices are then left as they are.
+    """
+
+    application: str
+    months: list[str] = Field(min_length=1)
+    slices: int = Field(default=1, ge=1)
+    batch_size: int = Field(default=1000, ge=1)
+    index_suffix: str = ""
+
+
+UseCaseOutput: TypeAlias = BulkWriteReport
+
+
+@dataclass
+class ReindexAuditsUseCase(BaseUseCase):
+    """
+    Use case for rewriting stored audits through the bulk write path.
+    """
+
+    search_engine_client: SearchEngineClient
+    job: BulkWriteJob
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        Each month is read in `slices` disjoint sliced scrolls, each one a
+        task of the job, so slices run in parallel and a resumed run skips
+        the slices already rewritten.
+
+        :param uc_input: The application, months and layout of the reindex.
+        :return: The report of the run.
+        """
+        tasks = (
+            BulkWriteTask(
+                name=(
+                    f"reindex/{uc_input.application}/{month}"
+                    f"/{slice_id}-of-{uc_input.slices}{uc_input.index_suffix}"
+                ),
+                batches=self._batches(uc_input, month, slice_id),
+                index_suffix=uc_input.index_suffix,
+                moves=not uc_input.index_suffix,
+            )
+            for month in uc_input.months
+            for slice_id in range(uc_input.slices)
+        )
+
+        return self.job.run(tasks)
+
+    def _batches(self, uc_input: UseCaseInput, month: str, slice_id: int):
+        def read() -> Iterator[AuditBatch]:
+            documents = self.search_engine_client.scan_month(
+                application=uc_input.application,
+                month=month,
+                slice_id=slice_id,
+                slices=uc_input.slices,
+            )
+            for batch in batched(documents, uc_input.batch_size):
+                audits, ids, routings = [], [], []
+                for audit_id, document, routing in batch:
+                    try:
+                        audits.append(CreateAuditInput(**document))
+                    except ValidationError:
+                        self.job.reject()
+                        continue
+                    ids.append(audit_id)
+                    routings.append(routing)
+
+                if audits:
+                    yield audits, ids, month, routings
+
+        return read
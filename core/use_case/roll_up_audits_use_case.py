@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TypeAlias
+
+from pydantic import BaseModel
+
+from core.models import AuditSearchFilters, RollupReport
+from core.repositories.search_engine_client import SearchEngineClient
+from core.use_case.base_use_case import BaseUseCase
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+    """
+
+    application: str
+
+
+UseCaseOutput: TypeAlias = RollupReport
+
+
+@dataclass
+class RollUpAuditsUseCase(BaseUseCase):
+    """
+    Use case for folding the audits ingested since its previous run into the
+    daily rollups of an application.
+    """
+
+    search_engine_client: SearchEngineClient
+    settle_seconds: int = 60
+    workers: int = 1
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        Every day (UTC) holding an audit ingested, or whose coalesced repeats
+        were recorded, after the high water mark is aggregated again from the
+        raw indices and its rollups are replaced, so late audits are accounted
+        for and an interrupted run is simply run again. The mark only moves up
+        to the start of the current day, less `settle_seconds` for recent
+        writes to become searchable: audits of the current day are rolled up
+        once it is over.
+
+        Summaries only read the rollups of the days before the mark. A day not
+        over yet (audits dated in the future) is rolled up as it is: its later
+        audits are ingested after the mark, so it is aggregated again once
+        they are.
+
+        :param uc_input: The application to roll up.
+        :return: The report of the run.
+        """
+        application = uc_input.application
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        until = min(
+            datetime.combine(today, time(), tzinfo=timezone.utc),
+            now - timedelta(seconds=self.settle_seconds),
+        ).isoformat()
+
+        after = self.search_engine_client.get_rollup_high_water_mark(application)
+        if after is not None and after >= until:
+            return RollupReport(
+                application=application, high_water_mark=after, days=0, rollups=0
+            )
+
+        days = self.search_engine_client.ingested_days(
+            application=application, after=after, until=until
+        )
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            rollups = sum(
+                executor.map(lambda day: self._roll_up_day(application, day), days)
+            )
+
+        self.search_engine_client.save_rollup_high_water_mark(application, until)
+
+        return RollupReport(
+            application=application,
+            high_water_mark=until,
+            days=len(days),
+            rollups=rollups,
+        )
+
+    def _roll_up_day(self, application: str, day: date) -> int:
+        rollups = list(
+            self.search_engine_client.daily_activity(
+                AuditSearchFilters(
+                    application=application, start_date=day, end_date=day
+                )
+            )
+        )
+        self.search_engine_client.save_rollups(application, rollups)
+
+        return len(rollups)
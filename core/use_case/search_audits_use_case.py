@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Literal, Optional, TypeAlias
+
+from pydantic import BaseModel
+
+from core.models import AuditModel, AuditSearchFilters
+from core.repositories.audit_archive import AuditArchive
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.errors import InvalidParametersError
+from core.use_case.base_use_case import BaseUseCase
+
+SUMMARY_FIELDS = ["timestamp", "actor", "event_type", "resource_id"]
+PROJECTABLE_FIELDS = frozenset(
+    {
+        "actor",
+        "event_type",
+        "application",
+        "cnpj",
+        "resource_id",
+        "timestamp",
+        "metadata",
+        "ingested_at",
+        "integrity",
+        "coalesced",
+    }
+)
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+
+    `fields` projects the returned audits: plain names are included and names
+    prefixed by `-` are excluded. Nested metadata keys can be given as
+    `metadata.<key>`. Without `fields`, `view` picks either the compact
+    summary or the full documents.
+    """
+
+    filters: AuditSearchFilters
+    size: int
+    fields: Optional[list[str]] = None
+    view: Literal["summary", "full"] = "summary"
+
+
+UseCaseOutput: TypeAlias = list[AuditModel]
+
+
+@dataclass
+class SearchAuditsUseCase(BaseUseCase):
+    """
+    Use case for searching audits.
+
+    Searches starting before the `hot_retention_months` kept on the search
+    engine are completed from the archive, when one is configured.
+    """
+
+    search_engine_client: SearchEngineClient
+    audit_archive: Optional[AuditArchive] = None
+    hot_retention_months: int = 0
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        :param uc_input: The search filters and the maximum number of audits.
+        :return: The matching audits, most recent first.
+        """
+        filters = uc_input.filters
+        if not filters.has_valid_date_range():
+            raise InvalidParametersError("start_date must not be after end_date")
+
+        includes, excludes = self._projection(uc_input)
+
+        audits = self.search_engine_client.search(
+            filters=filters,
+            size=uc_input.size,
+            includes=includes,
+            excludes=excludes,
+        )
+
+        archived_months = self._archived_months(filters)
+        if not archived_months or len(audits) >= uc_input.size:
+            return audits
+
+        # Archived months are older than the hot ones, so they only fill the
+        # remaining slots; months not yet dropped from the hot indices are
+        # found in both.
+        found = {audit.id for audit in audits}
+        archived = self.audit_archive.search(
+            filters=filters,
+            size=uc_input.size,
+            months=archived_months,
+            includes=includes,
+            excludes=excludes,
+        )
+        audits += [audit for audit in archived if audit.id not in found]
+
+        return audits[: uc_input.size]
+
+    def _archived_months(self, filters: AuditSearchFilters) -> list[str]:
+        if self.audit_archive is None or filters.start_date is None:
+            return []
+
+        today = datetime.now(timezone.utc).date()
+        first_hot = _add_months(
+            date(today.year, today.month, 1), 1 - self.hot_retention_months
+        )
+        month = date(filters.start_date.year, filters.start_date.month, 1)
+
+        months = []
+        while month < first_hot:
+            months.append(month.strftime("%Y.%m"))
+            month = _add_months(month, 1)
+
+        return months
+
+    def _projection(self, uc_input: UseCaseInput) -> tuple[list[str], list[str]]:
+        if not uc_input.fields:
+            if uc_input.view == "summary":
+                return SUMMARY_FIELDS, []
+            return [], []
+
+        includes, excludes = [], []
+        for field in uc_input.fields:
+            name = field.removeprefix("-")
+            if name.split(".", 1)[0] not in PROJECTABLE_FIELDS:
+                raise InvalidParametersError(f"Unknown audit field: {name}")
+
+            (excludes if field.startswith("-") else includes).append(name)
+
+        return includes, excludes
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+
+    return date(index // 12, index % 12 + 1, 1)
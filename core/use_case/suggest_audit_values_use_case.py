@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Literal, Optional, TypeAlias
+
+from pydantic import BaseModel, Field
+
+from core.repositories.search_engine_client import SearchEngineClient
+from core.use_case.base_use_case import BaseUseCase
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+    """
+
+    field: Literal["actor", "resource_id"]
+    prefix: str = Field(min_length=1)
+    size: int = 10
+    application: Optional[str] = None
+    cnpj: Optional[str] = None
+
+
+UseCaseOutput: TypeAlias = list[str]
+
+
+@dataclass
+class SuggestAuditValuesUseCase(BaseUseCase):
+    """
+    Use case for suggesting the actors or resource ids starting with a prefix.
+    """
+
+    search_engine_client: SearchEngineClient
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        :param uc_input: The field, the typed prefix and the optional scope.
+        :return: The matching distinct values, in alphabetical order.
+        """
+        return self.search_engine_client.suggest(
+            lookup_field=uc_input.field,
+            prefix=uc_input.prefix,
+            size=uc_input.size,
+            application=uc_input.application,
+            cnpj=uc_input.cnpj,
+        )
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, TypeAlias
+
+from pydantic import BaseModel
+
+from core.models import AuditSearchFilters, DailyActivity
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.errors import InvalidParametersError
+from core.use_case.base_use_case import BaseUseCase
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+    """
+
+    filters: AuditSearchFilters
+
+
+UseCaseOutput: TypeAlias = list[DailyActivity]
+
+
+@dataclass
+class SummarizeAuditActivityUseCase(BaseUseCase):
+    """
+    Use case for summarizing the audits of an application per tenant, event
+    type and day.
+    """
+
+    search_engine_client: SearchEngineClient
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        Days already rolled up are read from the daily rollups; the days
+        after them, usually only the current one, are aggregated from the
+        raw indices.
+
+        :param uc_input: The application, and optionally the tenant, event
+            type and date range, to summarize.
+        :return: The daily summaries, ordered by day.
+        """
+        filters = uc_input.filters
+        if not filters.application:
+            raise InvalidParametersError("application is required")
+        if not filters.has_valid_date_range():
+            raise InvalidParametersError("start_date must not be after end_date")
+
+        high_water_mark = self.search_engine_client.get_rollup_high_water_mark(
+            filters.application
+        )
+        if high_water_mark is None:
+            return _ordered(self.search_engine_client.daily_activity(filters))
+
+        # Days before the one of the mark are complete in the rollups.
+        rolled_up_until = datetime.fromisoformat(high_water_mark).date()
+        last_rolled_up_day = rolled_up_until - timedelta(days=1)
+
+        activity = []
+        if filters.start_date is None or filters.start_date < rolled_up_until:
+            end_date = min(filters.end_date or last_rolled_up_day, last_rolled_up_day)
+            activity += self.search_engine_client.search_rollups(
+                filters.model_copy(update={"end_date": end_date})
+            )
+        if filters.end_date is None or filters.end_date >= rolled_up_until:
+            start_date = max(filters.start_date or rolled_up_until, rolled_up_until)
+            activity += self.search_engine_client.daily_activity(
+                filters.model_copy(update={"start_date": start_date})
+            )
+
+        return _ordered(activity)
+
+
+def _ordered(activity: Iterable[DailyActivity]) -> list[DailyActivity]:
+    return sorted(
+        activity, key=lambda summary: (summary.day, summary.cnpj, summary.event_type)
+    )
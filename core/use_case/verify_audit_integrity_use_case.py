@@ -0,0 +1,173 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TypeAlias
+
+from pydantic import BaseModel, Field
+
+from core.models import IntegrityCheckpoint, IntegrityReport
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.integrity import (
+    audit_hash,
+    checkpoint_hash,
+    coalesced_hash,
+    merkle_root,
+)
+from core.use_case.base_use_case import BaseUseCase
+
+
+class UseCaseInput(BaseModel):
+    """
+    Input for the use case.
+    """
+
+    application: str
+    month: str = Field(pattern=r"^\d{4}\.\d{2}$")
+
+
+UseCaseOutput: TypeAlias = IntegrityReport
+
+
+@dataclass
+class _SliceResult:
+    audits: int = 0
+    unstamped: int = 0
+    tampered: list[str] = field(default_factory=list)
+    leaves: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+
+
+@dataclass
+class VerifyAuditIntegrityUseCase(BaseUseCase):
+    """
+    Use case for verifying that the audits of an application month were not
+    altered, removed or inserted after being sealed.
+    """
+
+    search_engine_client: SearchEngineClient
+    slices: int = 1
+
+    def execute(self, uc_input: UseCaseInput) -> UseCaseOutput:
+        """
+        Execute the use case.
+
+        The audits are streamed in `slices` disjoint slices checked in
+        parallel; each audit is hashed again and the hashes are grouped by
+        batch to recompute the sealed roots. Coalesced repeats recorded on a
+        stamped audit are sealed on their own and checked the same way; repeats
+        without stamp were recorded around the chain. In a month with
+        checkpoints, integrity was enabled, so an audit without stamp was
+        inserted around the chain and fails the verification.
+
+        :param uc_input: The application and month to verify.
+        :return: The verification report.
+        """
+        checkpoints = self.search_engine_client.list_checkpoints(
+            application=uc_input.application, month=uc_input.month
+        )
+
+        with ThreadPoolExecutor(max_workers=self.slices) as executor:
+            results = list(
+                executor.map(
+                    lambda slice_id: self._check_slice(uc_input, slice_id),
+                    range(self.slices),
+                )
+            )
+
+        leaves: dict[str, list[str]] = defaultdict(list)
+        for result in results:
+            for batch, hashes in result.leaves.items():
+                leaves[batch].extend(hashes)
+
+        sealed = {checkpoint.batch: checkpoint for checkpoint in checkpoints}
+        mismatched_batches = sorted(
+            batch
+            for batch, checkpoint in sealed.items()
+            if len(leaves.get(batch, ())) != checkpoint.count
+            or merkle_root(leaves.get(batch, ())) != checkpoint.root
+        )
+        unsealed_batches = sorted(batch for batch in leaves if batch not in sealed)
+        tampered_audits = sorted(
+            audit_id for result in results for audit_id in result.tampered
+        )
+        broken_chains = _broken_chains(checkpoints)
+        unstamped_audits = sum(result.unstamped for result in results)
+
+        return IntegrityReport(
+            application=uc_input.application,
+            month=uc_input.month,
+            valid=not (
+                tampered_audits
+                or mismatched_batches
+                or broken_chains
+                or unsealed_batches
+                or (checkpoints and unstamped_audits)
+            ),
+            audits=sum(result.audits for result in results),
+            checkpoints=len(checkpoints),
+            tampered_audits=tampered_audits,
+            mismatched_batches=mismatched_batches,
+            broken_chains=broken_chains,
+            unsealed_batches=unsealed_batches,
+            unstamped_audits=unstamped_audits,
+        )
+
+    def _check_slice(self, uc_input: UseCaseInput, slice_id: int) -> _SliceResult:
+        result = _SliceResult()
+        documents = self.search_engine_client.scan_month(
+            application=uc_input.application,
+            month=uc_input.month,
+            slice_id=slice_id,
+            slices=self.slices,
+        )
+
+        for audit_id, document, _ in documents:
+            result.audits += 1
+            stamp = document.get("integrity")
+            if not stamp:
+                result.unstamped += 1
+                continue
+
+            document_hash = audit_hash(document)
+            tampered = document_hash != stamp.get("hash")
+
+            # The recomputed hash is the leaf, so a tampered audit also fails
+            # the root of its batch.
+            result.leaves[stamp.get("batch")].append(document_hash)
+
+            summary = document.get("coalesced")
+            if summary:
+                summary_stamp = summary.get("integrity") or {}
+                summary_hash = coalesced_hash(document_hash, summary)
+                tampered |= summary_hash != summary_stamp.get("hash")
+                if summary_stamp:
+                    result.leaves[summary_stamp.get("batch")].append(summary_hash)
+
+            if tampered:
+                result.tampered.append(audit_id)
+
+        return result
+
+
+def _broken_chains(checkpoints: list[IntegrityCheckpoint]) -> list[str]:
+    chains: dict[str, list[IntegrityCheckpoint]] = defaultdict(list)
+    for checkpoint in checkpoints:
+        chains[checkpoint.chain].append(checkpoint)
+
+    broken = []
+    for chain, links in chains.items():
+        links.sort(key=lambda checkpoint: checkpoint.sequence)
+        previous_hash = None
+        for sequence, checkpoint in enumerate(links):
+            expected_hash = checkpoint_hash(
+                previous_hash, checkpoint.root, checkpoint.count, checkpoint.batch
+            )
+            if (
+                checkpoint.sequence != sequence
+                or checkpoint.previous_hash != previous_hash
+                or checkpoint.hash != expected_hash
+            ):
+                broken.append(chain)
+                break
+            previous_hash = checkpoint.hash
+
+    return sorted(broken)
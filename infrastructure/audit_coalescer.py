@@ -0,0 +1,249 @@
+"""
+In-process coalescing of repeated audits of chatty event types.
+
+The first audit of an `(application, cnpj, actor, event_type, resource_id)`
+is written right away; identical audits arriving within the following
+`window_seconds` are only counted. When the window closes, the count and the
+first and last timestamps are recorded on the stored audit with a single
+partial update, batched with the other closing windows, so N repeats cost
+two writes instead of N.
+
+With an integrity chain, each recorded summary is stamped and sealed in a
+batch of the audit month, so the counts are as tamper-evident as the audits.
+
+Windows are per process. Expired windows are recorded by a background timer,
+and by the next audit of the process whatever its event type; the remaining
+ones when the coalescer is closed on shutdown. Counts of windows still open
+when a process is killed without shutting down are lost; the audits
+themselves never are.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional
+
+from core.models import CoalescedSummary
+from core.repositories.audit_coalescer import AuditCoalescer
+from core.repositories.audit_integrity_chain import AuditIntegrityChain
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.application import normalize_application
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from infrastructure.metrics_sink import MetricsSink
+
+logger = logging.getLogger(__name__)
+
+WindowKey = tuple[str, str, str, str, str]
+
+
+@dataclass(eq=False)
+class _Window:
+    # The stored audit the repeats are coalesced into.
+    audit: CreateAuditInput
+    opened_at: float
+    first_timestamp: str
+    last_timestamp: str
+    count: int = 1
+    # The `upsert` response of the stored audit, once its write is over.
+    reference: Optional[dict] = None
+    # A window closed before the write of its audit is over is recorded by
+    # that write.
+    closed: bool = False
+
+
+@dataclass
+class InMemoryAuditCoalescer(AuditCoalescer):
+    """
+    Coalesces the repeats of the audits of `event_types` within
+    `window_seconds`, keeping at most `max_windows` windows open: past that
+    the oldest window is closed early. Once started, expired windows are
+    recorded every `window_seconds` even when no audit arrives.
+    """
+
+    search_engine_client: SearchEngineClient
+    event_types: frozenset[str]
+    window_seconds: float
+    max_windows: int
+    metrics_sink: MetricsSink
+    integrity_chain: Optional[AuditIntegrityChain] = None
+    # Windows in opening order, so the expired ones are at the front.
+    _windows: "OrderedDict[WindowKey, _Window]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _stopped: threading.Event = field(default_factory=threading.Event, init=False)
+    _flusher: Optional[threading.Thread] = field(default=None, init=False)
+
+    def start(self) -> None:
+        """Starts recording expired windows in the background."""
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="coalescer-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def coalesce(
+        self, data: CreateAuditInput, write: Callable[[CreateAuditInput], dict]
+    ) -> bool:
+        if data.event_type not in self.event_types:
+            self.flush_expired()
+            write(data)
+            return True
+
+        key = (
+            normalize_application(data.application),
+            data.cnpj,
+            data.actor,
+            data.event_type,
+            data.resource_id,
+        )
+        now = time.monotonic()
+
+        with self._lock:
+            closed = self._pop_expired(now)
+            window = self._windows.get(key)
+            merged = window is not None and now - window.opened_at < self.window_seconds
+            if merged:
+                window.count += 1
+                window.first_timestamp = min(window.first_timestamp, data.timestamp)
+                window.last_timestamp = max(window.last_timestamp, data.timestamp)
+            else:
+                if window is not None:
+                    closed.append(self._windows.pop(key))
+                window = _Window(
+                    audit=data,
+                    opened_at=now,
+                    first_timestamp=data.timestamp,
+                    last_timestamp=data.timestamp,
+                )
+                self._windows[key] = window
+                if len(self._windows) > self.max_windows:
+                    closed.append(self._windows.popitem(last=False)[1])
+            recordable = self._close(closed)
+
+        self._record(recordable)
+
+        if merged:
+            self.metrics_sink.increment(
+                "coalescing.merged", tags={"event_type": data.event_type}
+            )
+            return False
+
+        try:
+            reference = write(data)
+        except Exception:
+            # Repeats counted meanwhile belong to an audit never stored.
+            with self._lock:
+                if self._windows.get(key) is window:
+                    del self._windows[key]
+            raise
+
+        with self._lock:
+            window.reference = reference
+            closed_meanwhile = window.closed
+        if closed_meanwhile:
+            self._record([window])
+
+        return True
+
+    def flush_expired(self) -> None:
+        """Records the repeats of the windows older than `window_seconds`."""
+        with self._lock:
+            recordable = self._close(self._pop_expired(time.monotonic()))
+
+        self._record(recordable)
+
+    def close(self) -> None:
+        """Stops the background recording and records the repeats of every
+        open window."""
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+
+        with self._lock:
+            recordable = self._close(list(self._windows.values()))
+            self._windows.clear()
+
+        self._record(recordable)
+
+    def _flush_periodically(self) -> None:
+        # A frozen Lambda environment pauses this thread; it catches up as
+        # soon as the environment is thawed.
+        while not self._stopped.wait(self.window_seconds):
+            self.flush_expired()
+
+    def _close(self, windows: list[_Window]) -> list[_Window]:
+        # Runs under the lock, so a window is recorded either here or by the
+        # write of its audit, never twice.
+        for window in windows:
+            window.closed = True
+
+        return [window for window in windows if window.reference is not None]
+
+    def _pop_expired(self, now: float) -> list[_Window]:
+        closed = []
+        while self._windows:
+            window = next(iter(self._windows.values()))
+            if now - window.opened_at < self.window_seconds:
+                break
+            closed.append(self._windows.popitem(last=False)[1])
+
+        return closed
+
+    def _record(self, windows: list[_Window]) -> None:
+        # Windows without repeats leave the stored audit as it is.
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        updates = []
+        for window in windows:
+            if window.count == 1:
+                continue
+            summary = CoalescedSummary(
+                count=window.count,
+                first_timestamp=window.first_timestamp,
+                last_timestamp=window.last_timestamp,
+                recorded_at=recorded_at,
+            )
+            if self.integrity_chain is not None:
+                summary.integrity = self.integrity_chain.stamp_coalesced(
+                    window.audit, summary
+                )
+            updates.append((window.reference, window.audit.cnpj, summary))
+        if not updates:
+            return
+
+        try:
+            failed = self.search_engine_client.update_coalesced(updates)
+        except Exception:
+            logger.exception("Could not record %d coalesced windows", len(updates))
+            failed = {reference["_id"] for reference, _, _ in updates}
+
+        if self.integrity_chain is not None:
+            for reference, _, summary in updates:
+                self.integrity_chain.settle(
+                    summary.integrity, stored=reference["_id"] not in failed
+                )
+
+
+def audit_coalescer_resource(
+    search_engine_client: SearchEngineClient,
+    event_types: list[str],
+    window_seconds: float,
+    max_windows: int,
+    metrics_sink: MetricsSink,
+    integrity_chain: Optional[AuditIntegrityChain] = None,
+) -> Iterator[InMemoryAuditCoalescer]:
+    """Provides the coalescer of the process, recording expired windows in the
+    background and the open ones on shutdown."""
+    coalescer = InMemoryAuditCoalescer(
+        search_engine_client=search_engine_client,
+        event_types=frozenset(event_types),
+        window_seconds=window_seconds,
+        max_windows=max_windows,
+        metrics_sink=metrics_sink,
+        integrity_chain=integrity_chain,
+    )
+    coalescer.start()
+    yield coalescer
+    coalescer.close()
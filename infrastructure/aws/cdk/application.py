@@ -55,6 +55,9 @@ class AuditAPIStack(ApplicationStack):
             "AuditPrivateApi",
             handler=api_lambda,
             proxy=False,
+            # Compressed responses are base64 encoded by Mangum and must be
+            # decoded back to binary by API Gateway.
+            binary_media_types=["*/*"],
             endpoint_configuration=apigateway.EndpointConfiguration(
                 types=[apigateway.EndpointType.PRIVATE]
             ),
@@ -1,22 +1,59 @@
 import logging
+import signal
+import sys
 
 import lambdawarmer
 from mangum import Mangum
 
-from presentation.api.main import app
-from presentation.di_container import Container
+from config.settings import settings
+from presentation.api.main import Main, app
+from presentation.api.warmup import warm_up
+from presentation.di_container import shutdown_container
 
 logger = logging.getLogger()
 logger.setLevel(level=logging.INFO)
 
 
-handler = Mangum(app)
-container = Container()
+# Every execution environment has its own in-process broker and Lambda
+# cannot hold a stream open: the live tail is not available here.
+if settings.live_tail_enabled:
+    raise RuntimeError("LIVE_TAIL_ENABLED is not supported on Lambda")
+
+# Mangum would run the lifespan on every invocation, so resources are started
+# once here instead and live as long as the execution environment.
+handler = Mangum(app, lifespan="off")
+container = Main.container
+container.init_resources()
+
+# Pays the initialization costs during the Lambda init phase, before the
+# first request reaches this execution environment.
+warm_up(container)
+
+
+def _shutdown(signum, frame):
+    # Lambda signals the runtime before shutting an execution environment
+    # down (as soon as an extension, e.g. Datadog's, is registered): the
+    # integrity batches and coalescing windows still open are sealed and
+    # flushed instead of being lost with the environment.
+    shutdown_container(container)
+    sys.exit(0)
+
+
+signal.signal(signal.SIGTERM, _shutdown)
 
 
 @lambdawarmer.warmer
+def _warmable_handler(event, context):
+    return handler(event, context)
+
+
 def request_handler(event, context):
     """
     This function is used to handle API requests.
+    Warm pings re-run the warm-up, so a scaled-out container is primed
+    before it takes real traffic.
     """
-    return handler(event, context)
+    if event.get("warmer"):
+        warm_up(container)
+
+    return _warmable_handler(event, context)
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from pydantic import TypeAdapter
+
+from core.models import EventSchema, EventSchemaRegistration
+from core.repositories.event_schema_registry import EventSchemaRegistry
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.application import normalize_application
+from core.shared.errors import ConflictingParametersError, InvalidParametersError
+from core.shared.event_schemas import compile_schema, metadata_mapping
+
+logger = logging.getLogger(__name__)
+
+SchemaKey = tuple[str, str]
+
+
+@dataclass
+class CachedEventSchemaRegistry(EventSchemaRegistry):
+    """
+    Event schemas stored on the search engine and kept compiled in memory.
+
+    Every process reloads the schemas at most once per `ttl_seconds`, so a
+    schema registered on another process is enforced within that delay. On
+    the ingest path a lookup is a dict access.
+    """
+
+    search_engine_client: SearchEngineClient
+    ttl_seconds: float
+    _validators: dict[SchemaKey, TypeAdapter] = field(default_factory=dict, init=False)
+    _loaded_at: Optional[float] = field(default=None, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def validator_for(self, application: str, event_type: str) -> Optional[TypeAdapter]:
+        if self._is_stale() and self._lock.acquire(blocking=self._loaded_at is None):
+            # Other threads keep using the loaded schemas meanwhile.
+            try:
+                if self._is_stale():
+                    self._load()
+            finally:
+                self._lock.release()
+
+        return self._validators.get((normalize_application(application), event_type))
+
+    def register(self, schema: EventSchema) -> EventSchemaRegistration:
+        undeclared = set(schema.required) - set(schema.fields)
+        if undeclared:
+            raise InvalidParametersError(
+                f"Required fields are not declared: {', '.join(sorted(undeclared))}"
+            )
+
+        application = normalize_application(schema.application)
+        schemas = {
+            current.event_type: current
+            for current in self.search_engine_client.list_event_schemas(application)
+        }
+        schemas[schema.event_type] = schema
+        _check_field_types(list(schemas.values()))
+
+        mapping = metadata_mapping(list(schemas.values()))
+        applied = self.search_engine_client.put_metadata_mapping(application, mapping)
+        self.search_engine_client.save_event_schema(schema)
+
+        validator = compile_schema(schema)
+        with self._lock:
+            self._validators = {
+                **self._validators,
+                (application, schema.event_type): validator,
+            }
+
+        return EventSchemaRegistration(
+            mapping=mapping, applied_to_current_indices=applied
+        )
+
+    def list_schemas(self, application: Optional[str] = None) -> list[EventSchema]:
+        return self.search_engine_client.list_event_schemas(application)
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.ttl_seconds
+        )
+
+    def _load(self) -> None:
+        self._loaded_at = time.monotonic()
+        try:
+            schemas = self.search_engine_client.list_event_schemas()
+        except Exception:
+            # Ingestion goes on with the schemas loaded before, if any.
+            logger.exception("Could not load the event schemas")
+            return
+
+        # Replaced at once, so lookups never see a partially loaded registry.
+        self._validators = {
+            (normalize_application(schema.application), schema.event_type): (
+                compile_schema(schema)
+            )
+            for schema in schemas
+        }
+
+
+def _check_field_types(schemas: list[EventSchema]) -> None:
+    """Event types of an application share its indices, so a metadata field
+    must have the same type in all of them."""
+    types: dict[str, tuple[str, str]] = {}
+    for schema in schemas:
+        for name, field_type in schema.fields.items():
+            event_type, known_type = types.setdefault(
+                name, (schema.event_type, field_type)
+            )
+            if known_type != field_type:
+                raise ConflictingParametersError(
+                    f"metadata.{name} is {known_type} in {event_type} "
+                    f"but {field_type} in {schema.event_type}"
+                )
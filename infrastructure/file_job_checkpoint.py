@@ -0,0 +1,36 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+
+from core.repositories.job_checkpoint import JobCheckpoint
+
+
+@dataclass
+class FileJobCheckpoint(JobCheckpoint):
+    """
+    Keeps the completed tasks of a job in a local JSON file, so an interrupted
+    job resumes where it stopped. The file is replaced atomically on every
+    completed task.
+    """
+
+    path: str
+    _completed: set[str] = field(default_factory=set, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self):
+        if os.path.exists(self.path):
+            with open(self.path) as file:
+                self._completed = set(json.load(file)["completed"])
+
+    def completed(self) -> set[str]:
+        with self._lock:
+            return set(self._completed)
+
+    def complete(self, task: str) -> None:
+        with self._lock:
+            self._completed.add(task)
+            staging_path = f"{self.path}.tmp"
+            with open(staging_path, "w") as file:
+                json.dump({"completed": sorted(self._completed)}, file)
+            os.replace(staging_path, self.path)
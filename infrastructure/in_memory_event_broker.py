@@ -0,0 +1,160 @@
+"""
+In-process fan-out of newly ingested audits to live subscribers.
+
+Each process has its own broker, so subscribers only see the audits ingested
+by the process serving them. The live tail is therefore only enabled on a
+single worker server (`LIVE_TAIL_ENABLED`); multi-worker servers and Lambda
+refuse to start with it.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import orjson
+
+from core.models import AuditEventFilters
+from core.repositories.audit_event_publisher import AuditEventPublisher
+from core.shared.application import normalize_application
+from core.shared.cnpj import normalize_cnpj
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+AuditPredicate = Callable[[CreateAuditInput], bool]
+
+_MATCHED_FIELDS = ("cnpj", "actor", "event_type", "resource_id")
+
+
+def compile_predicate(filters: AuditEventFilters) -> AuditPredicate:
+    """Builds, once per subscriber, the test run against every published audit.
+
+    The application is not part of the predicate: subscribers are already
+    indexed by application in the broker. Audits are published with their
+    CNPJ normalized, so the CNPJ filter is normalized too.
+    """
+    expected = tuple(
+        (name, normalize_cnpj(value) if name == "cnpj" else value)
+        for name in _MATCHED_FIELDS
+        if (value := getattr(filters, name)) is not None
+    )
+
+    if not expected:
+        return lambda data: True
+
+    if len(expected) == 1:
+        ((name, value),) = expected
+        return lambda data: getattr(data, name) == value
+
+    return lambda data: all(getattr(data, name) == value for name, value in expected)
+
+
+@dataclass(eq=False)
+class Subscription:
+    """
+    A live subscriber: its filters and a bounded queue of serialized audits.
+
+    When the subscriber falls behind, the oldest queued audits are discarded
+    and counted in `dropped`, so a slow consumer never blocks ingestion nor
+    grows memory.
+    """
+
+    application: Optional[str]
+    predicate: AuditPredicate
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    dropped: int = 0
+
+    def offer(self, event: bytes) -> None:
+        """Enqueues an audit; must run on the subscriber's event loop."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+
+        self.queue.put_nowait(event)
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+@dataclass
+class InMemoryEventBroker(AuditEventPublisher):
+    queue_size: int
+    # Copy-on-write registry: `publish` reads it without locking.
+    _subscriptions: dict[Optional[str], tuple[Subscription, ...]] = field(
+        default_factory=dict, init=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def subscribe(self, filters: AuditEventFilters) -> Subscription:
+        """Registers a subscriber on the running event loop, indexed by its
+        normalized application like the published audits are looked up."""
+        subscription = Subscription(
+            application=(
+                normalize_application(filters.application)
+                if filters.application is not None
+                else None
+            ),
+            predicate=compile_predicate(filters),
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            loop=asyncio.get_running_loop(),
+        )
+
+        with self._lock:
+            subscriptions = dict(self._subscriptions)
+            subscriptions[subscription.application] = (
+                *subscriptions.get(subscription.application, ()),
+                subscription,
+            )
+            self._subscriptions = subscriptions
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = dict(self._subscriptions)
+            remaining = tuple(
+                current
+                for current in subscriptions.get(subscription.application, ())
+                if current is not subscription
+            )
+            if remaining:
+                subscriptions[subscription.application] = remaining
+            else:
+                subscriptions.pop(subscription.application, None)
+            self._subscriptions = subscriptions
+
+    def publish(self, data: CreateAuditInput) -> None:
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+
+        candidates = subscriptions.get(
+            normalize_application(data.application), ()
+        ) + subscriptions.get(None, ())
+        matched = [
+            subscription for subscription in candidates if subscription.predicate(data)
+        ]
+        if not matched:
+            return
+
+        # Serialized once, whatever the number of subscribers.
+        event = orjson.dumps(data.model_dump())
+
+        for subscription in matched:
+            if _is_running_on(subscription.loop):
+                subscription.offer(event)
+                continue
+
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; it is about to unsubscribe.
+                continue
+
+
+def _is_running_on(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
@@ -0,0 +1,247 @@
+"""
+In-process sealing of ingested audits into a tamper-evident chain.
+
+Each process seals the audits it writes: audits of an application month are
+grouped in batches, and a full (or old) batch is sealed into a checkpoint
+holding the Merkle root of its audit hashes and the hash of the previous
+checkpoint of the process chain. Hashing costs one SHA-256 per audit and one
+checkpoint write per batch, instead of a serialized read-modify-write of a
+per-event chain.
+
+The repeats later coalesced into an audit are sealed the same way, as a leaf
+of a batch of the audit month bound to the hash of the audit.
+
+A background timer seals old batches when no later audit arrives, and the
+remaining ones are sealed when the chain is closed on shutdown. Batches of a
+process killed without shutting down stay unsealed and are reported as such
+by the verification.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from core.models import CoalescedSummary, IntegrityCheckpoint, IntegrityStamp
+from core.repositories.audit_integrity_chain import AuditIntegrityChain
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.application import normalize_application
+from core.shared.integrity import (
+    audit_hash,
+    checkpoint_hash,
+    coalesced_hash,
+    merkle_root,
+)
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+logger = logging.getLogger(__name__)
+
+ChainKey = tuple[str, str]
+
+
+@dataclass(eq=False)
+class _Batch:
+    id: str
+    key: ChainKey
+    opened_at: float
+    reserved: int = 0
+    settled: int = 0
+    closed: bool = False
+    hashes: list[str] = field(default_factory=list)
+
+    @property
+    def is_drained(self) -> bool:
+        return self.settled == self.reserved
+
+
+@dataclass(eq=False)
+class _ChainHead:
+    sequence: int = 0
+    hash: Optional[str] = None
+
+
+@dataclass
+class IntegrityChain(AuditIntegrityChain):
+    """
+    Seals the audits written by this process, per application and month.
+
+    A batch is closed once `batch_size` audits were stamped in it or it is
+    older than `max_batch_age_seconds`, and sealed as soon as the writes of
+    its audits are over. Once started, the chain checks for old batches every
+    `max_batch_age_seconds` even when no audit is stamped.
+    """
+
+    search_engine_client: SearchEngineClient
+    batch_size: int
+    max_batch_age_seconds: float
+    chain: str = field(default_factory=lambda: uuid.uuid4().hex)
+    _open: dict[ChainKey, _Batch] = field(default_factory=dict, init=False)
+    _batches: dict[str, _Batch] = field(default_factory=dict, init=False)
+    _heads: dict[ChainKey, _ChainHead] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _stopped: threading.Event = field(default_factory=threading.Event, init=False)
+    _sealer: Optional[threading.Thread] = field(default=None, init=False)
+
+    def start(self) -> None:
+        """Starts sealing old batches in the background."""
+        self._sealer = threading.Thread(
+            target=self._seal_periodically, name="integrity-sealer", daemon=True
+        )
+        self._sealer.start()
+
+    def stamp(self, data: CreateAuditInput) -> IntegrityStamp:
+        document_hash = audit_hash(data.model_dump(mode="json", exclude_none=True))
+
+        return self._reserve(data, document_hash)
+
+    def stamp_coalesced(
+        self, data: CreateAuditInput, summary: CoalescedSummary
+    ) -> IntegrityStamp:
+        document_hash = audit_hash(data.model_dump(mode="json", exclude_none=True))
+        summary_hash = coalesced_hash(
+            document_hash, summary.model_dump(mode="json", exclude_none=True)
+        )
+
+        return self._reserve(data, summary_hash)
+
+    def settle(self, stamp: IntegrityStamp, stored: bool) -> None:
+        with self._lock:
+            batch = self._batches[stamp.batch]
+            batch.settled += 1
+            if stored:
+                batch.hashes.append(stamp.hash)
+
+            sealable = self._pop_sealable([batch])
+
+        self._seal(sealable)
+
+    def seal_expired(self) -> None:
+        """Seals the batches older than `max_batch_age_seconds` whose writes
+        are over."""
+        with self._lock:
+            sealable = self._close_expired(time.monotonic())
+
+        self._seal(sealable)
+
+    def close(self) -> None:
+        """Stops the background sealing and seals every batch whose writes
+        are over."""
+        self._stopped.set()
+        if self._sealer is not None:
+            self._sealer.join()
+
+        with self._lock:
+            for batch in self._open.values():
+                batch.closed = True
+            sealable = self._pop_sealable(list(self._batches.values()))
+
+        self._seal(sealable)
+
+    def _seal_periodically(self) -> None:
+        # A frozen Lambda environment pauses this thread; it catches up as
+        # soon as the environment is thawed.
+        while not self._stopped.wait(self.max_batch_age_seconds):
+            self.seal_expired()
+
+    def _reserve(self, data: CreateAuditInput, leaf: str) -> IntegrityStamp:
+        month = datetime.fromisoformat(data.ingested_at).strftime("%Y.%m")
+        key = (normalize_application(data.application), month)
+
+        with self._lock:
+            sealable = self._close_expired(time.monotonic())
+            batch = self._open.get(key)
+            if batch is None or batch.closed:
+                batch = self._open_batch(key)
+
+            batch.reserved += 1
+            if batch.reserved >= self.batch_size:
+                batch.closed = True
+
+        self._seal(sealable)
+
+        return IntegrityStamp(hash=leaf, batch=batch.id, month=month)
+
+    def _open_batch(self, key: ChainKey) -> _Batch:
+        batch = _Batch(id=uuid.uuid4().hex, key=key, opened_at=time.monotonic())
+        self._open[key] = batch
+        self._batches[batch.id] = batch
+
+        return batch
+
+    def _close_expired(self, now: float) -> list[IntegrityCheckpoint]:
+        expired = [
+            batch
+            for batch in self._open.values()
+            if not batch.closed and now - batch.opened_at >= self.max_batch_age_seconds
+        ]
+        for batch in expired:
+            batch.closed = True
+
+        return self._pop_sealable(expired)
+
+    def _pop_sealable(self, batches: list[_Batch]) -> list[IntegrityCheckpoint]:
+        # Runs under the lock, so checkpoints take their place in the chain in
+        # the order batches are sealed; they are written outside of it.
+        checkpoints = []
+        for batch in batches:
+            if not (batch.closed and batch.is_drained):
+                continue
+
+            del self._batches[batch.id]
+            if self._open.get(batch.key) is batch:
+                del self._open[batch.key]
+
+            # A batch whose writes all failed seals nothing.
+            if batch.hashes:
+                checkpoints.append(self._link(batch))
+
+        return checkpoints
+
+    def _link(self, batch: _Batch) -> IntegrityCheckpoint:
+        head = self._heads.setdefault(batch.key, _ChainHead())
+        application, month = batch.key
+        root = merkle_root(batch.hashes)
+        checkpoint = IntegrityCheckpoint(
+            batch=batch.id,
+            chain=self.chain,
+            sequence=head.sequence,
+            application=application,
+            month=month,
+            count=len(batch.hashes),
+            root=root,
+            previous_hash=head.hash,
+            hash=checkpoint_hash(head.hash, root, len(batch.hashes), batch.id),
+            sealed_at=datetime.now(timezone.utc),
+        )
+        head.sequence += 1
+        head.hash = checkpoint.hash
+
+        return checkpoint
+
+    def _seal(self, checkpoints: list[IntegrityCheckpoint]) -> None:
+        for checkpoint in checkpoints:
+            try:
+                self.search_engine_client.save_checkpoint(checkpoint)
+            except Exception:
+                # The audits are stored; the verification reports the gap.
+                logger.exception("Could not save checkpoint %s", checkpoint.batch)
+
+
+def integrity_chain_resource(
+    search_engine_client: SearchEngineClient,
+    batch_size: int,
+    max_batch_age_seconds: float,
+) -> Iterator[IntegrityChain]:
+    """Provides the integrity chain of the process, sealing old batches in the
+    background and the remaining ones on shutdown."""
+    chain = IntegrityChain(
+        search_engine_client=search_engine_client,
+        batch_size=batch_size,
+        max_batch_age_seconds=max_batch_age_seconds,
+    )
+    chain.start()
+    yield chain
+    chain.close()
@@ -0,0 +1,108 @@
+import json
+import logging
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from core.shared.errors import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+JwksFetcher = Callable[[str], dict]
+
+
+def fetch_jwks(jwks_url: str) -> dict:
+    """Downloads a JSON Web Key Set.
+
+    Parameters
+    ----------
+    jwks_url : str
+        The URL of the key set, e.g. `https://<domain>/.well-known/jwks.json`.
+
+    Returns
+    -------
+    dict
+        The key set, with its keys under `keys`.
+    """
+    with urllib.request.urlopen(jwks_url, timeout=3) as response:
+        return json.loads(response.read())
+
+
+@dataclass
+class _KeySet:
+    keys: dict[str, dict]
+    expires_at: float
+    fetched_at: float
+
+
+@dataclass
+class JwksCache:
+    """
+    Caches the signing keys of each issuer for `ttl_seconds`.
+
+    A token signed with an unknown `kid` (e.g. right after a key rotation)
+    triggers a refresh, at most once per `min_refresh_interval_seconds` per
+    issuer so forged kids cannot flood the identity provider. When a refresh
+    fails, the keys fetched before, if any, keep being used until the next
+    attempt. `fetch` can be replaced by a stub returning a local key set.
+    """
+
+    ttl_seconds: int
+    min_refresh_interval_seconds: int
+    fetch: JwksFetcher = fetch_jwks
+    _key_sets: dict[str, _KeySet] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def get_key(self, jwks_url: str, kid: str) -> Optional[dict]:
+        """Returns the JWK with the given id, or None when the issuer has none.
+
+        Raises
+        ------
+        ServiceUnavailableError
+            When the key set cannot be fetched and none was fetched before.
+        """
+        now = time.monotonic()
+        key_set = self._key_sets.get(jwks_url)
+
+        if key_set is not None and key_set.expires_at > now:
+            key = key_set.keys.get(kid)
+            if key is not None:
+                return key
+            if now - key_set.fetched_at < self.min_refresh_interval_seconds:
+                return None
+
+        return self._refresh(jwks_url).keys.get(kid)
+
+    def _refresh(self, jwks_url: str) -> _KeySet:
+        with self._lock:
+            now = time.monotonic()
+            key_set = self._key_sets.get(jwks_url)
+            # Another thread may have refreshed it while this one waited.
+            if key_set is not None and (
+                now - key_set.fetched_at < self.min_refresh_interval_seconds
+            ):
+                return key_set
+
+            try:
+                jwks = self.fetch(jwks_url)
+            except (OSError, ValueError) as exc:
+                # URLError and timeouts are OSErrors, bad JSON a ValueError.
+                if key_set is None:
+                    raise ServiceUnavailableError(
+                        "The token signing keys are unavailable"
+                    ) from exc
+
+                logger.warning("Could not refresh %s, keeping stale keys", jwks_url)
+                key_set.fetched_at = now
+                return key_set
+
+            key_set = _KeySet(
+                keys={key["kid"]: key for key in jwks.get("keys", []) if "kid" in key},
+                expires_at=now + self.ttl_seconds,
+                fetched_at=now,
+            )
+            self._key_sets[jwks_url] = key_set
+
+        return key_set
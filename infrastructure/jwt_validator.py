@@ -0,0 +1,137 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from jose import jwt
+from jose.exceptions import JWTError
+
+from core.shared.errors import UnauthorizedError
+from infrastructure.jwks_cache import JwksCache
+
+TenantsLoader = Callable[[], dict[str, dict]]
+
+
+@dataclass
+class JwtValidator:
+    """
+    Validates Auth0 bearer tokens of the configured tenants.
+
+    `tenants` returns the tenants configuration, shaped as
+    `{"<tenant>": {"domain": "<tenant>.auth0.com", "audience": "<api>"}}`;
+    the token issuer picks the tenant. Signing keys come from `jwks_cache`,
+    and the claims of verified tokens are kept, keyed by the token hash, until
+    the token expires, so a service reusing its token only pays the signature
+    verification once.
+    """
+
+    tenants: TenantsLoader
+    jwks_cache: JwksCache
+    claims_cache_size: int
+    algorithms: tuple[str, ...] = ("RS256",)
+    _claims: "OrderedDict[bytes, tuple[float, dict]]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _tenants_source: Optional[dict] = field(default=None, init=False)
+    _tenants_by_issuer: dict[str, dict] = field(default_factory=dict, init=False)
+
+    def validate(self, token: str) -> dict[str, Any]:
+        """Returns the claims of the token, raising if it is not valid.
+
+        Parameters
+        ----------
+        token : str
+            The encoded JWT, without the `Bearer` prefix.
+
+        Returns
+        -------
+        dict[str, Any]
+            The verified claims.
+
+        Raises
+        ------
+        UnauthorizedError
+            When the token is malformed, expired, without audience or with
+            another one, from an unknown issuer or signed with an unknown key.
+        ServiceUnavailableError
+            When the signing keys of the issuer cannot be fetched.
+        """
+        token_hash = hashlib.sha256(token.encode()).digest()
+        claims = self._cached_claims(token_hash)
+        if claims is not None:
+            return claims
+
+        claims = self._verify(token)
+        self._cache_claims(token_hash, claims)
+
+        return claims
+
+    def _verify(self, token: str) -> dict[str, Any]:
+        try:
+            header = jwt.get_unverified_header(token)
+            issuer = jwt.get_unverified_claims(token).get("iss")
+        except JWTError as exc:
+            raise UnauthorizedError(f"Malformed token: {exc}") from exc
+
+        tenant = self._tenant_for(issuer)
+        if tenant is None:
+            raise UnauthorizedError("Unknown token issuer")
+
+        key = self.jwks_cache.get_key(
+            f"https://{tenant['domain']}/.well-known/jwks.json", header.get("kid")
+        )
+        if key is None:
+            raise UnauthorizedError("Unknown token signing key")
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=list(self.algorithms),
+                audience=tenant.get("audience"),
+                issuer=issuer,
+                # Tokens without `aud` would otherwise pass the audience check.
+                options={"require_aud": True},
+            )
+        except JWTError as exc:
+            raise UnauthorizedError(f"Invalid token: {exc}") from exc
+
+    def _tenant_for(self, issuer: Optional[str]) -> Optional[dict]:
+        tenants = self.tenants()
+        # The loader returns the same cached object until the secret changes.
+        if tenants is not self._tenants_source:
+            self._tenants_by_issuer = {
+                f"https://{tenant['domain']}/": tenant for tenant in tenants.values()
+            }
+            self._tenants_source = tenants
+
+        return self._tenants_by_issuer.get(issuer)
+
+    def _cached_claims(self, token_hash: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._claims.get(token_hash)
+            if entry is None:
+                return None
+
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._claims[token_hash]
+                return None
+
+            self._claims.move_to_end(token_hash)
+
+        return claims
+
+    def _cache_claims(self, token_hash: bytes, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+
+        with self._lock:
+            self._claims[token_hash] = (expires_at, claims)
+            self._claims.move_to_end(token_hash)
+            while len(self._claims) > self.claims_cache_size:
+                self._claims.popitem(last=False)
@@ -0,0 +1,67 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+try:
+    from datadog_lambda.metric import lambda_metric
+except ImportError:  # pragma: no cover - only shipped with the Lambda image
+    lambda_metric = None
+
+logger = logging.getLogger(__name__)
+
+MetricKey = tuple[str, tuple[str, ...]]
+
+
+@dataclass
+class MetricsSink:
+    """
+    Aggregates counters in memory and periodically ships them.
+
+    Recording a metric is a dict update; the aggregated values are sent to
+    Datadog (when `datadog_lambda` is available, or logged otherwise) every
+    `flush_interval_seconds` and when the sink is closed.
+    """
+
+    namespace: str
+    flush_interval_seconds: int
+    _counters: dict[MetricKey, float] = field(
+        default_factory=lambda: defaultdict(float), init=False
+    )
+    _last_flush: float = field(default_factory=time.monotonic, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def increment(
+        self, name: str, value: float = 1, tags: Optional[dict[str, str]] = None
+    ) -> None:
+        key = (name, tuple(f"{k}:{v}" for k, v in tags.items()) if tags else ())
+        with self._lock:
+            self._counters[key] += value
+
+        if time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(float)
+            self._last_flush = time.monotonic()
+
+        for (name, tags), value in counters.items():
+            metric_name = f"{self.namespace}.{name}"
+            if lambda_metric is not None:
+                lambda_metric(metric_name, value, tags=list(tags))
+            else:
+                logger.info("metric %s=%s tags=%s", metric_name, value, list(tags))
+
+
+def metrics_sink_resource(
+    namespace: str, flush_interval_seconds: int
+) -> Iterator[MetricsSink]:
+    """Provides a metrics sink that is flushed when the application stops."""
+    metrics_sink = MetricsSink(
+        namespace=namespace, flush_interval_seconds=flush_interval_seconds
+    )
+    yield metrics_sink
+    metrics_sink.flush()
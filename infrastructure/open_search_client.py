@@ -1,25 +1,788 @@
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, Optional
 
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, helpers
+from opensearchpy.exceptions import NotFoundError, RequestError
 
 from config.settings import settings
+from core.models import (
+    AuditModel,
+    AuditSearchFilters,
+    CoalescedSummary,
+    DailyActivity,
+    EventSchema,
+    IntegrityCheckpoint,
+)
 from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.application import normalize_application
+from core.shared.cnpj import cnpj_values, normalize_cnpj
 from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from infrastructure.open_search_indices import (
+    EVENT_SCHEMA_INDEX,
+    LOOKUP_INDEX_PATTERN,
+    ROLLUP_STATE_INDEX,
+    application_index_patterns,
+    checkpoint_index,
+    lookup_index,
+    month_indices,
+    read_indices,
+    read_routing,
+    rollup_index,
+    routing_for,
+    write_index,
+)
+
+logger = logging.getLogger(__name__)
+
+# Page size of the scrolls streaming whole indices.
+_SCROLL_SIZE = 1000
+# Distinct actor counts are exact up to this many actors per day.
+_ACTORS_PRECISION_THRESHOLD = 40000
+_DAILY_HISTOGRAM = {
+    "field": "timestamp",
+    "calendar_interval": "1d",
+    "format": "yyyy-MM-dd",
+}
+# Coalesced repeats are recorded on their audit well within this delay.
+_LATE_RECORD_MARGIN = timedelta(days=1)
+# Audit fields whose distinct values are suggested by the typeahead.
+_LOOKUP_FIELDS = ("actor", "resource_id")
+# Longest prefix indexed for the typeahead; longer ones are also checked
+# against the whole value.
+_LOOKUP_MAX_PREFIX = 64
+# Values are indexed with every prefix of their lowercase form, so a
+# suggestion is a single term lookup instead of a scan of the term dictionary.
+_LOOKUP_TEMPLATE = {
+    "index_patterns": [LOOKUP_INDEX_PATTERN],
+    "settings": {
+        "analysis": {
+            "filter": {
+                "prefixes": {
+                    "type": "edge_ngram",
+                    "min_gram": 1,
+                    "max_gram": _LOOKUP_MAX_PREFIX,
+                }
+            },
+            "analyzer": {
+                "prefixes": {
+                    "tokenizer": "keyword",
+                    "filter": ["lowercase", "prefixes"],
+                },
+                "lowercase": {"tokenizer": "keyword", "filter": ["lowercase"]},
+            },
+        },
+    },
+    "mappings": {
+        "properties": {
+            "field": {"type": "keyword"},
+            "application": {"type": "keyword"},
+            "cnpj": {"type": "keyword"},
+            "value": {
+                "type": "text",
+                "analyzer": "prefixes",
+                "search_analyzer": "lowercase",
+                "fields": {"keyword": {"type": "keyword"}},
+            },
+        }
+    },
+}
+
+LookupKey = tuple[str, str, str, str]
+
+
+def _compression_options() -> dict:
+    """Builds the HTTP compression arguments of the OpenSearch client.
+
+    Returns
+    -------
+    dict
+        Keyword arguments to be given to the `OpenSearch` constructor.
+    """
+    options = {"http_compress": settings.opensearch_request_compression}
+
+    if settings.opensearch_response_compression:
+        options["headers"] = {"accept-encoding": "gzip,deflate"}
+
+    return options
+
+
+def open_search_connection() -> Iterator[OpenSearch]:
+    """Provides the OpenSearch client, and its connection pool, for the
+    application lifetime. Each server worker builds its own pool."""
+    client = OpenSearch(
+        hosts=[{"host": settings.open_search_domain, "port": settings.opensearch_port}],
+        maxsize=settings.opensearch_pool_maxsize,
+        **_compression_options(),
+    )
+    yield client
+    client.close()
 
 
 @dataclass
 class OpenSearchClient(SearchEngineClient):
-    client = OpenSearch(
-        hosts=[{"host": settings.open_search_domain, "port": settings.opensearch_port}]
+    """
+    Stores and reads the audits on OpenSearch.
+
+    With `record_lookups`, the distinct actors and resource ids of the
+    written audits are also kept in a small lookup index per application,
+    for the typeahead. The last `lookup_cache_size` values seen by the
+    process are not written again.
+    """
+
+    client: OpenSearch
+    record_lookups: bool = False
+    lookup_cache_size: int = 100_000
+    _seen_lookups: "OrderedDict[LookupKey, None]" = field(
+        default_factory=OrderedDict, init=False
     )
+    _lookup_template_ready: bool = field(default=False, init=False)
+    _lookup_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
 
     def upsert(self, data: CreateAuditInput) -> dict:
-        now = datetime.now(timezone.utc)
-        app_name = data.application.lower().replace("_", "-")
-        index = f"audit-{app_name}-{now.strftime('%Y.%m')}"
-        document = data.model_dump()
+        written_at = (
+            datetime.fromisoformat(data.ingested_at)
+            if data.ingested_at
+            else datetime.now(timezone.utc)
+        )
+        index = write_index(data.application, data.cnpj, written_at)
+        # Stored exactly as hashed by the integrity chain.
+        document = data.model_dump(mode="json", exclude_none=True)
 
-        response = self.client.index(index=index, body=document, refresh="true")
+        response = self.client.index(
+            index=index,
+            body=document,
+            routing=routing_for(data.cnpj),
+            refresh="true",
+        )
+        self._record_lookups([data])
 
         return response
+
+    def bulk_upsert(
+        self,
+        data: list[CreateAuditInput],
+        ids: Optional[list[str]] = None,
+        month: Optional[str] = None,
+        index_suffix: str = "",
+    ) -> int:
+        now = datetime.now(timezone.utc)
+
+        actions = []
+        for position, audit in enumerate(data):
+            action = {
+                "_index": _bulk_write_index(audit, month, now) + index_suffix,
+                "_source": audit.model_dump(mode="json", exclude_none=True),
+            }
+            if routing := routing_for(audit.cnpj):
+                action["_routing"] = routing
+            if ids is not None:
+                action["_id"] = ids[position]
+            actions.append(action)
+
+        # The caller sizes the batches: they are sent as a single request.
+        written, errors = helpers.bulk(
+            self.client,
+            actions,
+            chunk_size=max(len(actions), 1),
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+        if errors:
+            logger.warning(
+                "%d audits not written, first error: %s", len(errors), errors[0]
+            )
+        self._record_lookups(data)
+
+        return written
+
+    def delete_moved(
+        self,
+        data: list[CreateAuditInput],
+        ids: list[str],
+        month: str,
+        routings: Optional[list[Optional[str]]] = None,
+    ) -> int:
+        now = datetime.now(timezone.utc)
+        # Grouped by target index, each group deleted from the other ones.
+        moved: dict[tuple[str, str], list[str]] = defaultdict(list)
+        # Grouped by target index and new routing, each group deleted from the
+        # target index with its previous routings.
+        rerouted: dict[
+            tuple[str, Optional[str]], dict[str, Optional[str]]
+        ] = defaultdict(dict)
+        for position, (audit, audit_id) in enumerate(zip(data, ids)):
+            target = _bulk_write_index(audit, month, now)
+            moved[(normalize_application(audit.application), target)].append(audit_id)
+            routing = routing_for(audit.cnpj)
+            if routings is not None and routings[position] != routing:
+                rerouted[(target, routing)][audit_id] = routings[position]
+
+        deleted = 0
+        for (application, target), target_ids in moved.items():
+            # The exclusion follows the tenant wildcard, which it applies to.
+            indices = [
+                index for index in month_indices(application, month) if index != target
+            ]
+            response = self.client.delete_by_query(
+                index=",".join([*indices, f"-{target}"]),
+                body={"query": {"ids": {"values": target_ids}}},
+                conflicts="proceed",
+                refresh=True,
+                ignore_unavailable=True,
+                allow_no_indices=True,
+            )
+            deleted += response["deleted"]
+
+        for (target, routing), previous in rerouted.items():
+            # Deleted by query rather than by id and previous routing: when
+            # both routings map to the same shard, the rewrite replaced the
+            # previous copy, and a delete by id would remove it.
+            query: dict = {"bool": {"filter": [{"ids": {"values": list(previous)}}]}}
+            if routing is None:
+                # Unrouted copies have no _routing, so the previous ones are
+                # all set.
+                query["bool"]["filter"].append(
+                    {"terms": {"_routing": sorted(set(previous.values()))}}
+                )
+            else:
+                query["bool"]["must_not"] = [{"term": {"_routing": routing}}]
+            response = self.client.delete_by_query(
+                index=target,
+                body={"query": query},
+                conflicts="proceed",
+                refresh=True,
+                ignore_unavailable=True,
+            )
+            deleted += response["deleted"]
+
+        return deleted
+
+    def update_coalesced(
+        self, updates: list[tuple[dict, str, CoalescedSummary]]
+    ) -> set[str]:
+        actions = []
+        for reference, cnpj, summary in updates:
+            action = {
+                "_op_type": "update",
+                "_index": reference["_index"],
+                "_id": reference["_id"],
+                "doc": {
+                    "coalesced": summary.model_dump(mode="json", exclude_none=True)
+                },
+            }
+            if routing := routing_for(cnpj):
+                action["_routing"] = routing
+            actions.append(action)
+
+        _, errors = helpers.bulk(
+            self.client, actions, raise_on_error=False, raise_on_exception=False
+        )
+        if errors:
+            logger.warning(
+                "%d coalesced summaries not recorded, first error: %s",
+                len(errors),
+                errors[0],
+            )
+
+        return {result["_id"] for error in errors for result in error.values()}
+
+    def search(
+        self,
+        filters: AuditSearchFilters,
+        size: int,
+        includes: Optional[list[str]] = None,
+        excludes: Optional[list[str]] = None,
+    ) -> list[AuditModel]:
+        body = {
+            "query": _build_query(filters),
+            "sort": [{"timestamp": {"order": "desc", "unmapped_type": "date"}}],
+        }
+        if includes or excludes:
+            body["_source"] = {"includes": includes or [], "excludes": excludes or []}
+
+        response = self.client.search(
+            index=",".join(read_indices(filters)),
+            body=body,
+            size=size,
+            routing=read_routing(filters),
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+
+        # Documents come from our own indices, so validation is skipped.
+        return [
+            AuditModel.model_construct(id=hit["_id"], **hit.get("_source", {}))
+            for hit in response["hits"]["hits"]
+        ]
+
+    def count(self, filters: AuditSearchFilters) -> int:
+        response = self.client.count(
+            index=",".join(read_indices(filters)),
+            body={"query": _build_query(filters)},
+            routing=read_routing(filters),
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+
+        return response["count"]
+
+    def exists(self, filters: AuditSearchFilters) -> bool:
+        # Each shard stops collecting at the first match, so the cost does
+        # not grow with the number of matching audits.
+        response = self.client.search(
+            index=",".join(read_indices(filters)),
+            body={
+                "query": _build_query(filters),
+                "size": 0,
+                "terminate_after": 1,
+                "track_total_hits": True,
+            },
+            routing=read_routing(filters),
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+
+        return response["hits"]["total"]["value"] > 0
+
+    def save_checkpoint(self, checkpoint: IntegrityCheckpoint) -> None:
+        self.client.index(
+            index=checkpoint_index(checkpoint.application),
+            id=checkpoint.batch,
+            body=checkpoint.model_dump(mode="json"),
+        )
+
+    def list_checkpoints(
+        self, application: str, month: str
+    ) -> list[IntegrityCheckpoint]:
+        hits = helpers.scan(
+            self.client,
+            index=checkpoint_index(application),
+            query={"query": {"term": {"month.keyword": month}}},
+            size=_SCROLL_SIZE,
+            ignore_unavailable=True,
+        )
+
+        return [IntegrityCheckpoint(**hit["_source"]) for hit in hits]
+
+    def scan_month(
+        self,
+        application: str,
+        month: str,
+        slice_id: Optional[int] = None,
+        slices: Optional[int] = None,
+    ) -> Iterator[tuple[str, dict, Optional[str]]]:
+        query: dict = {"query": {"match_all": {}}}
+        if slices and slices > 1:
+            query["slice"] = {"id": slice_id, "max": slices}
+
+        hits = helpers.scan(
+            self.client,
+            index=",".join(month_indices(application, month)),
+            query=query,
+            size=_SCROLL_SIZE,
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+
+        for hit in hits:
+            yield hit["_id"], hit["_source"], hit.get("_routing")
+
+    def save_event_schema(self, schema: EventSchema) -> None:
+        application = normalize_application(schema.application)
+        self.client.index(
+            index=EVENT_SCHEMA_INDEX,
+            id=f"{application}:{schema.event_type}",
+            body={**schema.model_dump(), "application": application},
+            refresh="true",
+        )
+
+    def list_event_schemas(
+        self, application: Optional[str] = None
+    ) -> list[EventSchema]:
+        query = {"match_all": {}}
+        if application:
+            query = {
+                "term": {"application.keyword": normalize_application(application)}
+            }
+
+        hits = helpers.scan(
+            self.client,
+            index=EVENT_SCHEMA_INDEX,
+            query={"query": query},
+            size=_SCROLL_SIZE,
+            ignore_unavailable=True,
+        )
+
+        return [EventSchema(**hit["_source"]) for hit in hits]
+
+    def put_metadata_mapping(self, application: str, mapping: dict) -> bool:
+        app_name = normalize_application(application)
+        self.client.indices.put_template(
+            name=f"audit-{app_name}-metadata",
+            body={
+                "index_patterns": application_index_patterns(application),
+                "order": 10,
+                "mappings": mapping,
+            },
+        )
+
+        current_month = datetime.now(timezone.utc).strftime("%Y.%m")
+        try:
+            self.client.indices.put_mapping(
+                index=",".join(month_indices(application, current_month)),
+                body=mapping,
+                ignore_unavailable=True,
+                allow_no_indices=True,
+            )
+        except RequestError:
+            # Fields already mapped dynamically cannot change type: the
+            # current indices keep them, the next monthly ones get the schema.
+            logger.warning(
+                "Metadata mapping of %s applies from the next month", app_name
+            )
+            return False
+
+        return True
+
+    def daily_activity(self, filters: AuditSearchFilters) -> Iterator[DailyActivity]:
+        application = normalize_application(filters.application)
+        composite: dict = {
+            "size": _SCROLL_SIZE,
+            "sources": [
+                {"cnpj": {"terms": {"field": "cnpj.keyword"}}},
+                {"event_type": {"terms": {"field": "event_type.keyword"}}},
+                {"day": {"date_histogram": _DAILY_HISTOGRAM}},
+            ],
+        }
+        actors = {
+            "cardinality": {
+                "field": "actor.keyword",
+                "precision_threshold": _ACTORS_PRECISION_THRESHOLD,
+            }
+        }
+        # A stored audit stands for its coalesced repeats too.
+        count = {"sum": {"field": "coalesced.count", "missing": 1}}
+        # Audits stored before CNPJs were normalized are grouped under their
+        # raw CNPJ, sorted apart from the normalized one, so the rows of a
+        # tenant are merged once every bucket is read.
+        rows: dict[tuple[str, str, str], DailyActivity] = {}
+
+        while True:
+            response = self.client.search(
+                index=",".join(read_indices(filters)),
+                body={
+                    "query": _build_query(filters),
+                    "size": 0,
+                    "aggs": {
+                        "activity": {
+                            "composite": composite,
+                            "aggs": {"actors": actors, "count": count},
+                        }
+                    },
+                },
+                routing=read_routing(filters),
+                ignore_unavailable=True,
+                allow_no_indices=True,
+            )
+            # Absent when no index matches.
+            activity = response.get("aggregations", {}).get("activity", {})
+            buckets = activity.get("buckets", [])
+
+            for bucket in buckets:
+                row = DailyActivity(
+                    application=application,
+                    cnpj=normalize_cnpj(bucket["key"]["cnpj"]),
+                    event_type=bucket["key"]["event_type"],
+                    day=bucket["key"]["day"],
+                    count=int(bucket["count"]["value"]),
+                    distinct_actors=bucket["actors"]["value"],
+                )
+                key = (row.cnpj, row.event_type, row.day.isoformat())
+                if merged := rows.get(key):
+                    # An actor found under both forms is counted twice.
+                    row = merged.model_copy(
+                        update={
+                            "count": merged.count + row.count,
+                            "distinct_actors": merged.distinct_actors
+                            + row.distinct_actors,
+                        }
+                    )
+                rows[key] = row
+
+            if len(buckets) < _SCROLL_SIZE or "after_key" not in activity:
+                break
+            composite["after"] = activity["after_key"]
+
+        for key in sorted(rows):
+            yield rows[key]
+
+    def ingested_days(
+        self, application: str, after: Optional[str], until: str
+    ) -> list[date]:
+        window = {"lte": until}
+        if after:
+            window["gt"] = after
+        # Audits whose coalesced repeats were recorded meanwhile changed too.
+        clauses = [
+            {"range": {"ingested_at": window}},
+            {"range": {"coalesced.recorded_at": window}},
+        ]
+        if not after:
+            # Audits stored before `ingested_at` was recorded count as ingested.
+            clauses.append({"bool": {"must_not": {"exists": {"field": "ingested_at"}}}})
+
+        # Indices are monthly by ingestion, so older months are skipped; repeats
+        # may be recorded on audits ingested a little before the mark.
+        filters = AuditSearchFilters(
+            application=application,
+            start_date=(
+                (datetime.fromisoformat(after) - _LATE_RECORD_MARGIN).date()
+                if after
+                else None
+            ),
+        )
+        response = self.client.search(
+            index=",".join(read_indices(filters)),
+            body={
+                "query": {"bool": {"should": clauses, "minimum_should_match": 1}},
+                "size": 0,
+                "aggs": {
+                    "days": {"date_histogram": {**_DAILY_HISTOGRAM, "min_doc_count": 1}}
+                },
+            },
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+        buckets = response.get("aggregations", {}).get("days", {}).get("buckets", [])
+
+        return [date.fromisoformat(bucket["key_as_string"]) for bucket in buckets]
+
+    def save_rollups(self, application: str, rollups: list[DailyActivity]) -> None:
+        actions = []
+        for rollup in rollups:
+            action = {
+                "_index": rollup_index(application),
+                "_id": f"{rollup.cnpj}:{rollup.event_type}:{rollup.day.isoformat()}",
+                "_source": rollup.model_dump(mode="json"),
+            }
+            if routing := routing_for(rollup.cnpj):
+                action["_routing"] = routing
+            actions.append(action)
+
+        helpers.bulk(self.client, actions, chunk_size=_SCROLL_SIZE)
+
+    def search_rollups(self, filters: AuditSearchFilters) -> list[DailyActivity]:
+        clauses = []
+        if filters.cnpj:
+            clauses.append({"terms": {"cnpj.keyword": cnpj_values(filters.cnpj)}})
+        if filters.event_type:
+            clauses.append({"term": {"event_type.keyword": filters.event_type}})
+        day_range = {}
+        if filters.start_date:
+            day_range["gte"] = filters.start_date.isoformat()
+        if filters.end_date:
+            day_range["lte"] = filters.end_date.isoformat()
+        if day_range:
+            clauses.append({"range": {"day": day_range}})
+
+        hits = helpers.scan(
+            self.client,
+            index=rollup_index(filters.application),
+            query={"query": {"bool": {"filter": clauses}}},
+            size=_SCROLL_SIZE,
+            routing=routing_for(filters.cnpj),
+            ignore_unavailable=True,
+        )
+
+        return [DailyActivity(**hit["_source"]) for hit in hits]
+
+    def get_rollup_high_water_mark(self, application: str) -> Optional[str]:
+        try:
+            response = self.client.get(
+                index=ROLLUP_STATE_INDEX, id=normalize_application(application)
+            )
+        except NotFoundError:
+            return None
+
+        return response["_source"]["high_water_mark"]
+
+    def save_rollup_high_water_mark(
+        self, application: str, high_water_mark: str
+    ) -> None:
+        application = normalize_application(application)
+        self.client.index(
+            index=ROLLUP_STATE_INDEX,
+            id=application,
+            body={"application": application, "high_water_mark": high_water_mark},
+        )
+
+    def suggest(
+        self,
+        lookup_field: str,
+        prefix: str,
+        size: int,
+        application: Optional[str] = None,
+        cnpj: Optional[str] = None,
+    ) -> list[str]:
+        clauses = [
+            {"term": {"field": lookup_field}},
+            {"match": {"value": prefix[:_LOOKUP_MAX_PREFIX]}},
+        ]
+        if len(prefix) > _LOOKUP_MAX_PREFIX:
+            clauses.append(
+                {
+                    "prefix": {
+                        "value.keyword": {"value": prefix, "case_insensitive": True}
+                    }
+                }
+            )
+        if cnpj:
+            clauses.append({"terms": {"cnpj": cnpj_values(cnpj)}})
+
+        body = {
+            "query": {"bool": {"filter": clauses}},
+            "sort": ["value.keyword"],
+            "_source": ["value"],
+        }
+        if not (cnpj and application):
+            # The same value is recorded once per tenant and application.
+            body["collapse"] = {"field": "value.keyword"}
+
+        response = self.client.search(
+            index=lookup_index(application),
+            body=body,
+            size=size,
+            routing=routing_for(cnpj),
+            ignore_unavailable=True,
+            allow_no_indices=True,
+        )
+
+        return [hit["_source"]["value"] for hit in response["hits"]["hits"]]
+
+    def _record_lookups(self, audits: list[CreateAuditInput]) -> None:
+        if not self.record_lookups:
+            return
+
+        keys = {
+            (normalize_application(audit.application), audit.cnpj, name, value)
+            for audit in audits
+            for name in _LOOKUP_FIELDS
+            if (value := getattr(audit, name))
+        }
+        with self._lookup_lock:
+            unseen = [key for key in keys if key not in self._seen_lookups]
+            for key in keys - set(unseen):
+                self._seen_lookups.move_to_end(key)
+        if not unseen:
+            return
+
+        actions = {}
+        for key in unseen:
+            application, cnpj, name, value = key
+            lookup_id = hashlib.sha1(f"{name}:{cnpj}:{value}".encode()).hexdigest()
+            action = {
+                # Created once, so other processes recording the same value
+                # only get a conflict.
+                "_op_type": "create",
+                "_index": lookup_index(application),
+                "_id": lookup_id,
+                "_source": {
+                    "field": name,
+                    "application": application,
+                    "cnpj": cnpj,
+                    "value": value,
+                },
+            }
+            if routing := routing_for(cnpj):
+                action["_routing"] = routing
+            actions[lookup_id] = (key, action)
+
+        # The audits are stored already: a lookup failure only delays the
+        # suggestion of their values until they are written again.
+        try:
+            self._put_lookup_template()
+            _, errors = helpers.bulk(
+                self.client,
+                [action for _, action in actions.values()],
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+        except Exception:
+            logger.exception("Could not record %d lookup values", len(actions))
+            return
+
+        failed = {
+            result["_id"]: result
+            for error in errors
+            for result in error.values()
+            if result.get("status") != 409
+        }
+        if failed:
+            logger.warning(
+                "%d lookup values not recorded, first error: %s",
+                len(failed),
+                next(iter(failed.values())),
+            )
+
+        with self._lookup_lock:
+            self._seen_lookups.update(
+                (key, None)
+                for lookup_id, (key, _) in actions.items()
+                if lookup_id not in failed
+            )
+            while len(self._seen_lookups) > self.lookup_cache_size:
+                self._seen_lookups.popitem(last=False)
+
+    def _put_lookup_template(self) -> None:
+        if self._lookup_template_ready:
+            return
+
+        self.client.indices.put_template(name="audit_lookup", body=_LOOKUP_TEMPLATE)
+        self._lookup_template_ready = True
+
+
+def _bulk_write_index(
+    audit: CreateAuditInput, month: Optional[str], now: datetime
+) -> str:
+    if month:
+        written_at = datetime.strptime(month, "%Y.%m").replace(tzinfo=timezone.utc)
+    elif audit.ingested_at:
+        written_at = datetime.fromisoformat(audit.ingested_at)
+    else:
+        written_at = now
+
+    return write_index(audit.application, audit.cnpj, written_at)
+
+
+def _build_query(filters: AuditSearchFilters) -> dict:
+    """Translates the search filters into an OpenSearch bool query.
+
+    The application is not filtered here: it is already encoded in the
+    searched index names.
+    """
+    clauses = [
+        {"term": {f"{field}.keyword": value}}
+        for field, value in (
+            ("actor", filters.actor),
+            ("event_type", filters.event_type),
+            ("resource_id", filters.resource_id),
+        )
+        if value
+    ]
+    if filters.cnpj:
+        clauses.append({"terms": {"cnpj.keyword": cnpj_values(filters.cnpj)}})
+
+    timestamp_range = {}
+    if filters.start_date:
+        timestamp_range["gte"] = filters.start_date.isoformat()
+    if filters.end_date:
+        timestamp_range["lte"] = filters.end_date.isoformat()
+    if timestamp_range:
+        clauses.append({"range": {"timestamp": timestamp_range}})
+
+    return {"bool": {"filter": clauses}}
@@ -0,0 +1,183 @@
+"""
+Naming rules of the audit indices.
+
+Audits are written to monthly indices named `audit-{application}-{YYYY.MM}`.
+Tenants listed in `settings.opensearch_dedicated_tenants` get their own
+monthly indices, `audit-{application}-tenant-{cnpj}-{YYYY.MM}`, so they can be
+sized and scaled independently from the shared ones.
+
+Integrity checkpoints live in `audit_checkpoints-{application}`, daily
+rollups in `audit_rollups-{application}`, the distinct actors and resource
+ids suggested by the typeahead in `audit_lookup-{application}`, and event
+schemas and rollup high water marks in `audit_event_schemas` and
+`audit_rollup_state`, which the `audit-*` expressions of the audit reads
+never match.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from config.settings import settings
+from core.models import AuditSearchFilters
+from core.shared.application import normalize_application
+from core.shared.cnpj import normalize_cnpj
+
+# Past this many months a wildcard is cheaper than listing every index name.
+_MAX_EXPLICIT_MONTHS = 36
+
+
+_DEDICATED_TENANTS = frozenset(
+    normalize_cnpj(cnpj) for cnpj in settings.opensearch_dedicated_tenants
+)
+
+
+def is_dedicated_tenant(cnpj: str) -> bool:
+    return normalize_cnpj(cnpj) in _DEDICATED_TENANTS
+
+
+def routing_for(cnpj: Optional[str]) -> Optional[str]:
+    """Returns the shard routing key of a tenant, if routing is enabled.
+
+    Dedicated tenants are not routed: their indices hold a single tenant, so
+    routing would put every document of the index on the same shard.
+    """
+    if not cnpj or not settings.opensearch_cnpj_routing:
+        return None
+    if is_dedicated_tenant(cnpj):
+        return None
+
+    return normalize_cnpj(cnpj) or None
+
+
+def read_routing(filters: AuditSearchFilters) -> Optional[str]:
+    """Returns the shard routing of an audit read, if it can be routed.
+
+    Audits stored before CNPJ routing sit on the shard of their id, so reads
+    that may hit months before `settings.opensearch_routing_cutover` search
+    every shard. Indices are monthly by write time, so a `start_date` in the
+    cutover month or later only hits routed audits.
+    """
+    cutover = settings.opensearch_routing_cutover
+    if cutover and (
+        filters.start_date is None or filters.start_date.strftime("%Y.%m") < cutover
+    ):
+        return None
+
+    return routing_for(filters.cnpj)
+
+
+def write_index(application: str, cnpj: str, when: datetime) -> str:
+    """Returns the index an audit of the given tenant is written to.
+
+    Parameters
+    ----------
+    application : str
+        The application that emitted the audit.
+    cnpj : str
+        The tenant the audit belongs to.
+    when : datetime
+        The moment of the write, which defines the monthly index.
+
+    Returns
+    -------
+    str
+        The index name.
+    """
+    app_name = normalize_application(application)
+    month = when.strftime("%Y.%m")
+
+    if is_dedicated_tenant(cnpj):
+        return f"audit-{app_name}-tenant-{normalize_cnpj(cnpj)}-{month}"
+
+    return f"audit-{app_name}-{month}"
+
+
+def month_indices(application: str, month: str) -> list[str]:
+    """Returns the index expressions holding every audit an application wrote
+    in a month (YYYY.MM), shared and dedicated tenant indices alike."""
+    app_name = normalize_application(application)
+
+    return [f"audit-{app_name}-{month}", f"audit-{app_name}-tenant-*-{month}"]
+
+
+def checkpoint_index(application: str) -> str:
+    return f"audit_checkpoints-{normalize_application(application)}"
+
+
+def rollup_index(application: str) -> str:
+    return f"audit_rollups-{normalize_application(application)}"
+
+
+def lookup_index(application: Optional[str]) -> str:
+    return f"audit_lookup-{normalize_application(application or '*')}"
+
+
+LOOKUP_INDEX_PATTERN = "audit_lookup-*"
+EVENT_SCHEMA_INDEX = "audit_event_schemas"
+ROLLUP_STATE_INDEX = "audit_rollup_state"
+
+
+def application_index_patterns(application: str) -> list[str]:
+    """Returns the patterns matching every index of an application, and only
+    those: `audit-{application}-*` would also match applications prefixed
+    by its name."""
+    app_name = normalize_application(application)
+
+    return [f"audit-{app_name}-2*", f"audit-{app_name}-tenant-*"]
+
+
+def read_indices(filters: AuditSearchFilters) -> list[str]:
+    """Returns the index expressions a search with the given filters must hit.
+
+    Indices are monthly by write time, and an audit is never written before it
+    happens, so only the lower date bound can prune months: everything from
+    the month of `start_date` up to the current one is searched.
+
+    Parameters
+    ----------
+    filters : AuditSearchFilters
+        The filters of the search.
+
+    Returns
+    -------
+    list[str]
+        Index names and wildcard expressions.
+    """
+    app_name = normalize_application(filters.application or "*")
+    months = _months_since(filters.start_date)
+
+    if filters.cnpj:
+        cnpj = normalize_cnpj(filters.cnpj)
+        indices = [f"audit-{app_name}-{month}" for month in months]
+        # Audits written before the tenant became dedicated stay in the shared
+        # indices, which are still hit on a single shard thanks to routing.
+        if is_dedicated_tenant(cnpj):
+            indices += [f"audit-{app_name}-tenant-{cnpj}-{month}" for month in months]
+        else:
+            indices.append(f"-audit-{app_name}-tenant-*")
+
+        return indices
+
+    indices = [f"audit-{app_name}-{month}" for month in months]
+    if app_name != "*":
+        indices += [f"audit-{app_name}-tenant-*-{month}" for month in months]
+
+    return indices
+
+
+def _months_since(start_date: Optional[date]) -> list[str]:
+    if start_date is None:
+        return ["*"]
+
+    today = datetime.now(timezone.utc).date()
+    year, month = start_date.year, start_date.month
+    months = []
+
+    while (year, month) <= (today.year, today.month):
+        months.append(f"{year:04d}.{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    if len(months) > _MAX_EXPLICIT_MONTHS:
+        return ["*"]
+
+    return months or ["*"]
@@ -0,0 +1,323 @@
+"""
+Cold storage of closed audit months as Parquet files.
+
+Archived audits are laid out as hive partitions,
+`{root}/application={application}/month={YYYY.MM}/part-{run}-{n}.parquet`, on
+a local path or an S3 bucket (`s3://bucket/prefix`). Searches only open the
+partitions of the requested months, and the filters are pushed down to the
+Parquet reader, which skips the row groups whose column statistics cannot
+match.
+
+Parts are first written to `{root}/_staging/{run}/`, which searches never
+read, and moved into their partition once the whole month is written.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Iterable, Optional
+
+import orjson
+
+from core.models import AuditModel, AuditSearchFilters
+from core.repositories.audit_archive import AuditArchive
+from core.shared.application import normalize_application
+from core.shared.cnpj import cnpj_values
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pa = None
+
+_STRING_COLUMNS = (
+    "id",
+    "actor",
+    "event_type",
+    "application",
+    "cnpj",
+    "resource_id",
+    "timestamp",
+    "ingested_at",
+)
+# Free-form objects are kept as JSON text.
+_JSON_COLUMNS = ("metadata", "integrity", "coalesced")
+_FILTERED_COLUMNS = ("actor", "event_type", "resource_id")
+# Row groups sorted together before being written.
+_SORTED_ROW_GROUPS = 8
+
+if pa is not None:
+    _FILE_SCHEMA = pa.schema(
+        [(name, pa.string()) for name in (*_STRING_COLUMNS, *_JSON_COLUMNS)]
+    )
+    # Only the month is read from the partition path; the application column
+    # keeps the value stored in the files.
+    _PARTITIONING = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+    _SCHEMA = pa.unify_schemas([_FILE_SCHEMA, _PARTITIONING.schema])
+
+
+@dataclass
+class ParquetAuditArchive(AuditArchive):
+    """
+    Archives audits to Parquet files under `uri`, compressed with
+    `compression`, in row groups of `row_group_size` audits.
+    """
+
+    uri: str
+    row_group_size: int = 100_000
+    compression: str = "zstd"
+    _filesystem: Any = field(default=None, init=False)
+    _root: str = field(default="", init=False)
+
+    def __post_init__(self):
+        if pa is None:
+            raise RuntimeError("pyarrow is required by the audit archive")
+
+        self._filesystem, self._root = pafs.FileSystem.from_uri(self.uri)
+        self._root = self._root.rstrip("/")
+
+    def write_part(
+        self,
+        staging: str,
+        part: int,
+        documents: Iterable[tuple[str, dict]],
+    ) -> int:
+        directory = self._staging(staging)
+        path = f"{directory}/part-{staging}-{part:04d}.parquet"
+
+        writer = None
+        written = 0
+        rows = _empty_rows()
+        try:
+            for audit_id, document in documents:
+                _append_row(rows, audit_id, document)
+                if len(rows["id"]) < self.row_group_size * _SORTED_ROW_GROUPS:
+                    continue
+
+                writer = writer or self._open_writer(directory, path)
+                written += _flush_rows(writer, rows, self.row_group_size)
+                rows = _empty_rows()
+
+            if rows["id"]:
+                writer = writer or self._open_writer(directory, path)
+                written += _flush_rows(writer, rows, self.row_group_size)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return written
+
+    def replace_month(self, application: str, month: str, staging: str) -> None:
+        directory = self._partition(application, month)
+        previous = self._files(directory)
+        self._filesystem.create_dir(directory)
+
+        # The new parts are moved in before the previous ones are deleted, so
+        # a failure leaves duplicates a new run removes, never a gap.
+        for path in self._files(self._staging(staging)):
+            self._filesystem.move(path, f"{directory}/{path.rsplit('/', 1)[-1]}")
+        for path in previous:
+            self._filesystem.delete_file(path)
+
+    def discard(self, staging: str) -> None:
+        directory = self._staging(staging)
+        if self._filesystem.get_file_info(directory).type != pafs.FileType.NotFound:
+            self._filesystem.delete_dir(directory)
+
+    def search(
+        self,
+        filters: AuditSearchFilters,
+        size: int,
+        months: list[str],
+        includes: Optional[list[str]] = None,
+        excludes: Optional[list[str]] = None,
+    ) -> list[AuditModel]:
+        files = self._partition_files(filters.application, months)
+        if not files:
+            return []
+
+        dataset = ds.dataset(
+            files,
+            schema=_SCHEMA,
+            format="parquet",
+            filesystem=self._filesystem,
+            partitioning=_PARTITIONING,
+            partition_base_dir=self._root,
+        )
+        batches = dataset.to_batches(
+            columns=_read_columns(includes, excludes),
+            filter=_build_expression(filters, months),
+        )
+
+        # Rows come from our own archive, so validation is skipped.
+        return [
+            AuditModel.model_construct(**_project(row, includes, excludes))
+            for row in _latest(batches, size)
+        ]
+
+    def _partition(self, application: str, month: str) -> str:
+        return (
+            f"{self._root}/application={normalize_application(application)}"
+            f"/month={month}"
+        )
+
+    def _staging(self, staging: str) -> str:
+        return f"{self._root}/_staging/{staging}"
+
+    def _files(self, directory: str) -> list[str]:
+        # Files starting with `_` are skipped, as by the Parquet readers.
+        selector = pafs.FileSelector(directory, allow_not_found=True)
+
+        return [
+            info.path
+            for info in self._filesystem.get_file_info(selector)
+            if info.type == pafs.FileType.File
+            and info.base_name.endswith(".parquet")
+            and not info.base_name.startswith("_")
+        ]
+
+    def _partition_files(
+        self, application: Optional[str], months: list[str]
+    ) -> list[str]:
+        if application:
+            directories = [self._partition(application, month) for month in months]
+        else:
+            selector = pafs.FileSelector(self._root, allow_not_found=True)
+            directories = [
+                f"{info.path}/month={month}"
+                for info in self._filesystem.get_file_info(selector)
+                if info.type == pafs.FileType.Directory
+                and not info.base_name.startswith("_")
+                for month in months
+            ]
+
+        return [path for directory in directories for path in self._files(directory)]
+
+    def _open_writer(self, directory: str, path: str) -> "pq.ParquetWriter":
+        self._filesystem.create_dir(directory)
+
+        return pq.ParquetWriter(
+            path,
+            _FILE_SCHEMA,
+            filesystem=self._filesystem,
+            compression=self.compression,
+        )
+
+
+def _latest(batches: Iterable["pa.RecordBatch"], size: int) -> list[dict]:
+    """Keeps the `size` most recent rows of the streamed batches, so a broad
+    search holds one batch and a page in memory instead of every match."""
+    sort_keys = [("timestamp", "descending")]
+    latest = None
+
+    for batch in batches:
+        if not batch.num_rows:
+            continue
+        table = pa.Table.from_batches([batch])
+        if latest is not None:
+            table = pa.concat_tables([latest, table])
+        latest = table.take(pc.select_k_unstable(table, k=size, sort_keys=sort_keys))
+
+    if latest is None:
+        return []
+
+    return latest.sort_by(sort_keys).to_pylist()
+
+
+def _empty_rows() -> dict[str, list]:
+    return {name: [] for name in (*_STRING_COLUMNS, *_JSON_COLUMNS)}
+
+
+def _append_row(rows: dict[str, list], audit_id: str, document: dict) -> None:
+    rows["id"].append(audit_id)
+    for name in _STRING_COLUMNS[1:]:
+        rows[name].append(document.get(name))
+    for name in _JSON_COLUMNS:
+        value = document.get(name)
+        rows[name].append(None if value is None else orjson.dumps(value).decode())
+
+
+def _flush_rows(
+    writer: "pq.ParquetWriter", rows: dict[str, list], row_group_size: int
+) -> int:
+    # Sorted by tenant, each row group holds a narrow range of CNPJs, so its
+    # column statistics let the reader skip it on `cnpj` filters.
+    table = pa.Table.from_pydict(rows, schema=_FILE_SCHEMA).sort_by(
+        [("cnpj", "ascending"), ("timestamp", "ascending")]
+    )
+    writer.write_table(table, row_group_size=row_group_size)
+
+    return table.num_rows
+
+
+def _build_expression(
+    filters: AuditSearchFilters, months: list[str]
+) -> "ds.Expression":
+    expression = ds.field("month").isin(months)
+
+    # Like on the hot path, a CNPJ filter also matches the raw form audits
+    # were stored with before CNPJs were normalized.
+    if filters.cnpj:
+        expression &= ds.field("cnpj").isin(cnpj_values(filters.cnpj))
+    for name in _FILTERED_COLUMNS:
+        value = getattr(filters, name)
+        if value:
+            expression &= ds.field(name) == value
+
+    # Timestamps are ISO strings, so they compare in chronological order.
+    if filters.start_date:
+        expression &= ds.field("timestamp") >= filters.start_date.isoformat()
+    if filters.end_date:
+        end = filters.end_date + timedelta(days=1)
+        expression &= ds.field("timestamp") < end.isoformat()
+
+    return expression
+
+
+def _read_columns(
+    includes: Optional[list[str]], excludes: Optional[list[str]]
+) -> list[str]:
+    columns = [*_STRING_COLUMNS, *_JSON_COLUMNS]
+    if includes:
+        wanted = {name.split(".", 1)[0] for name in includes}
+        columns = [name for name in columns if name in wanted]
+    if excludes:
+        columns = [name for name in columns if name not in excludes]
+
+    # Needed to identify and sort the audits, whatever the projection.
+    return list(dict.fromkeys(["id", "timestamp", *columns]))
+
+
+def _project(
+    row: dict, includes: Optional[list[str]], excludes: Optional[list[str]]
+) -> dict:
+    audit = {"id": row.pop("id")}
+    wanted = {name.split(".", 1)[0] for name in includes} if includes else None
+
+    for name, value in row.items():
+        if value is None or name == "month":
+            continue
+        if (wanted is not None and name not in wanted) or name in (excludes or ()):
+            continue
+        audit[name] = orjson.loads(value) if name in _JSON_COLUMNS else value
+
+    if isinstance(audit.get("metadata"), dict):
+        audit["metadata"] = _project_metadata(audit["metadata"], includes, excludes)
+
+    return audit
+
+
+def _project_metadata(
+    metadata: dict, includes: Optional[list[str]], excludes: Optional[list[str]]
+) -> dict:
+    keys = [name[len("metadata.") :] for name in includes or () if "." in name]
+    if keys and "metadata" not in includes:
+        metadata = {key: metadata[key] for key in keys if key in metadata}
+
+    for name in excludes or ():
+        if name.startswith("metadata."):
+            metadata.pop(name[len("metadata.") :], None)
+
+    return metadata
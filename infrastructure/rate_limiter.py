@@ -0,0 +1,169 @@
+"""
+In-process token bucket rate limiting.
+
+Limits are enforced per process: on Lambda every execution environment, and
+on the production server every worker, holds its own buckets.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.shared.application import normalize_application
+from core.shared.cnpj import normalize_cnpj
+from core.shared.errors import RateLimitExceededError
+from infrastructure.metrics_sink import MetricsSink
+
+
+@dataclass
+class TokenBucket:
+    """
+    Refills `rate` tokens per second up to `capacity`, the allowed burst.
+    """
+
+    rate: float
+    capacity: float
+    _tokens: float = field(default=0.0, init=False)
+    _updated_at: float = field(default_factory=time.monotonic, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self):
+        if self.rate <= 0 or self.capacity <= 0:
+            raise ValueError("A token bucket needs a positive rate and capacity")
+
+        self._tokens = self.capacity
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Takes the tokens if available.
+
+        Returns
+        -------
+        float
+            0 when the tokens were taken, otherwise the seconds to wait until
+            they are available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Waits until the tokens are available and takes them.
+
+        Requests larger than the capacity are let through once the bucket is
+        full, so they are paced instead of blocking forever.
+        """
+        tokens = min(tokens, self.capacity)
+        while wait := self.try_acquire(tokens):
+            time.sleep(wait)
+
+    def refund(self, tokens: float = 1) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+
+@dataclass
+class BucketLimit:
+    """
+    Raises ValueError on a non-positive rate or burst, so a bad setting fails
+    at startup instead of on the first admitted request.
+    """
+
+    rate: float
+    burst: float
+
+    def __post_init__(self):
+        if self.rate <= 0 or self.burst <= 0:
+            raise ValueError(f"Rate limits need a positive rate and burst, got {self}")
+
+
+@dataclass
+class RateLimiter:
+    """
+    Admits audit writes against per-application and, optionally, per-CNPJ
+    token buckets.
+
+    `application_overrides` holds specific limits of some applications;
+    the others get `application_limit`. Without `cnpj_limit` tenants are not
+    limited. Applications and CNPJs are normalized, so every spelling of one
+    shares its bucket. At most `max_buckets` buckets are kept, the least
+    recently used being forgotten (they are usually full, idle ones).
+    """
+
+    enabled: bool
+    application_limit: BucketLimit
+    application_overrides: dict[str, BucketLimit]
+    cnpj_limit: Optional[BucketLimit]
+    max_buckets: int
+    metrics_sink: MetricsSink
+    _buckets: "OrderedDict[tuple[str, str], TokenBucket]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def admit(self, application: str, cnpj: str) -> None:
+        """Takes a token of the application and tenant buckets.
+
+        Raises
+        ------
+        RateLimitExceededError
+            When any of the buckets is empty.
+        """
+        if not self.enabled:
+            return
+
+        application = normalize_application(application)
+        cnpj = normalize_cnpj(cnpj)
+
+        cnpj_bucket = None
+        if self.cnpj_limit is not None:
+            cnpj_bucket = self._bucket("cnpj", cnpj, self.cnpj_limit)
+            if retry_after := cnpj_bucket.try_acquire():
+                self._reject("cnpj", cnpj, retry_after)
+
+        limit = self.application_overrides.get(application, self.application_limit)
+        application_bucket = self._bucket("application", application, limit)
+        if retry_after := application_bucket.try_acquire():
+            if cnpj_bucket is not None:
+                cnpj_bucket.refund()
+            self._reject("application", application, retry_after)
+
+        self.metrics_sink.increment(
+            "rate_limit.admitted", tags={"application": application}
+        )
+
+    def _bucket(self, scope: str, key: str, limit: BucketLimit) -> TokenBucket:
+        bucket_key = (scope, key)
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = TokenBucket(rate=limit.rate, capacity=limit.burst)
+                self._buckets[bucket_key] = bucket
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(bucket_key)
+
+        return bucket
+
+    def _reject(self, scope: str, key: str, retry_after: float) -> None:
+        # Tenants are not tagged: one metric series per CNPJ is unbounded.
+        tags = {"scope": scope}
+        if scope == "application":
+            tags["application"] = key
+        self.metrics_sink.increment("rate_limit.throttled", tags=tags)
+        raise RateLimitExceededError(
+            f"Rate limit exceeded for {scope} {key}",
+            retry_after=math.ceil(retry_after),
+        )
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+import boto3
+from botocore.config import Config as BotoConfig
+
+
+@dataclass
+class SecretCache:
+    """
+    Caches Secrets Manager values for `ttl_seconds`.
+
+    The boto3 client is only built on the first lookup, so environments
+    without AWS credentials can start the application as long as they never
+    read a secret.
+    """
+
+    ttl_seconds: int
+    _client: Optional[Any] = field(default=None, init=False, repr=False)
+    _entries: dict[str, tuple[float, dict]] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def get(self, secret_arn: str) -> dict[str, Any]:
+        """Returns the JSON value of the given secret.
+
+        Parameters
+        ----------
+        secret_arn : str
+            The ARN of the secret.
+
+        Returns
+        -------
+        dict[str, Any]
+            The secret value.
+        """
+        entry = self._entries.get(secret_arn)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        with self._lock:
+            # Another thread may have fetched it while this one waited.
+            entry = self._entries.get(secret_arn)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            secret = self._secrets_manager().get_secret_value(SecretId=secret_arn)
+            value = json.loads(secret["SecretString"])
+            self._entries[secret_arn] = (time.monotonic() + self.ttl_seconds, value)
+
+        return value
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _secrets_manager(self) -> Any:
+        if self._client is None:
+            self._client = boto3.client(
+                "secretsmanager",
+                config=BotoConfig(
+                    connect_timeout=3,
+                    read_timeout=3,
+                ),
+            )
+
+        return self._client
+
+
+def secret_cache_resource(ttl_seconds: int) -> Iterator[SecretCache]:
+    """Provides a secret cache for the application lifetime."""
+    secret_cache = SecretCache(ttl_seconds=ttl_seconds)
+    yield secret_cache
+    secret_cache.close()
@@ -0,0 +1,83 @@
+"""
+Production server for container deployments (ECS/Kubernetes).
+
+Gunicorn manages `settings.server_workers` uvicorn worker processes running
+on uvloop and httptools. The app is imported once in the master process
+(`preload_app`) and inherited by the forked workers; backend connections are
+only opened by the lifespan startup, which runs inside each worker, so every
+worker owns its connection pool. On SIGTERM workers stop accepting
+connections and drain in-flight requests for up to the graceful timeout
+before closing their resources.
+"""
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+from uvicorn_worker import UvicornWorker
+
+from config.settings import settings
+
+APP_URI = "presentation.api.main:app"
+
+
+class AuditAPIWorker(UvicornWorker):
+    """Uvicorn worker pinned to the uvloop event loop and the httptools parser"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = self.cfg.graceful_timeout
+
+
+class AuditAPIServer(BaseApplication):
+    """Runs the API on gunicorn with the given options"""
+
+    def __init__(self, app_uri: str, options: dict):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return import_app(self.app_uri)
+
+
+def server_options() -> dict:
+    """Builds the gunicorn options from the application settings.
+
+    Returns
+    -------
+    dict
+        The gunicorn settings.
+
+    Raises
+    ------
+    RuntimeError
+        When the live tail is enabled on several workers, each of which would
+        only stream the audits it ingests itself.
+    """
+    if settings.live_tail_enabled and settings.server_workers > 1:
+        raise RuntimeError(
+            "LIVE_TAIL_ENABLED requires SERVER_WORKERS=1: the live tail is "
+            "served by an in-process broker"
+        )
+
+    return {
+        "bind": f"{settings.server_host}:{settings.server_port}",
+        "workers": settings.server_workers,
+        "worker_class": f"{__name__}.AuditAPIWorker",
+        "preload_app": True,
+        "graceful_timeout": settings.server_graceful_timeout_seconds,
+        "timeout": settings.server_worker_timeout_seconds,
+        "keepalive": settings.server_keepalive_seconds,
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests // 10,
+        "accesslog": "-",
+    }
+
+
+if __name__ == "__main__":
+    AuditAPIServer(APP_URI, server_options()).run()
@@ -1,14 +1,16 @@
 import logging
 
 from fastapi import FastAPI, Request, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
 
 from core.shared.errors import (
     ConflictingParametersError,
     InvalidParametersError,
+    RateLimitExceededError,
     ResourceNotFoundError,
+    ServiceUnavailableError,
+    UnauthorizedError,
 )
+from presentation.api.responses import FastJSONResponse
 
 
 def _extract_message(exc: Exception) -> str:
@@ -30,9 +32,18 @@ def inject_exception_handlers(app: FastAPI):
         request: Request, exc: ConflictingParametersError
     ):
         message = _extract_message(exc)
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_409_CONFLICT,
-            content=jsonable_encoder({"message": message}),
+            content={"message": message},
+        )
+
+    @app.exception_handler(UnauthorizedError)
+    async def status_401_exception_handler(request: Request, exc: UnauthorizedError):
+        message = _extract_message(exc)
+        return FastJSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"message": message},
+            headers={"WWW-Authenticate": "Bearer"},
         )
 
     @app.exception_handler(ResourceNotFoundError)
@@ -40,9 +51,9 @@ def inject_exception_handlers(app: FastAPI):
         request: Request, exc: ResourceNotFoundError
     ):
         message = _extract_message(exc)
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
-            content=jsonable_encoder({"message": message}),
+            content={"message": message},
         )
 
     @app.exception_handler(InvalidParametersError)
@@ -50,9 +61,30 @@ def inject_exception_handlers(app: FastAPI):
         request: Request, exc: InvalidParametersError
     ):
         message = _extract_message(exc)
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content=jsonable_encoder({"message": message}),
+            content={"message": message},
+        )
+
+    @app.exception_handler(RateLimitExceededError)
+    async def status_429_exception_handler(
+        request: Request, exc: RateLimitExceededError
+    ):
+        message = _extract_message(exc)
+        return FastJSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"message": message},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.exception_handler(ServiceUnavailableError)
+    async def status_503_exception_handler(
+        request: Request, exc: ServiceUnavailableError
+    ):
+        message = _extract_message(exc)
+        return FastJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": message},
         )
 
     @app.exception_handler(Exception)
@@ -60,7 +92,7 @@ def inject_exception_handlers(app: FastAPI):
         base_error_message = f"Failed to execute: {request.method}: {request.url}"
         logging.error("Unexpected error: %s. Detail: %s", base_error_message, exc)
 
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=jsonable_encoder({"message": str(exc)}),
+            content={"message": str(exc)},
         )
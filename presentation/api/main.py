@@ -1,24 +1,35 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from config.settings import settings
 from presentation.api.exception_handlers import inject_exception_handlers
-from presentation.api.v1.routes.audit_routes import samples_router
-from presentation.di_container import Container
+from presentation.api.middlewares import CompressionMiddleware
+from presentation.api.responses import FastJSONResponse
+from presentation.api.v1.routes.audit_routes import audit_router
+from presentation.di_container import Container, shutdown_container
 
 
 class Main:
     """Bootstraps the application"""
 
-    app: FastAPI = FastAPI()
+    app: FastAPI = FastAPI(default_response_class=FastJSONResponse)
     container: Container = Container()
 
     @classmethod
     def create_app(cls) -> FastAPI:
         """Defines the application setup"""
-        cls.app.include_router(samples_router)
+        cls.app.router.lifespan_context = cls.lifespan
+        cls.app.include_router(audit_router)
 
+        cls.app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.response_compression_minimum_size,
+            compress_level=settings.response_compression_level,
+        )
         cls.app.add_middleware(
             CORSMiddleware,
             allow_origins=["*"],
@@ -31,6 +42,14 @@ class Main:
 
         return cls.app
 
+    @classmethod
+    @asynccontextmanager
+    async def lifespan(cls, app: FastAPI) -> AsyncIterator[None]:
+        """Starts the backend resources before serving and closes them after"""
+        cls.container.init_resources()
+        yield
+        shutdown_container(cls.container)
+
 
 logging.basicConfig(level=logging.INFO)
 
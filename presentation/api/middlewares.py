@@ -0,0 +1,202 @@
+import zlib
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional dependency
+    brotli = None
+
+
+class _Compressor:
+    """Wraps the gzip and brotli streaming compressors behind the same API."""
+
+    def __init__(self, encoding: str, level: int) -> None:
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+            self.compress: Callable[[bytes], bytes] = self._compressor.process
+            self.flush: Callable[[], bytes] = self._compressor.flush
+            self.finish: Callable[[], bytes] = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(
+                level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+            self.compress = self._compressor.compress
+            self.flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = self._compressor.flush
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with brotli (when installed) or gzip.
+
+    Small responses, responses that already carry a `Content-Encoding` and the
+    excluded media types (Server-Sent Events by default) are passed through.
+    Streamed responses are compressed chunk by chunk and each chunk is flushed,
+    so `StreamingResponse` exports keep reaching the client progressively.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compress_level: int = 6,
+        excluded_media_types: tuple[str, ...] = ("text/event-stream",),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compress_level = compress_level
+        self.excluded_media_types = excluded_media_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self._negotiate_encoding(scope) if scope["type"] == "http" else None
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send,
+            encoding=encoding,
+            minimum_size=self.minimum_size,
+            compress_level=self._level_for(encoding),
+            excluded_media_types=self.excluded_media_types,
+        )
+        await self.app(scope, receive, responder.send)
+
+    def _negotiate_encoding(self, scope: Scope) -> Optional[str]:
+        qualities = _parse_accept_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        wildcard = qualities.get("*", 0.0)
+        supported = ("br", "gzip") if brotli is not None else ("gzip",)
+
+        # Brotli wins ties, being listed first.
+        encoding = max(
+            supported, key=lambda coding: qualities.get(coding, wildcard), default=None
+        )
+        if encoding is None or qualities.get(encoding, wildcard) <= 0:
+            return None
+
+        return encoding
+
+    def _level_for(self, encoding: str) -> int:
+        # Brotli qualities go up to 11, but above 5 they cost far more CPU than
+        # gzip for a marginal gain on JSON payloads.
+        if encoding == "br":
+            return min(self.compress_level, 5)
+
+        return self.compress_level
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    """Maps each content coding of an `Accept-Encoding` header to its quality
+    value; codings refused with `q=0` map to 0."""
+    qualities = {}
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    return qualities
+
+
+class _CompressionResponder:
+    """Intercepts the ASGI messages of a single response to compress its body."""
+
+    def __init__(
+        self,
+        send: Send,
+        *,
+        encoding: str,
+        minimum_size: int,
+        compress_level: int,
+        excluded_media_types: tuple[str, ...],
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._compress_level = compress_level
+        self._excluded_media_types = excluded_media_types
+        self._start_message: Optional[Message] = None
+        self._compressor: Optional[_Compressor] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self._passthrough = (
+                "content-encoding" in headers
+                or content_type.startswith(self._excluded_media_types)
+            )
+            self._start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._flush_start_message()
+            await self._send(message)
+            return
+
+        if self._passthrough:
+            await self._flush_start_message()
+            await self._send(message)
+            return
+
+        if self._compressor is None:
+            await self._send_first_chunk(message)
+            return
+
+        await self._send_compressed(message)
+
+    async def _send_first_chunk(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not more_body and len(body) < self._minimum_size:
+            self._passthrough = True
+            await self._flush_start_message()
+            await self._send(message)
+            return
+
+        self._compressor = _Compressor(self._encoding, self._compress_level)
+        headers = MutableHeaders(raw=self._start_message["headers"])
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            del headers["Content-Length"]
+            await self._flush_start_message()
+            await self._send_compressed(message)
+            return
+
+        compressed = self._compressor.compress(body) + self._compressor.finish()
+        headers["Content-Length"] = str(len(compressed))
+        await self._flush_start_message()
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_compressed(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        chunk = self._compressor.compress(message.get("body", b""))
+        chunk += self._compressor.flush() if more_body else self._compressor.finish()
+
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+    async def _flush_start_message(self) -> None:
+        if self._start_message is not None:
+            await self._send(self._start_message)
+            self._start_message = None
@@ -0,0 +1,29 @@
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+
+    # Anything else, e.g. the detail of an exception, goes through the
+    # encoder FastAPI would have used.
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight with orjson.
+
+    Pydantic models (and lists of them) are dumped by pydantic-core and
+    serialized by orjson, which natively handles datetimes, UUIDs and
+    dataclasses. Returning this response from a route skips the
+    `jsonable_encoder` pass FastAPI would otherwise run over the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
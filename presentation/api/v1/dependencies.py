@@ -0,0 +1,29 @@
+from typing import Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from core.shared.errors import UnauthorizedError
+from infrastructure.jwt_validator import JwtValidator
+from presentation.di_container import Container
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+@inject
+def authenticate(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+    validator: JwtValidator = Depends(Provide[Container.jwt_validator]),
+) -> dict:
+    """
+    Authenticates the request by its bearer token.
+
+    Returns:
+    --------
+        The verified token claims.
+    """
+    if credentials is None:
+        raise UnauthorizedError("Missing bearer token")
+
+    return validator.validate(credentials.credentials)
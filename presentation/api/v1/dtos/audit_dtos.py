@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from datetime import date
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
 
 
 class CreateAuditRequest(BaseModel):
@@ -15,3 +18,154 @@ class CreateAuditRequest(BaseModel):
 
 class CreateAuditResponse(BaseModel):
     """Parses the payload of the Create audit Response"""
+
+
+class AuditEventFiltersRequest(BaseModel):
+    """Parses the query parameters of the Audit live tail Request"""
+
+    application: Optional[str] = None
+    cnpj: Optional[str] = None
+    actor: Optional[str] = None
+    event_type: Optional[str] = None
+    resource_id: Optional[str] = None
+
+
+class AuditFiltersRequest(AuditEventFiltersRequest):
+    """Parses the query parameters shared by the audit read Requests"""
+
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class SearchAuditsRequest(AuditFiltersRequest):
+    """Parses the query parameters of the Search audits Request"""
+
+    size: int = Field(default=50, ge=1, le=1000)
+    fields: Optional[str] = Field(
+        default=None,
+        description="Comma separated fields to return; prefix with `-` to omit.",
+    )
+    view: Literal["summary", "full"] = Field(
+        default="summary",
+        description="`summary` returns timestamp, actor, event_type and resource_id.",
+    )
+
+
+class AuditResponse(BaseModel):
+    """Parses a single audit of the Search audits Response"""
+
+    id: str
+    actor: Optional[str] = None
+    event_type: Optional[str] = None
+    application: Optional[str] = None
+    cnpj: Optional[str] = None
+    resource_id: Optional[str] = None
+    timestamp: Optional[str] = None
+    metadata: Optional[dict] = None
+    ingested_at: Optional[str] = None
+    integrity: Optional[dict] = None
+    coalesced: Optional[dict] = None
+
+
+class SearchAuditsResponse(BaseModel):
+    """Parses the payload of the Search audits Response"""
+
+    items: list[AuditResponse]
+
+
+class CountAuditsResponse(BaseModel):
+    """Parses the payload of the Count audits Response"""
+
+    count: int
+
+
+class AuditExistsResponse(BaseModel):
+    """Parses the payload of the Audit exists Response"""
+
+    exists: bool
+
+
+class EventSchemaRequest(BaseModel):
+    """Parses the payload of the Register event schema Request"""
+
+    application: str
+    event_type: str
+    fields: dict[
+        str,
+        Literal["keyword", "text", "integer", "number", "boolean", "date", "object"],
+    ] = Field(description="Type of each metadata field.")
+    required: list[str] = Field(default_factory=list)
+    additional_fields: bool = Field(
+        default=True, description="Whether undeclared metadata fields are accepted."
+    )
+
+
+class EventSchemaResponse(EventSchemaRequest):
+    """Parses a single schema of the Event schemas Responses"""
+
+
+class RegisterEventSchemaResponse(EventSchemaResponse):
+    """Parses the payload of the Register event schema Response"""
+
+    mapping: dict = Field(description="Mapping applied to the application indices.")
+    applied_to_current_indices: bool = Field(
+        description=(
+            "Whether the current month indices got the mapping; otherwise it "
+            "applies from the next month."
+        )
+    )
+
+
+class ListEventSchemasRequest(BaseModel):
+    """Parses the query parameters of the List event schemas Request"""
+
+    application: Optional[str] = None
+
+
+class ListEventSchemasResponse(BaseModel):
+    """Parses the payload of the List event schemas Response"""
+
+    items: list[EventSchemaResponse]
+
+
+class AuditActivityRequest(BaseModel):
+    """Parses the query parameters of the Audit activity Request"""
+
+    application: str
+    cnpj: Optional[str] = None
+    event_type: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class DailyActivityResponse(BaseModel):
+    """Parses a single day of the Audit activity Response"""
+
+    day: date
+    cnpj: str
+    event_type: str
+    count: int
+    distinct_actors: int
+
+
+class AuditActivityResponse(BaseModel):
+    """Parses the payload of the Audit activity Response"""
+
+    items: list[DailyActivityResponse]
+    total: int = Field(description="Number of audits over the whole range.")
+
+
+class SuggestAuditValuesRequest(BaseModel):
+    """Parses the query parameters of the Suggest audit values Request"""
+
+    field: Literal["actor", "resource_id"]
+    prefix: str = Field(min_length=1, max_length=256)
+    size: int = Field(default=10, ge=1, le=100)
+    application: Optional[str] = None
+    cnpj: Optional[str] = None
+
+
+class SuggestAuditValuesResponse(BaseModel):
+    """Parses the payload of the Suggest audit values Response"""
+
+    items: list[str]
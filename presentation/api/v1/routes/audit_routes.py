@@ -1,14 +1,65 @@
+import asyncio
+from typing import Annotated, AsyncIterator
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
+from config.settings import settings
+from core.models import AuditEventFilters, AuditSearchFilters, EventSchema
+from core.shared.errors import InvalidParametersError, ResourceNotFoundError
+from core.use_case.audit_exists_use_case import AuditExistsUseCase
+from core.use_case.audit_exists_use_case import UseCaseInput as AuditExistsInput
+from core.use_case.count_audits_use_case import CountAuditsUseCase
+from core.use_case.count_audits_use_case import UseCaseInput as CountAuditsInput
 from core.use_case.create_audit_use_case import CreateAuditUseCase
 from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
-from presentation.api.v1.dtos.audit_dtos import CreateAuditRequest, CreateAuditResponse
+from core.use_case.list_event_schemas_use_case import ListEventSchemasUseCase
+from core.use_case.list_event_schemas_use_case import (
+    UseCaseInput as ListEventSchemasInput,
+)
+from core.use_case.register_event_schema_use_case import RegisterEventSchemaUseCase
+from core.use_case.search_audits_use_case import SearchAuditsUseCase
+from core.use_case.search_audits_use_case import UseCaseInput as SearchAuditsInput
+from core.use_case.suggest_audit_values_use_case import SuggestAuditValuesUseCase
+from core.use_case.suggest_audit_values_use_case import (
+    UseCaseInput as SuggestAuditValuesInput,
+)
+from core.use_case.summarize_audit_activity_use_case import (
+    SummarizeAuditActivityUseCase,
+)
+from core.use_case.summarize_audit_activity_use_case import (
+    UseCaseInput as SummarizeAuditActivityInput,
+)
+from infrastructure.in_memory_event_broker import InMemoryEventBroker
+from infrastructure.rate_limiter import RateLimiter
+from presentation.api.responses import FastJSONResponse
+from presentation.api.v1.dependencies import authenticate
+from presentation.api.v1.dtos.audit_dtos import (
+    AuditActivityRequest,
+    AuditActivityResponse,
+    AuditEventFiltersRequest,
+    AuditExistsResponse,
+    AuditFiltersRequest,
+    CountAuditsResponse,
+    CreateAuditRequest,
+    CreateAuditResponse,
+    DailyActivityResponse,
+    EventSchemaRequest,
+    EventSchemaResponse,
+    ListEventSchemasRequest,
+    ListEventSchemasResponse,
+    RegisterEventSchemaResponse,
+    SearchAuditsRequest,
+    SearchAuditsResponse,
+    SuggestAuditValuesRequest,
+    SuggestAuditValuesResponse,
+)
 from presentation.di_container import Container
 
-# audit_router = APIRouter(prefix="/v1/audit", dependencies=[Depends(JwtValidator())])
 audit_router = APIRouter(
     prefix="/v1/audit",
+    dependencies=[Depends(authenticate)] if settings.jwt_auth_enabled else [],
 )
 
 
@@ -17,9 +68,10 @@ audit_router = APIRouter(
     status_code=status.HTTP_201_CREATED,
 )
 @inject
-async def create_audit(
+def create_audit(
     payload: CreateAuditRequest,
     use_case: CreateAuditUseCase = Depends(Provide[Container.create_audit_use_case]),
+    rate_limiter: RateLimiter = Depends(Provide[Container.rate_limiter]),
 ) -> CreateAuditResponse:
     """
     Create a audit data.
@@ -31,8 +83,307 @@ async def create_audit(
     Returns:
     --------
         201 CREATED.
+        429 TOO MANY REQUESTS, with `Retry-After`, when the application or
+        tenant exceeds its ingest quota.
     """
+    rate_limiter.admit(application=payload.application, cnpj=payload.cnpj)
     uc_input = CreateAuditInput(**payload.model_dump())
     use_case.execute(uc_input=uc_input)
 
     return CreateAuditResponse()
+
+
+@audit_router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    response_model=SearchAuditsResponse,
+)
+@inject
+def search_audits(
+    params: Annotated[SearchAuditsRequest, Query()],
+    use_case: SearchAuditsUseCase = Depends(Provide[Container.search_audits_use_case]),
+) -> FastJSONResponse:
+    """
+    Search audits, most recent first.
+
+    Filtering by `cnpj` hits a single shard per index, since audits are routed
+    by tenant. Only the summary fields are returned unless `view=full` or a
+    `fields` projection is given; fields absent from the projection are
+    omitted from the items.
+
+    Parameters:
+    -----------
+        params (SearchAuditsRequest): The query parameters.
+
+    Returns:
+    --------
+        200 OK with the matching audits.
+    """
+    uc_input = SearchAuditsInput(
+        filters=AuditSearchFilters(
+            **params.model_dump(exclude={"size", "fields", "view"})
+        ),
+        size=params.size,
+        fields=params.fields.split(",") if params.fields else None,
+        view=params.view,
+    )
+    audits = use_case.execute(uc_input=uc_input)
+
+    return FastJSONResponse(
+        content={"items": [audit.model_dump(exclude_unset=True) for audit in audits]}
+    )
+
+
+@audit_router.get(
+    "/count",
+    status_code=status.HTTP_200_OK,
+)
+@inject
+def count_audits(
+    params: Annotated[AuditFiltersRequest, Query()],
+    use_case: CountAuditsUseCase = Depends(Provide[Container.count_audits_use_case]),
+) -> CountAuditsResponse:
+    """
+    Count the audits matching the filters, without fetching them.
+
+    Parameters:
+    -----------
+        params (AuditFiltersRequest): The query parameters.
+
+    Returns:
+    --------
+        200 OK with the number of matching audits.
+    """
+    uc_input = CountAuditsInput(filters=AuditSearchFilters(**params.model_dump()))
+    count = use_case.execute(uc_input=uc_input)
+
+    return CountAuditsResponse(count=count)
+
+
+@audit_router.get(
+    "/exists",
+    status_code=status.HTTP_200_OK,
+)
+@inject
+def audit_exists(
+    params: Annotated[AuditFiltersRequest, Query()],
+    use_case: AuditExistsUseCase = Depends(Provide[Container.audit_exists_use_case]),
+) -> AuditExistsResponse:
+    """
+    Check whether any audit matches the filters, e.g. whether an actor has
+    ever performed an event type on a resource.
+
+    Parameters:
+    -----------
+        params (AuditFiltersRequest): The query parameters.
+
+    Returns:
+    --------
+        200 OK telling whether a matching audit exists.
+    """
+    uc_input = AuditExistsInput(filters=AuditSearchFilters(**params.model_dump()))
+    exists = use_case.execute(uc_input=uc_input)
+
+    return AuditExistsResponse(exists=exists)
+
+
+@audit_router.get(
+    "/suggestions",
+    status_code=status.HTTP_200_OK,
+)
+@inject
+def suggest_audit_values(
+    params: Annotated[SuggestAuditValuesRequest, Query()],
+    use_case: SuggestAuditValuesUseCase = Depends(
+        Provide[Container.suggest_audit_values_use_case]
+    ),
+) -> SuggestAuditValuesResponse:
+    """
+    Suggest the actors or resource ids starting with a prefix, ignoring case.
+
+    Suggestions come from a lookup index of the distinct values, so their
+    cost does not depend on the number of stored audits. Values are recorded
+    as audits are written; older ones are suggested once reindexed.
+
+    Parameters:
+    -----------
+        params (SuggestAuditValuesRequest): The query parameters.
+
+    Returns:
+    --------
+        200 OK with the suggested values.
+    """
+    uc_input = SuggestAuditValuesInput(**params.model_dump())
+    values = use_case.execute(uc_input=uc_input)
+
+    return SuggestAuditValuesResponse(items=values)
+
+
+@audit_router.get(
+    "/activity",
+    status_code=status.HTTP_200_OK,
+)
+@inject
+def summarize_audit_activity(
+    params: Annotated[AuditActivityRequest, Query()],
+    use_case: SummarizeAuditActivityUseCase = Depends(
+        Provide[Container.summarize_audit_activity_use_case]
+    ),
+) -> AuditActivityResponse:
+    """
+    Summarize the audits of an application per tenant, event type and day
+    (UTC), with their count and distinct actors.
+
+    Closed days are read from the daily rollups maintained by
+    `make roll-up`, so long ranges are cheap; only the days not rolled up
+    yet, usually the current one, are aggregated from the audits.
+
+    Parameters:
+    -----------
+        params (AuditActivityRequest): The query parameters.
+
+    Returns:
+    --------
+        200 OK with the daily summaries.
+    """
+    uc_input = SummarizeAuditActivityInput(
+        filters=AuditSearchFilters(**params.model_dump())
+    )
+    activity = use_case.execute(uc_input=uc_input)
+
+    return AuditActivityResponse(
+        items=[DailyActivityResponse(**summary.model_dump()) for summary in activity],
+        total=sum(summary.count for summary in activity),
+    )
+
+
+@audit_router.put(
+    "/schemas",
+    status_code=status.HTTP_200_OK,
+)
+@inject
+def register_event_schema(
+    payload: EventSchemaRequest,
+    use_case: RegisterEventSchemaUseCase = Depends(
+        Provide[Container.register_event_schema_use_case]
+    ),
+) -> RegisterEventSchemaResponse:
+    """
+    Declare the metadata schema of an event type, replacing the previous one.
+
+    Audits of the event type are then rejected when their metadata does not
+    match the schema, and the declared fields are mapped with their types on
+    the indices of the application. A field already mapped with another type
+    in the indices of the current month is only mapped from the next month
+    on, which `applied_to_current_indices` reports. Event types without a
+    schema keep free-form metadata.
+
+    Parameters:
+    -----------
+        payload (EventSchemaRequest): The request body.
+
+    Returns:
+    --------
+        200 OK with the schema and the mapping applied.
+    """
+    uc_input = EventSchema(**payload.model_dump())
+    registration = use_case.execute(uc_input=uc_input)
+
+    return RegisterEventSchemaResponse(
+        **uc_input.model_dump(), **registration.model_dump()
+    )
+
+
+@audit_router.get(
+    "/schemas",
+    status_code=status.HTTP_200_OK,
+)
+@inject
+def list_event_schemas(
+    params: Annotated[ListEventSchemasRequest, Query()],
+    use_case: ListEventSchemasUseCase = Depends(
+        Provide[Container.list_event_schemas_use_case]
+    ),
+) -> ListEventSchemasResponse:
+    """
+    List the declared event type schemas.
+
+    Parameters:
+    -----------
+        params (ListEventSchemasRequest): The query parameters.
+
+    Returns:
+    --------
+        200 OK with the schemas.
+    """
+    uc_input = ListEventSchemasInput(**params.model_dump())
+    schemas = use_case.execute(uc_input=uc_input)
+
+    return ListEventSchemasResponse(
+        items=[EventSchemaResponse(**schema.model_dump()) for schema in schemas]
+    )
+
+
+@audit_router.get(
+    "/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+@inject
+async def stream_audits(
+    params: Annotated[AuditEventFiltersRequest, Query()],
+    event_broker: InMemoryEventBroker = Depends(Provide[Container.event_broker]),
+) -> StreamingResponse:
+    """
+    Stream newly ingested audits as Server-Sent Events.
+
+    Audits are fanned out in-process from the ingest path, so watchers add no
+    load to OpenSearch. A watcher that falls behind loses the oldest audits
+    and receives a `dropped` event with how many were lost. A watcher only
+    sees the audits ingested by the process serving it, so the stream is
+    only available when `LIVE_TAIL_ENABLED` is set on a single worker server.
+
+    Parameters:
+    -----------
+        params (AuditEventFiltersRequest): The query parameters; `application`
+        or `cnpj` is required.
+
+    Returns:
+    --------
+        200 OK with a `text/event-stream` of audits.
+    """
+    if not settings.live_tail_enabled:
+        raise ResourceNotFoundError("The live tail is not enabled")
+    if not (params.application or params.cnpj):
+        raise InvalidParametersError("application or cnpj is required")
+
+    filters = AuditEventFilters(**params.model_dump())
+
+    return StreamingResponse(
+        _server_sent_events(event_broker, filters),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _server_sent_events(
+    event_broker: InMemoryEventBroker, filters: AuditEventFilters
+) -> AsyncIterator[bytes]:
+    subscription = event_broker.subscribe(filters)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(),
+                    timeout=settings.live_tail_heartbeat_seconds,
+                )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+
+            if dropped := subscription.take_dropped():
+                yield b'event: dropped\ndata: {"count": %d}\n\n' % dropped
+
+            yield b"data: " + event + b"\n\n"
+    finally:
+        event_broker.unsubscribe(subscription)
@@ -0,0 +1,117 @@
+"""
+Primes the expensive, lazily initialized pieces of the application.
+
+A lambdawarmer ping only keeps the container alive; without this the first
+real request after a scale-out would still resolve the DI graph, open the
+OpenSearch connection, fetch secrets and build the pydantic validators.
+"""
+
+import logging
+import time
+from typing import Callable, Iterable, Optional
+
+from dependency_injector import providers
+
+from config.settings import Settings, settings
+from core.models import AuditModel
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from presentation.api.responses import FastJSONResponse
+from presentation.api.v1.dtos.audit_dtos import (
+    CreateAuditRequest,
+    SearchAuditsRequest,
+    SearchAuditsResponse,
+)
+from presentation.di_container import Container
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_AUDIT = {
+    "actor": "warmup@bhub.ai",
+    "event_type": "warmup",
+    "application": "audit-api",
+    "cnpj": "00000000000000",
+    "resource_id": "warmup",
+    "timestamp": "2024-01-01T00:00:00Z",
+    "metadata": {"warmup": True},
+}
+
+
+def _resolve_providers(container: Container) -> None:
+    # The singletons are what the routes resolve: the use cases and the
+    # clients they hold, which start the resources they depend on. Other
+    # providers, such as the resources of disabled features, stay untouched.
+    for provider in container.providers.values():
+        if isinstance(provider, providers.Singleton):
+            provider()
+
+
+def _open_search_engine_connection(container: Container) -> None:
+    container.search_engine_client().client.ping()
+
+
+def _prime_secrets(container: Container) -> None:
+    # Local settings read nothing from Secrets Manager.
+    if isinstance(settings, Settings):
+        container.secret_cache().get(settings.AUTH0_SECRET_ARN.get_secret_value())
+
+
+def _validate_models(container: Container) -> None:
+    request = CreateAuditRequest.model_validate(_SAMPLE_AUDIT)
+    CreateAuditInput(**request.model_dump())
+    SearchAuditsRequest.model_validate({"cnpj": "00000000000000", "size": "1"})
+
+    audit = AuditModel.model_validate({"id": "warmup", **_SAMPLE_AUDIT})
+    SearchAuditsResponse.model_validate({"items": [audit.model_dump()]})
+    FastJSONResponse(content={"items": [audit]})
+
+
+_STEPS: dict[str, Callable[[Container], None]] = {
+    "container": _resolve_providers,
+    "search_engine": _open_search_engine_connection,
+    "secrets": _prime_secrets,
+    "models": _validate_models,
+}
+
+
+def warm_up(container: Container, steps: Optional[Iterable[str]] = None) -> dict:
+    """Runs the warm-up steps, never raising.
+
+    Parameters
+    ----------
+    container : Container
+        The DI container wired to the routes.
+    steps : Iterable[str], optional
+        The steps to run, `settings.warmup_steps` by default.
+
+    Returns
+    -------
+    dict
+        How long each primed step took, the failed steps and the total time,
+        all in milliseconds.
+    """
+    report = {"primed": {}, "failed": {}, "total_ms": 0.0}
+    started_at = time.perf_counter()
+
+    for name in steps if steps is not None else settings.warmup_steps:
+        step = _STEPS.get(name)
+        if step is None:
+            report["failed"][name] = "unknown warm-up step"
+            continue
+
+        step_started_at = time.perf_counter()
+        try:
+            step(container)
+        except Exception as exc:
+            report["failed"][name] = str(exc)
+            continue
+
+        report["primed"][name] = _elapsed_ms(step_started_at)
+
+    report["total_ms"] = _elapsed_ms(started_at)
+    logger.info("Warm-up report: %s", report)
+
+    return report
+
+
+def _elapsed_ms(started_at: float) -> float:
+    return round((time.perf_counter() - started_at) * 1000, 2)
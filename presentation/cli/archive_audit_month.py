@@ -0,0 +1,74 @@
+"""
+Archives a closed month of an application's audits to cold storage.
+
+    python -m presentation.cli.archive_audit_month --application billing \
+        --month 2024.05 [--slices 8]
+
+The archive location is `ARCHIVE_URI`. The hot indices are left untouched;
+drop them once the archive is in place. A month without audits left in the
+hot indices is refused, so running it again after they were dropped keeps the
+archive.
+"""
+
+import argparse
+import sys
+
+from config.settings import settings
+from core.shared.errors import InvalidParametersError, ResourceNotFoundError
+from core.use_case.archive_audit_month_use_case import ArchiveAuditMonthUseCase
+from core.use_case.archive_audit_month_use_case import (
+    UseCaseInput as ArchiveAuditMonthInput,
+)
+from presentation.di_container import Container, shutdown_container
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--application", required=True)
+    parser.add_argument("--month", required=True, help="YYYY.MM")
+    parser.add_argument(
+        "--slices",
+        type=int,
+        default=settings.archive_slices,
+        help="Parallel slices the month is streamed and written in.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+    if not settings.archive_uri:
+        sys.stderr.write("ARCHIVE_URI is not set\n")
+        return 2
+
+    container = Container()
+    container.init_resources()
+
+    try:
+        use_case = ArchiveAuditMonthUseCase(
+            search_engine_client=container.search_engine_client(),
+            audit_archive=container.audit_archive(),
+            slices=args.slices,
+        )
+        archived = use_case.execute(
+            uc_input=ArchiveAuditMonthInput(
+                application=args.application, month=args.month
+            )
+        )
+    except (InvalidParametersError, ResourceNotFoundError) as exc:
+        sys.stderr.write(f"{exc}\n")
+        return 1
+    finally:
+        shutdown_container(container)
+
+    sys.stdout.write(
+        f"Archived {archived} audits of {args.application} {args.month} "
+        f"to {settings.archive_uri}\n"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
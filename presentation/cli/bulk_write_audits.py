@@ -0,0 +1,154 @@
+"""
+Reindexes stored audits or backfills audits from other systems, in parallel.
+
+    python -m presentation.cli.bulk_write_audits reindex --application billing \
+        --months 2024.01 2024.02 [--slices 8] [--index-suffix -v2]
+    python -m presentation.cli.bulk_write_audits backfill --source legacy.jsonl
+
+Backfill sources hold one JSON audit per line. Runs are checkpointed to a
+local file: running the same command again resumes where it stopped.
+Progress goes to stderr and the final report, as JSON, to stdout.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Callable, Iterator
+
+import orjson
+
+from core.models import BulkWriteReport
+from core.shared.bulk_write_job import BulkWriteJob
+from core.use_case.backfill_audits_use_case import BackfillAuditsUseCase
+from core.use_case.backfill_audits_use_case import UseCaseInput as BackfillAuditsInput
+from core.use_case.reindex_audits_use_case import ReindexAuditsUseCase
+from core.use_case.reindex_audits_use_case import UseCaseInput as ReindexAuditsInput
+from infrastructure.file_job_checkpoint import FileJobCheckpoint
+from infrastructure.rate_limiter import TokenBucket
+from presentation.di_container import Container, shutdown_container
+
+_PROGRESS_INTERVAL_SECONDS = 5
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reindex = commands.add_parser("reindex", help="Rewrite months of audits.")
+    reindex.add_argument("--application", required=True)
+    reindex.add_argument("--months", required=True, nargs="+", help="YYYY.MM")
+    reindex.add_argument(
+        "--slices", type=int, default=4, help="Sliced scrolls per month."
+    )
+    reindex.add_argument(
+        "--index-suffix", default="", help="Appended to the target index names."
+    )
+
+    backfill = commands.add_parser("backfill", help="Import JSON lines audits.")
+    backfill.add_argument("--source", required=True, help="JSON lines file.")
+
+    for command in (reindex, backfill):
+        command.add_argument("--workers", type=int, default=4)
+        command.add_argument("--batch-size", type=int, default=1000)
+        command.add_argument(
+            "--max-rate",
+            type=float,
+            default=0,
+            help="Audits written per second at most; 0 does not throttle.",
+        )
+        command.add_argument(
+            "--checkpoint", help="Checkpoint file, `{command}.checkpoint.json`."
+        )
+
+    return parser.parse_args(argv)
+
+
+def _progress_printer() -> Callable[[BulkWriteReport], None]:
+    lock = threading.Lock()
+    printed_at = [0.0]
+
+    def print_progress(report: BulkWriteReport) -> None:
+        with lock:
+            if time.monotonic() - printed_at[0] < _PROGRESS_INTERVAL_SECONDS:
+                return
+            printed_at[0] = time.monotonic()
+
+        sys.stderr.write(
+            f"[{report.elapsed_seconds:.0f}s] tasks {report.completed_tasks}/"
+            f"{report.tasks}, written {report.written}, failed {report.failed}, "
+            f"{report.audits_per_second:.0f} audits/s\n"
+        )
+
+    return print_progress
+
+
+def _read_lines(path: str) -> Iterator[object]:
+    with open(path, "rb") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # Counted as failed by the validation of the use case.
+                yield None
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+    container = Container()
+    container.init_resources()
+
+    throttle = None
+    if args.max_rate > 0:
+        bucket = TokenBucket(
+            rate=args.max_rate, capacity=max(args.max_rate, args.batch_size)
+        )
+        throttle = bucket.acquire
+
+    job = BulkWriteJob(
+        search_engine_client=container.search_engine_client(),
+        checkpoint=FileJobCheckpoint(
+            path=args.checkpoint or f"{args.command}.checkpoint.json"
+        ),
+        workers=args.workers,
+        throttle=throttle,
+        on_progress=_progress_printer(),
+    )
+
+    try:
+        if args.command == "reindex":
+            report = ReindexAuditsUseCase(
+                search_engine_client=container.search_engine_client(), job=job
+            ).execute(
+                uc_input=ReindexAuditsInput(
+                    application=args.application,
+                    months=args.months,
+                    slices=args.slices,
+                    batch_size=args.batch_size,
+                    index_suffix=args.index_suffix,
+                )
+            )
+        else:
+            report = BackfillAuditsUseCase(job=job).execute(
+                uc_input=BackfillAuditsInput(
+                    source=os.path.abspath(args.source),
+                    audits=_read_lines(args.source),
+                    batch_size=args.batch_size,
+                )
+            )
+    finally:
+        shutdown_container(container)
+
+    sys.stdout.buffer.write(
+        orjson.dumps(report.model_dump(), option=orjson.OPT_INDENT_2)
+    )
+    sys.stdout.write("\n")
+
+    return 0 if report.completed_tasks == report.tasks else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,63 @@
+"""
+Folds the audits an application ingested since the previous run into its
+daily rollups.
+
+    python -m presentation.cli.roll_up_audits --application billing [--workers 4]
+
+Meant to run periodically, e.g. hourly: each run only aggregates again the
+closed days that received audits since the previous one. The first run rolls
+up every stored day.
+"""
+
+import argparse
+import sys
+
+import orjson
+
+from config.settings import settings
+from core.use_case.roll_up_audits_use_case import RollUpAuditsUseCase
+from core.use_case.roll_up_audits_use_case import UseCaseInput as RollUpAuditsInput
+from presentation.di_container import Container, shutdown_container
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--application", required=True)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.rollup_workers,
+        help="Days aggregated in parallel.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+
+    container = Container()
+    container.init_resources()
+
+    try:
+        use_case = RollUpAuditsUseCase(
+            search_engine_client=container.search_engine_client(),
+            settle_seconds=settings.rollup_settle_seconds,
+            workers=args.workers,
+        )
+        report = use_case.execute(
+            uc_input=RollUpAuditsInput(application=args.application)
+        )
+    finally:
+        shutdown_container(container)
+
+    sys.stdout.buffer.write(
+        orjson.dumps(report.model_dump(), option=orjson.OPT_INDENT_2)
+    )
+    sys.stdout.write("\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
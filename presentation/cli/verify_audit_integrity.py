@@ -0,0 +1,64 @@
+"""
+Verifies the integrity of the audits an application wrote in a month.
+
+    python -m presentation.cli.verify_audit_integrity --application billing \
+        --month 2024.05 [--slices 8]
+
+Prints the JSON report and exits with status 1 when it is not valid.
+"""
+
+import argparse
+import sys
+
+import orjson
+
+from config.settings import settings
+from core.use_case.verify_audit_integrity_use_case import (
+    UseCaseInput as VerifyAuditIntegrityInput,
+)
+from core.use_case.verify_audit_integrity_use_case import VerifyAuditIntegrityUseCase
+from presentation.di_container import Container, shutdown_container
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--application", required=True)
+    parser.add_argument("--month", required=True, help="YYYY.MM")
+    parser.add_argument(
+        "--slices",
+        type=int,
+        default=settings.integrity_verify_slices,
+        help="Parallel slices the audits are streamed in.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+    container = Container()
+    container.init_resources()
+
+    try:
+        use_case = VerifyAuditIntegrityUseCase(
+            search_engine_client=container.search_engine_client(),
+            slices=args.slices,
+        )
+        report = use_case.execute(
+            uc_input=VerifyAuditIntegrityInput(
+                application=args.application, month=args.month
+            )
+        )
+    finally:
+        shutdown_container(container)
+
+    sys.stdout.buffer.write(
+        orjson.dumps(report.model_dump(), option=orjson.OPT_INDENT_2)
+    )
+    sys.stdout.write("\n")
+
+    return 0 if report.valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
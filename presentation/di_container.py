@@ -1,6 +1,50 @@
-from dependency_injector import containers
+from typing import Optional
 
+from dependency_injector import containers, providers
+
+from config.settings import Settings, settings
+from core.shared.application import normalize_application
+from core.use_case.archive_audit_month_use_case import ArchiveAuditMonthUseCase
+from core.use_case.audit_exists_use_case import AuditExistsUseCase
+from core.use_case.count_audits_use_case import CountAuditsUseCase
 from core.use_case.create_audit_use_case import CreateAuditUseCase
+from core.use_case.list_event_schemas_use_case import ListEventSchemasUseCase
+from core.use_case.register_event_schema_use_case import RegisterEventSchemaUseCase
+from core.use_case.roll_up_audits_use_case import RollUpAuditsUseCase
+from core.use_case.search_audits_use_case import SearchAuditsUseCase
+from core.use_case.suggest_audit_values_use_case import SuggestAuditValuesUseCase
+from core.use_case.summarize_audit_activity_use_case import (
+    SummarizeAuditActivityUseCase,
+)
+from infrastructure.audit_coalescer import audit_coalescer_resource
+from infrastructure.event_schema_registry import CachedEventSchemaRegistry
+from infrastructure.in_memory_event_broker import InMemoryEventBroker
+from infrastructure.integrity_chain import integrity_chain_resource
+from infrastructure.jwks_cache import JwksCache
+from infrastructure.jwt_validator import JwtValidator
+from infrastructure.metrics_sink import metrics_sink_resource
+from infrastructure.open_search_client import OpenSearchClient, open_search_connection
+from infrastructure.parquet_audit_archive import ParquetAuditArchive
+from infrastructure.rate_limiter import BucketLimit, RateLimiter
+from infrastructure.secret_cache import SecretCache, secret_cache_resource
+
+
+def _load_auth0_tenants(secret_cache: SecretCache) -> dict:
+    # Local settings have no Auth0 secret.
+    if not isinstance(settings, Settings):
+        return {}
+
+    return secret_cache.get(settings.AUTH0_SECRET_ARN.get_secret_value())
+
+
+def _cnpj_limit() -> Optional[BucketLimit]:
+    if settings.rate_limit_cnpj_rate <= 0:
+        return None
+
+    return BucketLimit(
+        rate=settings.rate_limit_cnpj_rate,
+        burst=max(settings.rate_limit_cnpj_burst, settings.rate_limit_cnpj_rate),
+    )
 
 
 class Container(containers.DeclarativeContainer):
@@ -9,12 +53,160 @@ class Container(containers.DeclarativeContainer):
     Manages the lifecycle of the application objects and their dependencies.
     Automates the process of creating an configuring objects by injecting
     them with their required dependencies throughout the app code.
+
+    Backend clients are `Resource` providers, started and closed with the
+    application lifespan. Use cases hold no request state, so they are
+    `Singleton` providers and resolving them on a request allocates nothing.
     """
 
     wiring_config = containers.WiringConfiguration(
+        modules=[
+            "presentation.api.v1.dependencies",
+        ],
         packages=[
             "presentation.api.v1.routes",
-        ]
+        ],
+    )
+
+    open_search = providers.Resource(open_search_connection)
+    secret_cache = providers.Resource(
+        secret_cache_resource,
+        ttl_seconds=settings.secret_cache_ttl_seconds,
+    )
+    metrics_sink = providers.Resource(
+        metrics_sink_resource,
+        namespace=settings.metrics_namespace,
+        flush_interval_seconds=settings.metrics_flush_interval_seconds,
+    )
+
+    auth0_tenants = providers.Callable(_load_auth0_tenants, secret_cache=secret_cache)
+    jwks_cache = providers.Singleton(
+        JwksCache,
+        ttl_seconds=settings.jwks_cache_ttl_seconds,
+        min_refresh_interval_seconds=settings.jwks_min_refresh_interval_seconds,
+    )
+    jwt_validator = providers.Singleton(
+        JwtValidator,
+        tenants=auth0_tenants.provider,
+        jwks_cache=jwks_cache,
+        claims_cache_size=settings.jwt_claims_cache_size,
+    )
+
+    rate_limiter = providers.Singleton(
+        RateLimiter,
+        enabled=settings.rate_limit_enabled,
+        application_limit=BucketLimit(
+            rate=settings.rate_limit_application_rate,
+            burst=settings.rate_limit_application_burst,
+        ),
+        application_overrides={
+            normalize_application(application): BucketLimit(**limit)
+            for application, limit in settings.rate_limit_application_overrides.items()
+        },
+        cnpj_limit=_cnpj_limit(),
+        max_buckets=settings.rate_limit_max_buckets,
+        metrics_sink=metrics_sink,
+    )
+
+    search_engine_client = providers.Singleton(
+        OpenSearchClient,
+        client=open_search,
+        record_lookups=settings.typeahead_enabled,
+        lookup_cache_size=settings.typeahead_cache_size,
+    )
+    event_broker = providers.Singleton(
+        InMemoryEventBroker,
+        queue_size=settings.live_tail_queue_size,
     )
 
-    create_audit_use_case = containers.Factory(CreateAuditUseCase)
+    audit_archive = (
+        providers.Singleton(
+            ParquetAuditArchive,
+            uri=settings.archive_uri,
+            row_group_size=settings.archive_row_group_size,
+            compression=settings.archive_compression,
+        )
+        if settings.archive_uri
+        else providers.Object(None)
+    )
+
+    integrity_chain = providers.Resource(
+        integrity_chain_resource,
+        search_engine_client=search_engine_client,
+        batch_size=settings.integrity_batch_size,
+        max_batch_age_seconds=settings.integrity_max_batch_age_seconds,
+    )
+
+    audit_coalescer = providers.Resource(
+        audit_coalescer_resource,
+        search_engine_client=search_engine_client,
+        event_types=settings.coalescing_event_types,
+        window_seconds=settings.coalescing_window_seconds,
+        max_windows=settings.coalescing_max_windows,
+        metrics_sink=metrics_sink,
+        integrity_chain=integrity_chain if settings.integrity_enabled else None,
+    )
+
+    schema_registry = providers.Singleton(
+        CachedEventSchemaRegistry,
+        search_engine_client=search_engine_client,
+        ttl_seconds=settings.event_schema_cache_ttl_seconds,
+    )
+
+    create_audit_use_case = providers.Singleton(
+        CreateAuditUseCase,
+        search_engine_client=search_engine_client,
+        event_publisher=event_broker if settings.live_tail_enabled else None,
+        integrity_chain=integrity_chain if settings.integrity_enabled else None,
+        coalescer=audit_coalescer if settings.coalescing_event_types else None,
+        schema_registry=schema_registry,
+    )
+    search_audits_use_case = providers.Singleton(
+        SearchAuditsUseCase,
+        search_engine_client=search_engine_client,
+        audit_archive=audit_archive,
+        hot_retention_months=settings.archive_hot_retention_months,
+    )
+    count_audits_use_case = providers.Singleton(
+        CountAuditsUseCase,
+        search_engine_client=search_engine_client,
+    )
+    audit_exists_use_case = providers.Singleton(
+        AuditExistsUseCase,
+        search_engine_client=search_engine_client,
+    )
+    archive_audit_month_use_case = providers.Singleton(
+        ArchiveAuditMonthUseCase,
+        search_engine_client=search_engine_client,
+        audit_archive=audit_archive,
+        slices=settings.archive_slices,
+    )
+    register_event_schema_use_case = providers.Singleton(
+        RegisterEventSchemaUseCase,
+        schema_registry=schema_registry,
+    )
+    list_event_schemas_use_case = providers.Singleton(
+        ListEventSchemasUseCase,
+        schema_registry=schema_registry,
+    )
+    roll_up_audits_use_case = providers.Singleton(
+        RollUpAuditsUseCase,
+        search_engine_client=search_engine_client,
+        settle_seconds=settings.rollup_settle_seconds,
+        workers=settings.rollup_workers,
+    )
+    summarize_audit_activity_use_case = providers.Singleton(
+        SummarizeAuditActivityUseCase,
+        search_engine_client=search_engine_client,
+    )
+    suggest_audit_values_use_case = providers.Singleton(
+        SuggestAuditValuesUseCase,
+        search_engine_client=search_engine_client,
+    )
+
+
+def shutdown_container(container: Container) -> None:
+    """Closes the backend resources and drops the singletons holding them, so
+    a container started again never hands out a closed client."""
+    container.shutdown_resources()
+    container.reset_singletons()
@@ -0,0 +1,108 @@
+"""
+Measures what gzip saves on the OpenSearch traffic: the bytes on the wire of
+a bulk request and of a search response, raw and gzipped the way opensearch-py
+compresses them, and the time each takes at a given bandwidth including the
+compression work.
+
+The audits are generated from a fixed seed, so runs are comparable.
+
+Usage: PYTHONPATH=. python scripts/benchmark_compression.py
+    [--audits N] [--hits N] [--mbps N]
+"""
+
+import argparse
+import gzip
+import random
+import timeit
+
+from opensearchpy import Connection
+from opensearchpy.serializer import JSONSerializer
+
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+
+_EVENT_TYPES = ["invoice.paid", "invoice.sent", "user.login", "user.updated"]
+
+
+def _audits(count: int) -> list[dict]:
+    rng = random.Random(42)
+
+    return [
+        CreateAuditInput(
+            actor=f"user-{rng.randrange(200)}@example.com",
+            event_type=rng.choice(_EVENT_TYPES),
+            application="billing",
+            cnpj=f"{rng.randrange(10**14):014d}",
+            resource_id=f"invoice-{rng.randrange(10**6)}",
+            timestamp=f"2024-05-{rng.randrange(1, 29):02d}T12:00:00+00:00",
+            metadata={"amount": rng.randrange(10**5) / 100, "currency": "BRL"},
+            ingested_at="2024-05-29T12:00:00+00:00",
+        ).model_dump(mode="json", exclude_none=True)
+        for _ in range(count)
+    ]
+
+
+def _bulk_body(audits: list[dict]) -> bytes:
+    serializer = JSONSerializer()
+    lines = []
+    for audit in audits:
+        lines.append(serializer.dumps({"index": {"_index": "audit-billing-2024.05"}}))
+        lines.append(serializer.dumps(audit))
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _search_response(audits: list[dict]) -> bytes:
+    hits = [
+        {"_index": "audit-billing-2024.05", "_id": f"{index:020d}", "_source": audit}
+        for index, audit in enumerate(audits)
+    ]
+
+    return JSONSerializer().dumps({"hits": {"hits": hits}}).encode()
+
+
+def _seconds(function, repeat: int = 5, number: int = 20) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def _report(name: str, body: bytes, compress, decompress, mbps: float) -> None:
+    compressed = compress(body)
+    cpu = _seconds(lambda: compress(body)) + _seconds(lambda: decompress(compressed))
+    bytes_per_second = mbps * 1e6 / 8
+
+    print(
+        f"{name}: {len(body)} -> {len(compressed)} bytes "
+        f"({len(compressed) / len(body):.1%}); "
+        f"{len(body) / bytes_per_second * 1e3:.2f}ms raw, "
+        f"{(len(compressed) / bytes_per_second + cpu) * 1e3:.2f}ms gzipped "
+        f"({cpu * 1e3:.2f}ms of it gzipping and gunzipping) at {mbps:g}Mbps"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--audits", type=int, default=500, help="per bulk request")
+    parser.add_argument("--hits", type=int, default=1000, help="per search response")
+    parser.add_argument("--mbps", type=float, default=100)
+    args = parser.parse_args()
+
+    # The compression opensearch-py applies to request bodies.
+    compress = Connection()._gzip_compress
+    _report(
+        "Bulk request",
+        _bulk_body(_audits(args.audits)),
+        compress,
+        gzip.decompress,
+        args.mbps,
+    )
+    # OpenSearch gzips responses at its default http.compression_level.
+    _report(
+        "Search response",
+        _search_response(_audits(args.hits)),
+        lambda body: gzip.compress(body, compresslevel=3),
+        gzip.decompress,
+        args.mbps,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Measures the cost of resolving a use case from the DI container per request,
+as a Singleton provider (how the container declares them) and as a Factory.
+
+Usage: PYTHONPATH=. python scripts/benchmark_providers.py [--calls N]
+"""
+
+import argparse
+import timeit
+
+from dependency_injector import providers
+
+from core.use_case.search_audits_use_case import SearchAuditsUseCase
+from presentation.di_container import Container, shutdown_container
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    container = Container()
+    container.init_resources()
+    try:
+        factory = providers.Factory(
+            SearchAuditsUseCase,
+            search_engine_client=container.search_engine_client,
+            audit_archive=container.audit_archive,
+        )
+        for name, provider in (
+            ("Singleton", container.search_audits_use_case),
+            ("Factory", factory),
+        ):
+            seconds = min(timeit.repeat(provider, number=args.calls, repeat=5))
+            print(f"{name}: {seconds / args.calls * 1e6:.3f}us per resolution")
+    finally:
+        shutdown_container(container)
+
+
+if __name__ == "__main__":
+    main()
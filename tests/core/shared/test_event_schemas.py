@@ -0,0 +1,86 @@
+import pytest
+from pydantic import ValidationError
+
+from core.models import EventSchema
+from core.shared.event_schemas import (
+    compile_schema,
+    metadata_mapping,
+    validate_metadata,
+)
+
+
+def _schema(**overrides) -> EventSchema:
+    return EventSchema(
+        **{
+            "application": "billing",
+            "event_type": "invoice.paid",
+            "fields": {
+                "amount": "number",
+                "installments": "integer",
+                "paid_at": "date",
+            },
+            "required": ["amount"],
+            **overrides,
+        }
+    )
+
+
+def test_compiles_an_unchanged_schema_once():
+    assert compile_schema(_schema()) is compile_schema(_schema())
+    assert compile_schema(_schema()) is not compile_schema(_schema(required=[]))
+
+
+def test_coerces_the_declared_fields_to_their_json_form():
+    metadata = validate_metadata(
+        compile_schema(_schema()),
+        {
+            "amount": "10.5",
+            "installments": "3",
+            "paid_at": "2024-05-10T12:00:00Z",
+            "note": "first",
+        },
+    )
+
+    assert metadata == {
+        "amount": 10.5,
+        "installments": 3,
+        "paid_at": "2024-05-10T12:00:00Z",
+        "note": "first",
+    }
+
+
+def test_rejects_metadata_missing_a_required_field():
+    with pytest.raises(ValidationError):
+        validate_metadata(compile_schema(_schema()), {"installments": 3})
+
+
+def test_rejects_a_field_of_the_wrong_type():
+    with pytest.raises(ValidationError):
+        validate_metadata(compile_schema(_schema()), {"amount": "ten"})
+
+
+def test_rejects_undeclared_fields_when_forbidden():
+    adapter = compile_schema(_schema(additional_fields=False))
+
+    with pytest.raises(ValidationError):
+        validate_metadata(adapter, {"amount": 10, "note": "first"})
+    assert validate_metadata(adapter, {"amount": 10}) == {"amount": 10.0}
+
+
+def test_maps_the_fields_of_every_schema():
+    mapping = metadata_mapping(
+        [_schema(), _schema(event_type="invoice.sent", fields={"channel": "keyword"})]
+    )
+
+    assert mapping == {
+        "properties": {
+            "metadata": {
+                "properties": {
+                    "amount": {"type": "double"},
+                    "installments": {"type": "long"},
+                    "paid_at": {"type": "date"},
+                    "channel": {"type": "keyword"},
+                }
+            }
+        }
+    }
@@ -0,0 +1,115 @@
+import pytest
+
+from core.models import AuditSearchFilters
+from core.shared.errors import InvalidParametersError, ResourceNotFoundError
+from core.use_case.archive_audit_month_use_case import ArchiveAuditMonthUseCase
+from core.use_case.archive_audit_month_use_case import (
+    UseCaseInput as ArchiveAuditMonthInput,
+)
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from infrastructure.open_search_indices import month_indices
+from infrastructure.parquet_audit_archive import ParquetAuditArchive
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+MONTH = "2024.05"
+
+
+def _write(client, count: int, actor: str = "alice") -> None:
+    for index in range(count):
+        client.upsert(
+            CreateAuditInput(
+                actor=actor,
+                event_type="invoice.paid",
+                application="billing",
+                cnpj="12345678000199",
+                resource_id=f"invoice-{index}",
+                timestamp=f"2024-05-{index + 1:02d}T12:00:00+00:00",
+                metadata={},
+                ingested_at=f"2024-05-{index + 1:02d}T12:00:00+00:00",
+            )
+        )
+
+
+def _drop_month(client) -> None:
+    for index, audit_id, _ in list(client.documents(month_indices("billing", MONTH))):
+        client.delete(index, audit_id)
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    return FakeSearchEngineClient()
+
+
+@pytest.fixture
+def archive(tmp_path) -> ParquetAuditArchive:
+    return ParquetAuditArchive(uri=str(tmp_path))
+
+
+def _archive(client, archive, month: str = MONTH) -> int:
+    use_case = ArchiveAuditMonthUseCase(
+        search_engine_client=client, audit_archive=archive, slices=3
+    )
+
+    return use_case.execute(
+        uc_input=ArchiveAuditMonthInput(application="billing", month=month)
+    )
+
+
+def _archived(archive) -> list[str]:
+    audits = archive.search(
+        AuditSearchFilters(application="billing"), size=100, months=[MONTH]
+    )
+
+    return sorted(audit.resource_id for audit in audits)
+
+
+def test_archives_every_slice_of_the_month(client, archive):
+    _write(client, 7)
+
+    assert _archive(client, archive) == 7
+    assert _archived(archive) == [f"invoice-{index}" for index in range(7)]
+
+
+def test_replaces_the_previous_archive(client, archive):
+    _write(client, 7)
+    _archive(client, archive)
+    _drop_month(client)
+    _write(client, 2, actor="bob")
+
+    assert _archive(client, archive) == 2
+    assert _archived(archive) == ["invoice-0", "invoice-1"]
+
+
+def test_keeps_the_archive_once_the_hot_indices_are_dropped(client, archive, tmp_path):
+    _write(client, 7)
+    _archive(client, archive)
+    _drop_month(client)
+
+    with pytest.raises(ResourceNotFoundError):
+        _archive(client, archive)
+
+    assert len(_archived(archive)) == 7
+    assert list((tmp_path / "_staging").iterdir()) == []
+
+
+def test_keeps_the_archive_when_a_slice_fails(client, archive, monkeypatch):
+    _write(client, 7)
+    _archive(client, archive)
+    scan_month = client.scan_month
+
+    def failing_scan_month(application, month, slice_id=None, slices=None):
+        if slice_id == 1:
+            raise ConnectionError("OpenSearch is unavailable")
+        return scan_month(application, month, slice_id, slices)
+
+    monkeypatch.setattr(client, "scan_month", failing_scan_month)
+
+    with pytest.raises(ConnectionError):
+        _archive(client, archive)
+
+    assert len(_archived(archive)) == 7
+
+
+def test_rejects_the_current_month(client, archive):
+    with pytest.raises(InvalidParametersError):
+        _archive(client, archive, month="2999.01")
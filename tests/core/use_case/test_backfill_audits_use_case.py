@@ -0,0 +1,85 @@
+import pytest
+
+from core.shared.bulk_write_job import BulkWriteJob
+from core.use_case.backfill_audits_use_case import BackfillAuditsUseCase
+from core.use_case.backfill_audits_use_case import UseCaseInput as BackfillAuditsInput
+from infrastructure.file_job_checkpoint import FileJobCheckpoint
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+def _audits(count: int = 5) -> list[dict]:
+    return [
+        {
+            "actor": "alice",
+            "event_type": "invoice.paid",
+            "application": "billing",
+            "cnpj": "12.345.678/0001-99",
+            "resource_id": f"invoice-{index}",
+            "timestamp": f"2023-{index + 1:02d}-15T12:00:00-03:00",
+            "metadata": {},
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    return FakeSearchEngineClient()
+
+
+def _backfill(client, tmp_path, audits, source: str = "/imports/legacy.jsonl"):
+    job = BulkWriteJob(
+        search_engine_client=client,
+        checkpoint=FileJobCheckpoint(path=str(tmp_path / "backfill.json")),
+        workers=2,
+    )
+
+    return BackfillAuditsUseCase(job=job).execute(
+        uc_input=BackfillAuditsInput(source=source, audits=audits, batch_size=2)
+    )
+
+
+def test_writes_audits_to_the_index_of_their_month(client, tmp_path):
+    report = _backfill(client, tmp_path, _audits())
+
+    assert report.written == 5
+    assert sorted(client.indices) == [
+        f"audit-billing-2023.{month:02d}" for month in range(1, 6)
+    ]
+    (document,) = client.indices["audit-billing-2023.03"].values()
+    assert document["cnpj"] == "12345678000199"
+    assert document["ingested_at"] > "2024"
+
+
+def test_counts_invalid_audits_as_failed(client, tmp_path):
+    audits = _audits(2) + [{"actor": "bob"}, {**_audits(1)[0], "timestamp": "soon"}]
+
+    report = _backfill(client, tmp_path, audits)
+
+    assert (report.written, report.failed) == (2, 2)
+    assert report.completed_tasks == report.tasks == 2
+
+
+def test_resumes_from_the_checkpoint(client, tmp_path):
+    _backfill(client, tmp_path, _audits())
+
+    report = _backfill(client, tmp_path, _audits())
+
+    assert report.resumed_tasks == report.tasks == 3
+    assert client.bulk_requests == 5
+
+
+def test_overwrites_the_audits_of_a_source_imported_again(client, tmp_path):
+    _backfill(client, tmp_path, _audits())
+    (tmp_path / "backfill.json").unlink()
+
+    _backfill(client, tmp_path, _audits())
+
+    assert sum(len(documents) for documents in client.indices.values()) == 5
+
+
+def test_keeps_the_audits_of_sources_with_the_same_name(client, tmp_path):
+    _backfill(client, tmp_path, _audits(), source="/imports/a/legacy.jsonl")
+    _backfill(client, tmp_path, _audits(), source="/imports/b/legacy.jsonl")
+
+    assert sum(len(documents) for documents in client.indices.values()) == 10
@@ -0,0 +1,72 @@
+import pytest
+
+from core.models import EventSchema
+from core.shared.errors import InvalidParametersError
+from core.use_case.create_audit_use_case import CreateAuditUseCase, UseCaseInput
+from infrastructure.event_schema_registry import CachedEventSchemaRegistry
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+def _audit(event_type: str, metadata: dict) -> UseCaseInput:
+    return UseCaseInput(
+        actor="alice",
+        event_type=event_type,
+        application="billing",
+        cnpj="12.345.678/0001-99",
+        resource_id="invoice-1",
+        timestamp="2024-05-10T12:00:00+00:00",
+        metadata=metadata,
+    )
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    return FakeSearchEngineClient()
+
+
+@pytest.fixture
+def use_case(client) -> CreateAuditUseCase:
+    registry = CachedEventSchemaRegistry(search_engine_client=client, ttl_seconds=60)
+    registry.register(
+        EventSchema(
+            application="billing",
+            event_type="invoice.paid",
+            fields={"amount": "number", "installments": "integer"},
+            required=["amount"],
+            additional_fields=False,
+        )
+    )
+
+    return CreateAuditUseCase(search_engine_client=client, schema_registry=registry)
+
+
+def _stored_metadata(client) -> list[dict]:
+    return [
+        document["metadata"] for *_, document in client.documents(["audit-billing-*"])
+    ]
+
+
+def test_stores_the_coerced_metadata(client, use_case):
+    use_case.execute(
+        uc_input=_audit("invoice.paid", {"amount": "10.5", "installments": "3"})
+    )
+
+    assert _stored_metadata(client) == [{"amount": 10.5, "installments": 3}]
+
+
+def test_rejects_invalid_metadata_without_storing_it(client, use_case):
+    with pytest.raises(InvalidParametersError, match="metadata.amount"):
+        use_case.execute(uc_input=_audit("invoice.paid", {"amount": "ten"}))
+
+    with pytest.raises(InvalidParametersError, match="metadata.note"):
+        use_case.execute(
+            uc_input=_audit("invoice.paid", {"amount": 10, "note": "first"})
+        )
+
+    assert _stored_metadata(client) == []
+
+
+def test_keeps_the_metadata_of_undeclared_event_types(client, use_case):
+    use_case.execute(uc_input=_audit("invoice.sent", {"channel": 3}))
+
+    assert _stored_metadata(client) == [{"channel": 3}]
@@ -0,0 +1,128 @@
+import pytest
+
+from core.shared.bulk_write_job import BulkWriteJob
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from core.use_case.reindex_audits_use_case import ReindexAuditsUseCase
+from core.use_case.reindex_audits_use_case import UseCaseInput as ReindexAuditsInput
+from infrastructure.file_job_checkpoint import FileJobCheckpoint
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+DEDICATED_CNPJ = "11222333000144"
+
+
+def _audit(cnpj: str, resource_id: str) -> CreateAuditInput:
+    return CreateAuditInput(
+        actor="alice",
+        event_type="invoice.paid",
+        application="billing",
+        cnpj=cnpj,
+        resource_id=resource_id,
+        timestamp="2024-05-10T12:00:00+00:00",
+        metadata={},
+        ingested_at="2024-05-10T12:00:00+00:00",
+    )
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    client = FakeSearchEngineClient()
+    for index in range(6):
+        client.upsert(_audit("12345678000199", f"shared-{index}"))
+        client.upsert(_audit(DEDICATED_CNPJ, f"dedicated-{index}"))
+
+    return client
+
+
+@pytest.fixture
+def dedicated(monkeypatch):
+    monkeypatch.setattr(
+        "infrastructure.open_search_indices._DEDICATED_TENANTS",
+        frozenset({DEDICATED_CNPJ}),
+    )
+
+
+def _reindex(client, tmp_path, **options):
+    job = BulkWriteJob(
+        search_engine_client=client,
+        checkpoint=FileJobCheckpoint(path=str(tmp_path / "reindex.json")),
+        workers=2,
+    )
+    use_case = ReindexAuditsUseCase(search_engine_client=client, job=job)
+
+    return use_case.execute(
+        uc_input=ReindexAuditsInput(
+            application="billing",
+            months=["2024.05"],
+            slices=3,
+            batch_size=2,
+            **options,
+        )
+    )
+
+
+def _resource_ids(client, index: str) -> list[str]:
+    return sorted(
+        document["resource_id"] for document in client.indices[index].values()
+    )
+
+
+def test_moves_the_audits_of_a_tenant_made_dedicated(client, tmp_path, dedicated):
+    report = _reindex(client, tmp_path)
+
+    # Slices still running may read a moved audit again, which is harmless.
+    assert report.written >= 12
+    assert report.completed_tasks == report.tasks == 3
+    assert _resource_ids(client, "audit-billing-2024.05") == [
+        f"shared-{index}" for index in range(6)
+    ]
+    assert _resource_ids(client, f"audit-billing-tenant-{DEDICATED_CNPJ}-2024.05") == [
+        f"dedicated-{index}" for index in range(6)
+    ]
+
+
+def test_keeps_the_source_indices_when_rewriting_to_new_ones(
+    client, tmp_path, dedicated
+):
+    _reindex(client, tmp_path, index_suffix="-v2")
+
+    assert len(client.indices["audit-billing-2024.05"]) == 12
+    assert len(client.indices["audit-billing-2024.05-v2"]) == 6
+    assert len(client.indices[f"audit-billing-tenant-{DEDICATED_CNPJ}-2024.05-v2"]) == 6
+
+
+def test_resumes_from_the_checkpoint(client, tmp_path):
+    _reindex(client, tmp_path)
+    bulk_requests = client.bulk_requests
+
+    report = _reindex(client, tmp_path)
+
+    assert report.resumed_tasks == report.tasks == 3
+    assert report.written == 0
+    assert client.bulk_requests == bulk_requests
+
+
+def test_does_not_resume_the_tasks_of_another_suffix(client, tmp_path):
+    _reindex(client, tmp_path)
+
+    report = _reindex(client, tmp_path, index_suffix="-v2")
+
+    assert report.resumed_tasks == 0
+    assert report.written == 12
+
+
+def test_routes_the_audits_stored_before_routing(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "infrastructure.open_search_indices.settings.opensearch_cnpj_routing", False
+    )
+    client = FakeSearchEngineClient()
+    for index in range(6):
+        client.upsert(_audit("12.345.678/0001-99", f"shared-{index}"))
+    monkeypatch.setattr(
+        "infrastructure.open_search_indices.settings.opensearch_cnpj_routing", True
+    )
+
+    _reindex(client, tmp_path)
+
+    stored = client.indices["audit-billing-2024.05"]
+    assert len(stored) == 6
+    assert {routing for _, routing in stored} == {"12345678000199"}
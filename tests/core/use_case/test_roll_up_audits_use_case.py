@@ -0,0 +1,112 @@
+from datetime import date
+
+import pytest
+
+from core.models import CoalescedSummary
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from core.use_case.roll_up_audits_use_case import RollUpAuditsUseCase
+from core.use_case.roll_up_audits_use_case import UseCaseInput as RollUpAuditsInput
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+def _write(client, timestamp: str, ingested_at: str, actor: str = "alice") -> dict:
+    return client.upsert(
+        CreateAuditInput(
+            actor=actor,
+            event_type="invoice.paid",
+            application="billing",
+            cnpj="12345678000199",
+            resource_id="invoice-1",
+            timestamp=timestamp,
+            metadata={},
+            ingested_at=ingested_at,
+        )
+    )
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    client = FakeSearchEngineClient()
+    _write(client, "2024-05-10T10:00:00+00:00", "2024-05-10T10:00:01+00:00")
+    _write(client, "2024-05-10T11:00:00+00:00", "2024-05-10T11:00:01+00:00", "bob")
+    _write(client, "2024-05-11T10:00:00+00:00", "2024-05-11T10:00:01+00:00")
+
+    return client
+
+
+def _roll_up(client):
+    use_case = RollUpAuditsUseCase(search_engine_client=client, workers=2)
+
+    return use_case.execute(uc_input=RollUpAuditsInput(application="billing"))
+
+
+def _counts(client) -> dict[date, int]:
+    return {day: rollup.count for (_, _, _, day), rollup in client.rollups.items()}
+
+
+def test_rolls_up_every_day_on_the_first_run(client):
+    report = _roll_up(client)
+
+    assert (report.days, report.rollups) == (2, 2)
+    assert _counts(client) == {date(2024, 5, 10): 2, date(2024, 5, 11): 1}
+    rollup = client.rollups[
+        ("billing", "12345678000199", "invoice.paid", date(2024, 5, 10))
+    ]
+    assert rollup.distinct_actors == 2
+    assert report.high_water_mark == client.get_rollup_high_water_mark("billing")
+
+
+def test_skips_the_days_without_new_audits(client):
+    _roll_up(client)
+
+    report = _roll_up(client)
+
+    assert report.days == 0
+
+
+def test_rolls_up_again_the_days_of_late_audits(client):
+    client.save_rollup_high_water_mark("billing", "2024-05-12T00:00:00+00:00")
+    _write(client, "2024-05-10T12:00:00+00:00", "2024-05-12T08:00:00+00:00")
+
+    report = _roll_up(client)
+
+    assert report.days == 1
+    assert _counts(client) == {date(2024, 5, 10): 3}
+
+
+def test_rolls_up_again_the_days_of_late_coalesced_repeats(client):
+    client.save_rollup_high_water_mark("billing", "2024-05-12T00:00:00+00:00")
+    (reference,) = [
+        {"_index": index, "_id": audit_id}
+        for index, audit_id, document in client.documents(["audit-billing-*"])
+        if document["timestamp"].startswith("2024-05-11")
+    ]
+    client.update_coalesced(
+        [
+            (
+                reference,
+                "12345678000199",
+                CoalescedSummary(
+                    count=5,
+                    first_timestamp="2024-05-11T10:00:00+00:00",
+                    last_timestamp="2024-05-11T10:00:04+00:00",
+                    recorded_at="2024-05-12T08:00:00+00:00",
+                ),
+            )
+        ]
+    )
+
+    report = _roll_up(client)
+
+    assert report.days == 1
+    assert _counts(client) == {date(2024, 5, 11): 5}
+
+
+def test_rolls_up_audits_dated_after_their_ingestion(client):
+    client.save_rollup_high_water_mark("billing", "2024-05-12T00:00:00+00:00")
+    _write(client, "2024-05-20T00:00:00+00:00", "2024-05-12T08:00:00+00:00")
+
+    report = _roll_up(client)
+
+    assert report.days == 1
+    assert _counts(client) == {date(2024, 5, 20): 1}
@@ -0,0 +1,73 @@
+import pytest
+
+from core.models import AuditSearchFilters
+from core.shared.errors import InvalidParametersError
+from core.use_case.create_audit_use_case import CreateAuditUseCase
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from core.use_case.search_audits_use_case import SearchAuditsUseCase, UseCaseInput
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    client = FakeSearchEngineClient()
+    CreateAuditUseCase(search_engine_client=client).execute(
+        uc_input=CreateAuditInput(
+            actor="alice",
+            event_type="invoice.paid",
+            application="billing",
+            cnpj="12345678000199",
+            resource_id="invoice-1",
+            timestamp="2024-05-10T12:00:00+00:00",
+            metadata={"amount": 10, "currency": "BRL"},
+        )
+    )
+
+    return client
+
+
+def _search(client, **projection) -> dict:
+    use_case = SearchAuditsUseCase(search_engine_client=client)
+    audits = use_case.execute(
+        uc_input=UseCaseInput(
+            filters=AuditSearchFilters(application="billing"), size=10, **projection
+        )
+    )
+
+    return audits[0].model_dump(exclude_unset=True, exclude={"id"})
+
+
+def test_returns_the_summary_fields_by_default(client):
+    assert _search(client) == {
+        "timestamp": "2024-05-10T12:00:00+00:00",
+        "actor": "alice",
+        "event_type": "invoice.paid",
+        "resource_id": "invoice-1",
+    }
+
+
+def test_returns_the_full_audits_in_the_full_view(client):
+    audit = _search(client, view="full")
+
+    assert audit["metadata"] == {"amount": 10, "currency": "BRL"}
+    assert audit["cnpj"] == "12345678000199"
+
+
+def test_projects_the_given_fields_and_metadata_keys(client):
+    assert _search(client, fields=["actor", "metadata.amount"], view="full") == {
+        "actor": "alice",
+        "metadata": {"amount": 10},
+    }
+
+
+def test_omits_the_excluded_fields_and_metadata_keys(client):
+    audit = _search(client, fields=["-metadata.currency", "-ingested_at"])
+
+    assert audit["metadata"] == {"amount": 10}
+    assert "ingested_at" not in audit
+    assert audit["actor"] == "alice"
+
+
+def test_rejects_unknown_fields(client):
+    with pytest.raises(InvalidParametersError, match="Unknown audit field: secret"):
+        _search(client, fields=["actor", "secret"])
@@ -0,0 +1,103 @@
+from datetime import date
+
+import pytest
+
+from core.models import AuditSearchFilters, DailyActivity
+from core.shared.errors import InvalidParametersError
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from core.use_case.summarize_audit_activity_use_case import (
+    SummarizeAuditActivityUseCase,
+)
+from core.use_case.summarize_audit_activity_use_case import (
+    UseCaseInput as SummarizeAuditActivityInput,
+)
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    client = FakeSearchEngineClient()
+    for day in (9, 10, 11):
+        client.upsert(
+            CreateAuditInput(
+                actor="alice",
+                event_type="invoice.paid",
+                application="billing",
+                cnpj="12345678000199",
+                resource_id="invoice-1",
+                timestamp=f"2024-05-{day:02d}T10:00:00+00:00",
+                metadata={},
+                ingested_at=f"2024-05-{day:02d}T10:00:01+00:00",
+            )
+        )
+
+    return client
+
+
+def _summarize(client, **filters) -> list[DailyActivity]:
+    use_case = SummarizeAuditActivityUseCase(search_engine_client=client)
+
+    return use_case.execute(
+        uc_input=SummarizeAuditActivityInput(
+            filters=AuditSearchFilters(application="billing", **filters)
+        )
+    )
+
+
+def _rolled_up(client, day: int, count: int) -> None:
+    client.save_rollups(
+        "billing",
+        [
+            DailyActivity(
+                application="billing",
+                cnpj="12345678000199",
+                event_type="invoice.paid",
+                day=date(2024, 5, day),
+                count=count,
+                distinct_actors=1,
+            )
+        ],
+    )
+
+
+def test_aggregates_the_raw_indices_before_the_first_rollup(client):
+    activity = _summarize(client)
+
+    assert [summary.day.day for summary in activity] == [9, 10, 11]
+    assert client.search_rollups_calls == []
+
+
+def test_reads_the_rolled_up_days_from_the_rollups(client):
+    # Rollups differing from the raw audits tell where each day is read from.
+    _rolled_up(client, 9, 7)
+    _rolled_up(client, 10, 8)
+    client.save_rollup_high_water_mark("billing", "2024-05-11T00:00:00+00:00")
+
+    activity = _summarize(client, start_date=date(2024, 5, 9))
+
+    assert [(summary.day.day, summary.count) for summary in activity] == [
+        (9, 7),
+        (10, 8),
+        (11, 1),
+    ]
+    (rollups_filters,) = client.search_rollups_calls
+    assert rollups_filters.end_date == date(2024, 5, 10)
+    (raw_filters,) = client.daily_activity_calls
+    assert raw_filters.start_date == date(2024, 5, 11)
+
+
+def test_reads_only_the_rollups_of_a_range_before_the_mark(client):
+    _rolled_up(client, 9, 7)
+    client.save_rollup_high_water_mark("billing", "2024-05-11T00:00:00+00:00")
+
+    activity = _summarize(
+        client, start_date=date(2024, 5, 9), end_date=date(2024, 5, 9)
+    )
+
+    assert [(summary.day.day, summary.count) for summary in activity] == [(9, 7)]
+    assert client.daily_activity_calls == []
+
+
+def test_rejects_an_inverted_date_range(client):
+    with pytest.raises(InvalidParametersError):
+        _summarize(client, start_date=date(2024, 5, 10), end_date=date(2024, 5, 9))
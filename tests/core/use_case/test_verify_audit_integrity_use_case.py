@@ -0,0 +1,174 @@
+import pytest
+
+from core.use_case.create_audit_use_case import CreateAuditUseCase
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from core.use_case.verify_audit_integrity_use_case import (
+    UseCaseInput as VerifyAuditIntegrityInput,
+)
+from core.use_case.verify_audit_integrity_use_case import VerifyAuditIntegrityUseCase
+from infrastructure.audit_coalescer import InMemoryAuditCoalescer
+from infrastructure.integrity_chain import IntegrityChain
+from infrastructure.metrics_sink import MetricsSink
+from infrastructure.open_search_indices import month_indices
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+def _audit(resource_id: str) -> CreateAuditInput:
+    return CreateAuditInput(
+        actor="alice",
+        event_type="invoice.paid",
+        application="billing",
+        cnpj="12.345.678/0001-99",
+        resource_id=resource_id,
+        timestamp="2024-05-10T12:00:00+00:00",
+        metadata={"amount": 10},
+    )
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    return FakeSearchEngineClient()
+
+
+@pytest.fixture
+def month(client) -> str:
+    """Writes five sealed audits, returning their month."""
+    chain = IntegrityChain(
+        search_engine_client=client, batch_size=2, max_batch_age_seconds=3600
+    )
+    use_case = CreateAuditUseCase(search_engine_client=client, integrity_chain=chain)
+    for resource_id in range(5):
+        use_case.execute(uc_input=_audit(f"invoice-{resource_id}"))
+    chain.close()
+
+    return client.checkpoints[0].month
+
+
+def _verify(client, month: str, slices: int = 2):
+    use_case = VerifyAuditIntegrityUseCase(search_engine_client=client, slices=slices)
+
+    return use_case.execute(
+        uc_input=VerifyAuditIntegrityInput(application="billing", month=month)
+    )
+
+
+def _stored(client, month: str) -> list[tuple[str, str, dict]]:
+    return list(client.documents(month_indices("billing", month)))
+
+
+def test_verifies_untouched_audits(client, month):
+    report = _verify(client, month)
+
+    assert report.valid
+    assert (report.audits, report.checkpoints) == (5, 3)
+
+
+def test_reports_an_altered_audit(client, month):
+    _, audit_id, document = _stored(client, month)[0]
+    document["actor"] = "mallory"
+
+    report = _verify(client, month)
+
+    assert not report.valid
+    assert report.tampered_audits == [audit_id]
+    assert report.mismatched_batches == [document["integrity"]["batch"]]
+
+
+def test_reports_a_removed_audit(client, month):
+    index, audit_id, document = _stored(client, month)[0]
+    client.delete(index, audit_id)
+
+    report = _verify(client, month)
+
+    assert not report.valid
+    assert report.tampered_audits == []
+    assert report.mismatched_batches == [document["integrity"]["batch"]]
+
+
+def test_reports_an_altered_checkpoint_chain(client, month):
+    checkpoint = client.checkpoints[1]
+    client.checkpoints[1] = checkpoint.model_copy(update={"previous_hash": None})
+
+    report = _verify(client, month)
+
+    assert not report.valid
+    assert report.broken_chains == [checkpoint.chain]
+
+
+def test_reports_an_audit_inserted_without_stamp(client, month):
+    ingested_at = f"{month.replace('.', '-')}-01T00:00:00+00:00"
+    client.upsert(
+        _audit("invoice-forged").model_copy(update={"ingested_at": ingested_at})
+    )
+
+    report = _verify(client, month)
+
+    assert not report.valid
+    assert report.unstamped_audits == 1
+
+
+def test_accepts_unstamped_audits_of_a_month_without_integrity(client):
+    client.upsert(
+        _audit("invoice-1").model_copy(
+            update={"ingested_at": "2024-05-20T00:00:00+00:00"}
+        )
+    )
+
+    report = _verify(client, "2024.05")
+
+    assert report.valid
+    assert report.unstamped_audits == 1
+
+
+@pytest.fixture
+def coalesced_month(client) -> str:
+    """Writes a sealed audit and two sealed repeats, returning their month."""
+    chain = IntegrityChain(
+        search_engine_client=client, batch_size=10, max_batch_age_seconds=3600
+    )
+    coalescer = InMemoryAuditCoalescer(
+        search_engine_client=client,
+        event_types=frozenset({"invoice.paid"}),
+        window_seconds=3600,
+        max_windows=100,
+        metrics_sink=MetricsSink(namespace="audit", flush_interval_seconds=3600),
+        integrity_chain=chain,
+    )
+    use_case = CreateAuditUseCase(
+        search_engine_client=client, integrity_chain=chain, coalescer=coalescer
+    )
+    for _ in range(3):
+        use_case.execute(uc_input=_audit("invoice-1"))
+    coalescer.close()
+    chain.close()
+
+    return client.checkpoints[0].month
+
+
+def test_verifies_untouched_coalesced_repeats(client, coalesced_month):
+    report = _verify(client, coalesced_month)
+
+    assert report.valid
+    ((_, _, document),) = _stored(client, coalesced_month)
+    assert document["coalesced"]["count"] == 3
+
+
+def test_reports_altered_coalesced_repeats(client, coalesced_month):
+    ((_, audit_id, document),) = _stored(client, coalesced_month)
+    document["coalesced"]["count"] = 1
+
+    report = _verify(client, coalesced_month)
+
+    assert not report.valid
+    assert report.tampered_audits == [audit_id]
+    assert report.mismatched_batches == [document["integrity"]["batch"]]
+
+
+def test_reports_coalesced_repeats_recorded_without_stamp(client, coalesced_month):
+    ((_, audit_id, document),) = _stored(client, coalesced_month)
+    del document["coalesced"]["integrity"]
+
+    report = _verify(client, coalesced_month)
+
+    assert not report.valid
+    assert report.tampered_audits == [audit_id]
@@ -0,0 +1,315 @@
+"""
+In-memory SearchEngineClient for the use case tests.
+
+Audits are kept per index, named by the rules of the OpenSearch client, so
+the tests exercise the same monthly and dedicated tenant indices. Within an
+index they are keyed by id and routing: like on a multi-shard index, writing
+an id again under another routing leaves the previous copy on its shard.
+"""
+
+import fnmatch
+import uuid
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Iterator, Optional
+
+from core.models import (
+    AuditModel,
+    AuditSearchFilters,
+    DailyActivity,
+    EventSchema,
+    IntegrityCheckpoint,
+)
+from core.repositories.search_engine_client import SearchEngineClient
+from core.shared.application import normalize_application
+from core.shared.cnpj import cnpj_values, normalize_cnpj
+from infrastructure.open_search_indices import (
+    month_indices,
+    read_indices,
+    routing_for,
+    write_index,
+)
+
+
+def _matches(index: str, expressions: list[str]) -> bool:
+    included = [expression for expression in expressions if expression[0] != "-"]
+    excluded = [expression[1:] for expression in expressions if expression[0] == "-"]
+
+    return any(fnmatch.fnmatch(index, pattern) for pattern in included) and not any(
+        fnmatch.fnmatch(index, pattern) for pattern in excluded
+    )
+
+
+def _day(document: dict) -> date:
+    return datetime.fromisoformat(document["timestamp"]).astimezone(timezone.utc).date()
+
+
+def _project(document: dict, includes: list[str], excludes: list[str]) -> dict:
+    """Filters a document like the `_source` includes and excludes, whose
+    dotted paths select nested keys."""
+
+    def project(value: dict, prefix: str) -> dict:
+        projected = {}
+        for key, nested in value.items():
+            path = f"{prefix}{key}"
+            if path in excludes:
+                continue
+            if not includes or any(
+                path == include or path.startswith(f"{include}.")
+                for include in includes
+            ):
+                projected[key] = (
+                    project(nested, f"{path}.") if isinstance(nested, dict) else nested
+                )
+            elif isinstance(nested, dict) and any(
+                include.startswith(f"{path}.") for include in includes
+            ):
+                projected[key] = project(nested, f"{path}.")
+
+        return projected
+
+    return project(document, "")
+
+
+def _write_index(audit, month: Optional[str]) -> str:
+    if month:
+        written_at = datetime.strptime(month, "%Y.%m")
+    elif audit.ingested_at:
+        written_at = datetime.fromisoformat(audit.ingested_at)
+    else:
+        written_at = datetime.now(timezone.utc)
+
+    return write_index(audit.application, audit.cnpj, written_at)
+
+
+@dataclass
+class FakeSearchEngineClient(SearchEngineClient):
+    indices: dict[str, dict[tuple[str, Optional[str]], dict]] = field(
+        default_factory=lambda: defaultdict(dict)
+    )
+    checkpoints: list[IntegrityCheckpoint] = field(default_factory=list)
+    bulk_requests: int = 0
+    event_schemas: dict[tuple[str, str], EventSchema] = field(default_factory=dict)
+    mappings: dict[str, dict] = field(default_factory=dict)
+    # Whether the current indices reject metadata mappings.
+    mapping_conflicts: bool = False
+    rollups: dict[tuple, DailyActivity] = field(default_factory=dict)
+    high_water_marks: dict[str, str] = field(default_factory=dict)
+    daily_activity_calls: list[AuditSearchFilters] = field(default_factory=list)
+    search_rollups_calls: list[AuditSearchFilters] = field(default_factory=list)
+
+    def _matching(self, filters: AuditSearchFilters) -> list[tuple[str, dict]]:
+        matching = []
+        for _, audit_id, document in self.documents(read_indices(filters)):
+            if filters.cnpj and document["cnpj"] not in cnpj_values(filters.cnpj):
+                continue
+            if any(
+                getattr(filters, name) and document[name] != getattr(filters, name)
+                for name in ("actor", "event_type", "resource_id")
+            ):
+                continue
+            if filters.start_date and _day(document) < filters.start_date:
+                continue
+            if filters.end_date and _day(document) > filters.end_date:
+                continue
+            matching.append((audit_id, document))
+
+        return matching
+
+    def documents(self, expressions: list[str]) -> Iterator[tuple[str, str, dict]]:
+        """Yields the index, id and content of the audits of the matching
+        indices, as they were when first read, like a scroll."""
+        for index in sorted(list(self.indices)):
+            if _matches(index, expressions):
+                for (audit_id, _), document in list(self.indices[index].items()):
+                    yield index, audit_id, document
+
+    def delete(self, index: str, audit_id: str) -> None:
+        """Deletes every copy of an audit from an index, whatever its routing."""
+        for key in [key for key in self.indices[index] if key[0] == audit_id]:
+            del self.indices[index][key]
+
+    def upsert(self, data) -> dict:
+        index = _write_index(data, month=None)
+        audit_id = uuid.uuid4().hex
+        self.indices[index][(audit_id, routing_for(data.cnpj))] = data.model_dump(
+            mode="json", exclude_none=True
+        )
+
+        return {"_index": index, "_id": audit_id, "result": "created"}
+
+    def bulk_upsert(self, data, ids=None, month=None, index_suffix="") -> int:
+        self.bulk_requests += 1
+        for position, audit in enumerate(data):
+            index = _write_index(audit, month) + index_suffix
+            audit_id = ids[position] if ids is not None else uuid.uuid4().hex
+            self.indices[index][(audit_id, routing_for(audit.cnpj))] = audit.model_dump(
+                mode="json", exclude_none=True
+            )
+
+        return len(data)
+
+    def delete_moved(self, data, ids, month, routings=None) -> int:
+        deleted = 0
+        for audit, audit_id in zip(data, ids):
+            target = _write_index(audit, month)
+            expressions = month_indices(audit.application, month)
+            for index in list(self.indices):
+                if not _matches(index, expressions):
+                    continue
+                for key in list(self.indices[index]):
+                    if key[0] != audit_id:
+                        continue
+                    if index == target and (
+                        routings is None or key[1] == routing_for(audit.cnpj)
+                    ):
+                        continue
+                    del self.indices[index][key]
+                    deleted += 1
+
+        return deleted
+
+    def update_coalesced(self, updates) -> set[str]:
+        for reference, cnpj, summary in updates:
+            key = (reference["_id"], routing_for(cnpj))
+            document = self.indices[reference["_index"]][key]
+            document["coalesced"] = summary.model_dump(mode="json", exclude_none=True)
+
+        return set()
+
+    def search(self, filters, size, includes=None, excludes=None) -> list[AuditModel]:
+        matching = sorted(
+            self._matching(filters),
+            key=lambda match: match[1]["timestamp"],
+            reverse=True,
+        )
+
+        return [
+            AuditModel.model_construct(
+                id=audit_id, **_project(document, includes or [], excludes or [])
+            )
+            for audit_id, document in matching[:size]
+        ]
+
+    def count(self, filters) -> int:
+        return len(self._matching(filters))
+
+    def exists(self, filters) -> bool:
+        return bool(self._matching(filters))
+
+    def save_checkpoint(self, checkpoint: IntegrityCheckpoint) -> None:
+        self.checkpoints.append(checkpoint)
+
+    def list_checkpoints(
+        self, application: str, month: str
+    ) -> list[IntegrityCheckpoint]:
+        application = normalize_application(application)
+
+        return [
+            checkpoint
+            for checkpoint in self.checkpoints
+            if checkpoint.application == application and checkpoint.month == month
+        ]
+
+    def scan_month(
+        self,
+        application: str,
+        month: str,
+        slice_id: Optional[int] = None,
+        slices: Optional[int] = None,
+    ) -> Iterator[tuple[str, dict, Optional[str]]]:
+        for index in sorted(list(self.indices)):
+            if not _matches(index, month_indices(application, month)):
+                continue
+            for (audit_id, routing), document in list(self.indices[index].items()):
+                if slices and slices > 1:
+                    if zlib.crc32(audit_id.encode()) % slices != slice_id:
+                        continue
+                yield audit_id, dict(document), routing
+
+    def save_event_schema(self, schema) -> None:
+        key = (normalize_application(schema.application), schema.event_type)
+        self.event_schemas[key] = schema
+
+    def list_event_schemas(self, application=None):
+        return [
+            schema
+            for (schema_application, _), schema in self.event_schemas.items()
+            if application is None
+            or schema_application == normalize_application(application)
+        ]
+
+    def put_metadata_mapping(self, application, mapping) -> bool:
+        self.mappings[normalize_application(application)] = mapping
+
+        return not self.mapping_conflicts
+
+    def daily_activity(self, filters) -> Iterator[DailyActivity]:
+        self.daily_activity_calls.append(filters)
+        groups = defaultdict(list)
+        for _, document in self._matching(filters):
+            key = (
+                normalize_cnpj(document["cnpj"]),
+                document["event_type"],
+                _day(document),
+            )
+            groups[key].append(document)
+
+        for (cnpj, event_type, day), documents in sorted(groups.items()):
+            yield DailyActivity(
+                application=normalize_application(filters.application),
+                cnpj=cnpj,
+                event_type=event_type,
+                day=day,
+                count=sum(
+                    (document.get("coalesced") or {}).get("count", 1)
+                    for document in documents
+                ),
+                distinct_actors=len({document["actor"] for document in documents}),
+            )
+
+    def ingested_days(self, application, after, until) -> list[date]:
+        def changed(document: dict) -> bool:
+            moments = [
+                document.get("ingested_at"),
+                (document.get("coalesced") or {}).get("recorded_at"),
+            ]
+            return any(
+                moment and (after is None or moment > after) and moment <= until
+                for moment in moments
+            )
+
+        matching = self._matching(AuditSearchFilters(application=application))
+
+        return sorted({_day(document) for _, document in matching if changed(document)})
+
+    def save_rollups(self, application, rollups) -> None:
+        application = normalize_application(application)
+        for rollup in rollups:
+            key = (application, rollup.cnpj, rollup.event_type, rollup.day)
+            self.rollups[key] = rollup
+
+    def search_rollups(self, filters) -> list[DailyActivity]:
+        self.search_rollups_calls.append(filters)
+        application = normalize_application(filters.application)
+
+        return [
+            rollup
+            for (rollup_application, _, _, _), rollup in sorted(self.rollups.items())
+            if rollup_application == application
+            and (not filters.cnpj or rollup.cnpj in cnpj_values(filters.cnpj))
+            and (not filters.event_type or rollup.event_type == filters.event_type)
+            and (not filters.start_date or rollup.day >= filters.start_date)
+            and (not filters.end_date or rollup.day <= filters.end_date)
+        ]
+
+    def get_rollup_high_water_mark(self, application) -> Optional[str]:
+        return self.high_water_marks.get(normalize_application(application))
+
+    def save_rollup_high_water_mark(self, application, high_water_mark) -> None:
+        self.high_water_marks[normalize_application(application)] = high_water_mark
+
+    def suggest(self, lookup_field, prefix, size, application=None, cnpj=None):
+        raise NotImplementedError
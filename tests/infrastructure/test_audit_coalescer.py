@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from infrastructure.audit_coalescer import InMemoryAuditCoalescer
+from infrastructure.metrics_sink import MetricsSink
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+def _audit(event_type: str = "page.viewed", second: int = 0) -> CreateAuditInput:
+    return CreateAuditInput(
+        actor="alice",
+        event_type=event_type,
+        application="billing",
+        cnpj="12345678000199",
+        resource_id="invoice-1",
+        timestamp=f"2024-05-10T12:00:{second:02d}+00:00",
+        metadata={},
+        ingested_at="2024-05-10T12:00:00+00:00",
+    )
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    return FakeSearchEngineClient()
+
+
+def _coalescer(client, window_seconds: float = 3600) -> InMemoryAuditCoalescer:
+    return InMemoryAuditCoalescer(
+        search_engine_client=client,
+        event_types=frozenset({"page.viewed"}),
+        window_seconds=window_seconds,
+        max_windows=100,
+        metrics_sink=MetricsSink(namespace="audit", flush_interval_seconds=3600),
+    )
+
+
+def _stored(client) -> list[dict]:
+    return [
+        document
+        for documents in client.indices.values()
+        for document in documents.values()
+    ]
+
+
+def test_writes_the_first_audit_and_counts_the_repeats(client):
+    coalescer = _coalescer(client)
+
+    written = [
+        coalescer.coalesce(_audit(second=second), client.upsert) for second in range(3)
+    ]
+    coalescer.close()
+
+    assert written == [True, False, False]
+    (document,) = _stored(client)
+    assert document["coalesced"].pop("recorded_at")
+    assert document["coalesced"] == {
+        "count": 3,
+        "first_timestamp": "2024-05-10T12:00:00+00:00",
+        "last_timestamp": "2024-05-10T12:00:02+00:00",
+    }
+
+
+def test_records_expired_windows_without_further_audits(client):
+    coalescer = _coalescer(client, window_seconds=0.05)
+    coalescer.start()
+    try:
+        for second in range(2):
+            coalescer.coalesce(_audit(second=second), client.upsert)
+        deadline = time.monotonic() + 2
+        while "coalesced" not in _stored(client)[0] and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        coalescer.close()
+
+    assert _stored(client)[0]["coalesced"]["count"] == 2
+
+
+def test_records_expired_windows_on_audits_of_other_event_types(client):
+    coalescer = _coalescer(client, window_seconds=0.05)
+    for second in range(2):
+        coalescer.coalesce(_audit(second=second), client.upsert)
+    time.sleep(0.06)
+
+    coalescer.coalesce(_audit(event_type="invoice.paid"), client.upsert)
+
+    repeated, other = _stored(client)
+    assert repeated["coalesced"]["count"] == 2
+    assert "coalesced" not in other
+
+
+def test_counts_the_repeats_arriving_while_the_audit_is_written(client):
+    coalescer = _coalescer(client)
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_upsert(data):
+        writing.set()
+        release.wait(2)
+        return client.upsert(data)
+
+    first = threading.Thread(target=coalescer.coalesce, args=(_audit(), slow_upsert))
+    first.start()
+    writing.wait(2)
+    assert coalescer.coalesce(_audit(second=1), client.upsert) is False
+    coalescer.close()
+    release.set()
+    first.join()
+
+    (document,) = _stored(client)
+    assert document["coalesced"]["count"] == 2
+
+
+def test_forgets_the_repeats_of_an_audit_never_stored(client):
+    coalescer = _coalescer(client)
+
+    def failing_upsert(data):
+        raise ConnectionError("OpenSearch is unavailable")
+
+    with pytest.raises(ConnectionError):
+        coalescer.coalesce(_audit(), failing_upsert)
+
+    assert coalescer.coalesce(_audit(second=1), client.upsert) is True
+    coalescer.close()
+    assert "coalesced" not in _stored(client)[0]
+
+
+def test_coalesces_the_spellings_of_an_application(client):
+    coalescer = _coalescer(client)
+    spellings = ["billing_app", "Billing-App", "billing-app"]
+
+    written = [
+        coalescer.coalesce(
+            _audit(second=second).model_copy(update={"application": application}),
+            client.upsert,
+        )
+        for second, application in enumerate(spellings)
+    ]
+    coalescer.close()
+
+    assert written == [True, False, False]
+    (document,) = _stored(client)
+    assert document["coalesced"]["count"] == 3
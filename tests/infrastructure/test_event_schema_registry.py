@@ -0,0 +1,39 @@
+import pytest
+
+from core.models import EventSchema
+from infrastructure.event_schema_registry import CachedEventSchemaRegistry
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+@pytest.fixture
+def client() -> FakeSearchEngineClient:
+    return FakeSearchEngineClient()
+
+
+def _register(client):
+    registry = CachedEventSchemaRegistry(search_engine_client=client, ttl_seconds=60)
+
+    return registry.register(
+        EventSchema(
+            application="Billing_Api",
+            event_type="invoice.paid",
+            fields={"amount": "number"},
+            required=["amount"],
+        )
+    )
+
+
+def test_reports_a_mapping_applied_to_the_current_indices(client):
+    registration = _register(client)
+
+    assert registration.applied_to_current_indices
+    assert client.mappings["billing-api"] == registration.mapping
+
+
+def test_reports_a_mapping_deferred_to_the_next_month(client):
+    client.mapping_conflicts = True
+
+    registration = _register(client)
+
+    assert not registration.applied_to_current_indices
+    assert client.list_event_schemas("billing-api")
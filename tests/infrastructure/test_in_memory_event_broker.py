@@ -0,0 +1,62 @@
+import asyncio
+
+from core.models import AuditEventFilters
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from infrastructure.in_memory_event_broker import InMemoryEventBroker, compile_predicate
+
+
+def _audit(**overrides) -> CreateAuditInput:
+    return CreateAuditInput(
+        **{
+            "actor": "alice@acme.com",
+            "event_type": "login",
+            "application": "billing",
+            "cnpj": "11222333000181",
+            "resource_id": "invoice-1",
+            "timestamp": "2024-05-01T10:00:00+00:00",
+            "metadata": {},
+            **overrides,
+        }
+    )
+
+
+def test_matches_formatted_cnpj_filters():
+    predicate = compile_predicate(AuditEventFilters(cnpj="11.222.333/0001-81"))
+
+    assert predicate(_audit())
+    assert not predicate(_audit(cnpj="44555666000177"))
+
+
+def test_matches_every_filter():
+    predicate = compile_predicate(
+        AuditEventFilters(cnpj="11222333000181", event_type="login")
+    )
+
+    assert predicate(_audit())
+    assert not predicate(_audit(event_type="logout"))
+
+
+def test_delivers_audits_whatever_the_application_spelling():
+    async def scenario():
+        broker = InMemoryEventBroker(queue_size=10)
+        subscription = broker.subscribe(AuditEventFilters(application="Billing_App"))
+        other = broker.subscribe(AuditEventFilters(application="payroll"))
+
+        broker.publish(_audit(application="billing-app"))
+
+        return subscription.queue.qsize(), other.queue.qsize()
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_stops_delivering_after_unsubscribing():
+    async def scenario():
+        broker = InMemoryEventBroker(queue_size=10)
+        subscription = broker.subscribe(AuditEventFilters(application="Billing_App"))
+        broker.unsubscribe(subscription)
+
+        broker.publish(_audit(application="billing-app"))
+
+        return subscription.queue.qsize()
+
+    assert asyncio.run(scenario()) == 0
@@ -0,0 +1,83 @@
+import time
+
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from infrastructure.integrity_chain import IntegrityChain
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+def _audit(ingested_at: str = "2024-05-10T12:00:00+00:00") -> CreateAuditInput:
+    return CreateAuditInput(
+        actor="alice",
+        event_type="invoice.paid",
+        application="billing",
+        cnpj="12345678000199",
+        resource_id="invoice-1",
+        timestamp=ingested_at,
+        metadata={},
+        ingested_at=ingested_at,
+    )
+
+
+def _chain(client, **options) -> IntegrityChain:
+    return IntegrityChain(
+        search_engine_client=client,
+        **{"batch_size": 2, "max_batch_age_seconds": 3600, **options},
+    )
+
+
+def test_seals_a_full_batch_once_its_writes_are_over():
+    client = FakeSearchEngineClient()
+    chain = _chain(client)
+
+    stamps = [chain.stamp(_audit()) for _ in range(2)]
+    chain.settle(stamps[0], stored=True)
+    assert client.checkpoints == []
+
+    chain.settle(stamps[1], stored=True)
+
+    (checkpoint,) = client.checkpoints
+    assert checkpoint.batch == stamps[0].batch == stamps[1].batch
+    assert (checkpoint.application, checkpoint.month) == ("billing", "2024.05")
+    assert checkpoint.count == 2
+    assert checkpoint.sequence == 0
+
+
+def test_leaves_failed_writes_out_of_the_batch():
+    client = FakeSearchEngineClient()
+    chain = _chain(client)
+
+    stamps = [chain.stamp(_audit()) for _ in range(2)]
+    chain.settle(stamps[0], stored=True)
+    chain.settle(stamps[1], stored=False)
+
+    assert client.checkpoints[0].count == 1
+
+
+def test_seals_an_old_batch_without_a_later_stamp():
+    client = FakeSearchEngineClient()
+    chain = _chain(client, max_batch_age_seconds=0.05)
+    chain.start()
+    try:
+        chain.settle(chain.stamp(_audit()), stored=True)
+        deadline = time.monotonic() + 2
+        while not client.checkpoints and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        chain.close()
+
+    assert len(client.checkpoints) == 1
+
+
+def test_seals_the_remaining_batches_on_close():
+    client = FakeSearchEngineClient()
+    chain = _chain(client)
+    chain.start()
+
+    chain.settle(chain.stamp(_audit()), stored=True)
+    chain.settle(chain.stamp(_audit("2024-06-01T00:00:00+00:00")), stored=True)
+    chain.close()
+
+    assert sorted(checkpoint.month for checkpoint in client.checkpoints) == [
+        "2024.05",
+        "2024.06",
+    ]
@@ -0,0 +1,162 @@
+import time
+import urllib.error
+
+import pytest
+import rsa
+from jose import jwk, jwt
+
+from core.shared.errors import ServiceUnavailableError, UnauthorizedError
+from infrastructure.jwks_cache import JwksCache
+from infrastructure.jwt_validator import JwtValidator
+
+DOMAIN = "acme.auth0.com"
+ISSUER = f"https://{DOMAIN}/"
+AUDIENCE = "https://audit-api"
+KID = "key-1"
+
+
+def _private_key() -> str:
+    _, private_key = rsa.newkeys(1024)
+    return private_key.save_pkcs1().decode()
+
+
+PRIVATE_KEY = _private_key()
+OTHER_PRIVATE_KEY = _private_key()
+
+
+def _public_jwk(private_key: str, kid: str) -> dict:
+    public_key = jwk.construct(private_key, "RS256").public_key().to_dict()
+    return {**public_key, "kid": kid, "use": "sig"}
+
+
+def _token(private_key: str = PRIVATE_KEY, kid: str = KID, **overrides) -> str:
+    claims = {
+        "iss": ISSUER,
+        "aud": AUDIENCE,
+        "sub": "client@clients",
+        "exp": int(time.time()) + 600,
+        **overrides,
+    }
+    claims = {name: value for name, value in claims.items() if value is not None}
+
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class StubJwks:
+    """Serves a local key set and counts the fetches."""
+
+    def __init__(self, keys: list[dict]):
+        self.keys = keys
+        self.fetches = 0
+        self.error = None
+
+    def __call__(self, jwks_url: str) -> dict:
+        assert jwks_url == f"https://{DOMAIN}/.well-known/jwks.json"
+        self.fetches += 1
+        if self.error is not None:
+            raise self.error
+
+        return {"keys": self.keys}
+
+
+@pytest.fixture
+def stub_jwks() -> StubJwks:
+    return StubJwks([_public_jwk(PRIVATE_KEY, KID)])
+
+
+@pytest.fixture
+def jwks_cache(stub_jwks) -> JwksCache:
+    return JwksCache(ttl_seconds=600, min_refresh_interval_seconds=30, fetch=stub_jwks)
+
+
+@pytest.fixture
+def validator(jwks_cache) -> JwtValidator:
+    tenants = {"acme": {"domain": DOMAIN, "audience": AUDIENCE}}
+    return JwtValidator(
+        tenants=lambda: tenants, jwks_cache=jwks_cache, claims_cache_size=10
+    )
+
+
+def test_accepts_a_valid_token(validator):
+    claims = validator.validate(_token())
+
+    assert claims["sub"] == "client@clients"
+
+
+def test_caches_the_claims_of_a_valid_token(validator, stub_jwks, monkeypatch):
+    token = _token()
+    validator.validate(token)
+
+    def decode(*args, **kwargs):
+        raise AssertionError("A cached token must not be decoded again")
+
+    monkeypatch.setattr("infrastructure.jwt_validator.jwt.decode", decode)
+
+    assert validator.validate(token)["sub"] == "client@clients"
+    assert stub_jwks.fetches == 1
+
+
+def test_rejects_an_unknown_key_id(validator):
+    with pytest.raises(UnauthorizedError, match="Unknown token signing key"):
+        validator.validate(_token(kid="other-key"))
+
+
+def test_rejects_a_token_signed_with_another_key(validator):
+    with pytest.raises(UnauthorizedError, match="Invalid token"):
+        validator.validate(_token(private_key=OTHER_PRIVATE_KEY))
+
+
+def test_rejects_an_unknown_issuer(validator):
+    with pytest.raises(UnauthorizedError, match="Unknown token issuer"):
+        validator.validate(_token(iss="https://evil.auth0.com/"))
+
+
+def test_rejects_another_audience(validator):
+    with pytest.raises(UnauthorizedError, match="Invalid token"):
+        validator.validate(_token(aud="https://other-api"))
+
+
+def test_rejects_a_token_without_audience(validator):
+    with pytest.raises(UnauthorizedError, match="Invalid token"):
+        validator.validate(_token(aud=None))
+
+
+def test_rejects_an_expired_token(validator):
+    with pytest.raises(UnauthorizedError, match="Invalid token"):
+        validator.validate(_token(exp=int(time.time()) - 60))
+
+
+def test_rejects_a_malformed_token(validator):
+    with pytest.raises(UnauthorizedError, match="Malformed token"):
+        validator.validate("not-a-jwt")
+
+
+def test_refreshes_the_keys_on_rotation(validator, stub_jwks, jwks_cache):
+    validator.validate(_token())
+    stub_jwks.keys = [_public_jwk(OTHER_PRIVATE_KEY, "key-2")]
+    jwks_cache.min_refresh_interval_seconds = 0
+
+    claims = validator.validate(_token(private_key=OTHER_PRIVATE_KEY, kid="key-2"))
+
+    assert claims["iss"] == ISSUER
+    assert stub_jwks.fetches == 2
+
+
+def test_reports_unavailable_keys(validator, stub_jwks):
+    stub_jwks.error = urllib.error.URLError("connection refused")
+
+    with pytest.raises(ServiceUnavailableError):
+        validator.validate(_token())
+
+
+def test_keeps_stale_keys_when_the_refresh_fails(validator, stub_jwks, jwks_cache):
+    validator.validate(_token(sub="first"))
+    jwks_cache.ttl_seconds = 0
+    jwks_cache.min_refresh_interval_seconds = 0
+    jwks_cache._key_sets.clear()
+    validator.validate(_token(sub="second"))
+    stub_jwks.error = urllib.error.URLError("connection refused")
+
+    assert validator.validate(_token(sub="third"))["sub"] == "third"
+    with pytest.raises(UnauthorizedError, match="Unknown token signing key"):
+        validator.validate(_token(kid="other-key"))
@@ -0,0 +1,303 @@
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import pytest
+
+from core.models import AuditSearchFilters, CoalescedSummary
+from core.use_case.create_audit_use_case import UseCaseInput as CreateAuditInput
+from infrastructure.open_search_client import OpenSearchClient
+
+
+@dataclass
+class _LookupWrites:
+    """Records the lookup requests, the values in `statuses` failing with
+    their status."""
+
+    requests: list[list[dict]] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+
+    def bulk(self, client, actions, **kwargs) -> tuple[int, list[dict]]:
+        actions = list(actions)
+        if not actions or actions[0].get("_op_type") != "create":
+            return len(actions), []
+        self.requests.append(actions)
+        errors = [
+            {"create": {"_id": action["_id"], "status": status}}
+            for action in actions
+            if (status := self.statuses.get(action["_source"]["value"]))
+        ]
+
+        return len(actions) - len(errors), errors
+
+    def values(self) -> list[set[str]]:
+        return [
+            {action["_source"]["value"] for action in request}
+            for request in self.requests
+        ]
+
+
+@pytest.fixture
+def lookups(monkeypatch) -> _LookupWrites:
+    lookups = _LookupWrites()
+    monkeypatch.setattr("infrastructure.open_search_client.helpers.bulk", lookups.bulk)
+
+    return lookups
+
+
+@pytest.fixture
+def client() -> OpenSearchClient:
+    opensearch = SimpleNamespace(
+        indices=SimpleNamespace(put_template=lambda name, body: None)
+    )
+
+    return OpenSearchClient(client=opensearch, record_lookups=True)
+
+
+def _audit(actor: str = "alice", resource_id: str = "invoice-1") -> CreateAuditInput:
+    return CreateAuditInput(
+        actor=actor,
+        event_type="invoice.paid",
+        application="billing",
+        cnpj="12345678000199",
+        resource_id=resource_id,
+        timestamp="2024-05-10T12:00:00+00:00",
+        metadata={},
+    )
+
+
+def test_records_each_value_once(client, lookups):
+    client.bulk_upsert([_audit(), _audit()])
+    client.bulk_upsert([_audit(), _audit(actor="bob")])
+
+    assert lookups.values() == [
+        {"alice", "invoice-1"},
+        {"bob"},
+    ]
+
+
+def test_does_not_record_again_the_values_of_other_processes(client, lookups):
+    lookups.statuses["alice"] = 409
+
+    client.bulk_upsert([_audit()])
+    client.bulk_upsert([_audit()])
+
+    assert len(lookups.requests) == 1
+
+
+def test_records_again_the_values_that_failed(client, lookups):
+    lookups.statuses["alice"] = 429
+
+    client.bulk_upsert([_audit()])
+    del lookups.statuses["alice"]
+    client.bulk_upsert([_audit()])
+
+    assert lookups.values() == [
+        {"alice", "invoice-1"},
+        {"alice"},
+    ]
+
+
+def test_forgets_the_least_recently_seen_values(client, lookups):
+    client.lookup_cache_size = 2
+
+    client.bulk_upsert([_audit()])
+    client.bulk_upsert([_audit(actor="bob")])
+    client.bulk_upsert([_audit()])
+
+    assert lookups.values()[-1] == {"alice"}
+
+
+def test_deletes_the_copies_left_under_a_previous_routing():
+    deletes = []
+
+    def delete_by_query(index, body, **kwargs):
+        deletes.append((index, body["query"]))
+        return {"deleted": 1}
+
+    client = OpenSearchClient(client=SimpleNamespace(delete_by_query=delete_by_query))
+    audit = _audit().model_copy(update={"ingested_at": "2024-05-10T12:00:00+00:00"})
+
+    client.delete_moved([audit], ["audit-1"], "2024.05", routings=[None])
+
+    index, query = deletes[-1]
+    assert index == "audit-billing-2024.05"
+    assert query == {
+        "bool": {
+            "filter": [{"ids": {"values": ["audit-1"]}}],
+            "must_not": [{"term": {"_routing": "12345678000199"}}],
+        }
+    }
+
+
+def test_keeps_the_audits_whose_routing_did_not_change():
+    deletes = []
+
+    def delete_by_query(index, body, **kwargs):
+        deletes.append(index)
+        return {"deleted": 0}
+
+    client = OpenSearchClient(client=SimpleNamespace(delete_by_query=delete_by_query))
+
+    client.delete_moved([_audit()], ["audit-1"], "2024.05", routings=["12345678000199"])
+
+    assert "audit-billing-2024.05" not in deletes
+
+
+def test_returns_the_audits_whose_coalesced_repeats_failed(monkeypatch, caplog):
+    def bulk(client, actions, **kwargs):
+        return 1, [{"update": {"_id": "audit-2", "status": 404}}]
+
+    monkeypatch.setattr("infrastructure.open_search_client.helpers.bulk", bulk)
+    client = OpenSearchClient(client=SimpleNamespace())
+    summary = CoalescedSummary(
+        count=2,
+        first_timestamp="2024-05-10T12:00:00+00:00",
+        last_timestamp="2024-05-10T12:00:01+00:00",
+    )
+
+    failed = client.update_coalesced(
+        [
+            ({"_index": "audit-billing-2024.05", "_id": audit_id}, "1", summary)
+            for audit_id in ("audit-1", "audit-2")
+        ]
+    )
+
+    assert failed == {"audit-2"}
+    assert "1 coalesced summaries not recorded" in caplog.text
+
+
+def _bucket(cnpj: str, day: str, count: int, actors: int) -> dict:
+    return {
+        "key": {"cnpj": cnpj, "event_type": "invoice.paid", "day": day},
+        "count": {"value": float(count)},
+        "actors": {"value": actors},
+    }
+
+
+def test_merges_the_activity_of_raw_and_normalized_cnpjs():
+    buckets = [
+        _bucket("12.345.678/0001-99", "2024-05-10", count=2, actors=1),
+        _bucket("12345678000199", "2024-05-10", count=3, actors=2),
+        _bucket("12345678000199", "2024-05-11", count=1, actors=1),
+    ]
+    client = OpenSearchClient(
+        client=SimpleNamespace(
+            search=lambda **kwargs: {"aggregations": {"activity": {"buckets": buckets}}}
+        )
+    )
+
+    rows = client.daily_activity(AuditSearchFilters(application="billing"))
+
+    assert [
+        (row.cnpj, row.day.isoformat(), row.count, row.distinct_actors) for row in rows
+    ] == [
+        ("12345678000199", "2024-05-10", 5, 3),
+        ("12345678000199", "2024-05-11", 1, 1),
+    ]
+
+
+@dataclass
+class _Searches:
+    """Records the search requests, answering with no hits."""
+
+    requests: list[dict] = field(default_factory=list)
+
+    def search(self, **kwargs) -> dict:
+        self.requests.append(kwargs)
+
+        return {"hits": {"total": {"value": 0}, "hits": []}}
+
+
+def _suggest(**kwargs) -> dict:
+    searches = _Searches()
+    OpenSearchClient(client=SimpleNamespace(search=searches.search)).suggest(
+        lookup_field="actor", size=10, **kwargs
+    )
+
+    return searches.requests[0]
+
+
+def test_matches_prefixes_longer_than_the_indexed_grams():
+    prefix = "a" * 70
+
+    clauses = _suggest(prefix=prefix)["body"]["query"]["bool"]["filter"]
+
+    assert {"match": {"value": "a" * 64}} in clauses
+    assert {
+        "prefix": {"value.keyword": {"value": prefix, "case_insensitive": True}}
+    } in clauses
+
+
+def test_scopes_suggestions_to_the_tenant():
+    request = _suggest(prefix="al", application="billing", cnpj="12.345.678/0001-99")
+
+    assert request["index"] == "audit_lookup-billing"
+    assert request["routing"] == "12345678000199"
+    assert {"terms": {"cnpj": ["12345678000199", "12.345.678/0001-99"]}} in request[
+        "body"
+    ]["query"]["bool"]["filter"]
+    assert "collapse" not in request["body"]
+
+
+@pytest.mark.parametrize(
+    "scope",
+    [
+        {},
+        {"application": "billing"},
+        {"cnpj": "12345678000199"},
+    ],
+)
+def test_collapses_the_values_recorded_in_several_lookups(scope):
+    request = _suggest(prefix="al", **scope)
+
+    assert request["body"]["collapse"] == {"field": "value.keyword"}
+
+
+def test_projects_the_searched_sources():
+    searches = _Searches()
+    client = OpenSearchClient(client=SimpleNamespace(search=searches.search))
+    filters = AuditSearchFilters(application="billing")
+
+    client.search(filters=filters, size=10, includes=["actor", "metadata.amount"])
+    client.search(filters=filters, size=10, excludes=["metadata"])
+    client.search(filters=filters, size=10)
+
+    assert [request["body"].get("_source") for request in searches.requests] == [
+        {"includes": ["actor", "metadata.amount"], "excludes": []},
+        {"includes": [], "excludes": ["metadata"]},
+        None,
+    ]
+
+
+def test_leaves_the_fields_absent_from_the_sources_unset():
+    hits = [{"_id": "audit-1", "_source": {"actor": "alice"}}]
+    client = OpenSearchClient(
+        client=SimpleNamespace(search=lambda **kwargs: {"hits": {"hits": hits}})
+    )
+
+    [audit] = client.search(filters=AuditSearchFilters(application="billing"), size=1)
+
+    assert audit.model_dump(exclude_unset=True) == {"id": "audit-1", "actor": "alice"}
+
+
+def test_stops_each_shard_at_the_first_existing_audit():
+    searches = _Searches()
+    client = OpenSearchClient(client=SimpleNamespace(search=searches.search))
+
+    client.exists(filters=AuditSearchFilters(application="billing", actor="alice"))
+
+    body = searches.requests[0]["body"]
+    assert body["size"] == 0
+    assert body["terminate_after"] == 1
+    assert body["track_total_hits"] is True
+
+
+@pytest.mark.parametrize("total, exists", [(0, False), (1, True)])
+def test_tells_whether_an_audit_exists(total, exists):
+    client = OpenSearchClient(
+        client=SimpleNamespace(
+            search=lambda **kwargs: {"hits": {"total": {"value": total}, "hits": []}}
+        )
+    )
+
+    assert client.exists(filters=AuditSearchFilters(application="billing")) is exists
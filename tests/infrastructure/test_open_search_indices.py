@@ -0,0 +1,63 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from core.models import AuditSearchFilters
+from core.shared.cnpj import cnpj_values
+from infrastructure import open_search_indices
+from infrastructure.open_search_indices import read_routing, routing_for, write_index
+
+DEDICATED = "11222333000181"
+
+
+@pytest.fixture(autouse=True)
+def tenants(monkeypatch):
+    monkeypatch.setattr(open_search_indices, "_DEDICATED_TENANTS", {DEDICATED})
+    monkeypatch.setattr(open_search_indices.settings, "opensearch_cnpj_routing", True)
+
+
+def test_routes_shared_tenants_by_normalized_cnpj():
+    assert routing_for("44.555.666/0001-77") == "44555666000177"
+
+
+def test_does_not_route_dedicated_tenants():
+    assert routing_for("11.222.333/0001-81") is None
+    assert write_index(
+        "billing", DEDICATED, datetime(2024, 5, 1, tzinfo=timezone.utc)
+    ) == (f"audit-billing-tenant-{DEDICATED}-2024.05")
+
+
+def test_does_not_route_when_disabled(monkeypatch):
+    monkeypatch.setattr(open_search_indices.settings, "opensearch_cnpj_routing", False)
+
+    assert routing_for("44555666000177") is None
+
+
+def test_filters_on_normalized_and_raw_cnpj():
+    assert cnpj_values("44.555.666/0001-77") == ["44555666000177", "44.555.666/0001-77"]
+    assert cnpj_values("44555666000177") == ["44555666000177"]
+
+
+def test_routes_reads_from_the_cutover_month(monkeypatch):
+    monkeypatch.setattr(
+        open_search_indices.settings, "opensearch_routing_cutover", "2024.05"
+    )
+    cnpj = "44.555.666/0001-77"
+
+    assert read_routing(AuditSearchFilters(cnpj=cnpj)) is None
+    assert (
+        read_routing(AuditSearchFilters(cnpj=cnpj, start_date=date(2024, 4, 30)))
+        is None
+    )
+    assert (
+        read_routing(AuditSearchFilters(cnpj=cnpj, start_date=date(2024, 5, 1)))
+        == "44555666000177"
+    )
+
+
+def test_routes_every_read_without_a_cutover(monkeypatch):
+    monkeypatch.setattr(
+        open_search_indices.settings, "opensearch_routing_cutover", None
+    )
+
+    assert read_routing(AuditSearchFilters(cnpj="44555666000177")) == "44555666000177"
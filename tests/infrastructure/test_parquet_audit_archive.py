@@ -0,0 +1,89 @@
+import pytest
+
+from core.models import AuditSearchFilters
+from infrastructure.parquet_audit_archive import ParquetAuditArchive
+
+
+@pytest.fixture
+def archive(tmp_path) -> ParquetAuditArchive:
+    archive = ParquetAuditArchive(uri=str(tmp_path), row_group_size=4)
+    for part in range(3):
+        archive.write_part(
+            staging="run",
+            part=part,
+            documents=(
+                (
+                    f"audit-{part}-{day}",
+                    {
+                        "actor": "alice",
+                        "application": "billing",
+                        "cnpj": "12345678000199" if day % 2 else "98765432000100",
+                        "timestamp": f"2024-05-{day:02d}T{part:02d}:00:00+00:00",
+                        "metadata": {"day": day},
+                    },
+                )
+                for day in range(1, 29)
+            ),
+        )
+    archive.replace_month(application="billing", month="2024.05", staging="run")
+    archive.discard("run")
+
+    return archive
+
+
+def test_returns_the_latest_matching_audits(archive):
+    audits = archive.search(
+        AuditSearchFilters(application="billing", cnpj="12345678000199"),
+        size=5,
+        months=["2024.05"],
+    )
+
+    assert [audit.timestamp for audit in audits] == [
+        "2024-05-27T02:00:00+00:00",
+        "2024-05-27T01:00:00+00:00",
+        "2024-05-27T00:00:00+00:00",
+        "2024-05-25T02:00:00+00:00",
+        "2024-05-25T01:00:00+00:00",
+    ]
+    assert audits[0].metadata == {"day": 27}
+
+
+def test_returns_nothing_for_months_not_archived(archive):
+    audits = archive.search(
+        AuditSearchFilters(application="billing"), size=5, months=["2024.04"]
+    )
+
+    assert audits == []
+
+
+def test_matches_formatted_and_raw_cnpj_filters(tmp_path):
+    archive = ParquetAuditArchive(uri=str(tmp_path))
+    archive.write_part(
+        staging="run",
+        part=0,
+        documents=(
+            (
+                f"audit-{position}",
+                {
+                    "actor": "alice",
+                    "application": "billing",
+                    "cnpj": cnpj,
+                    "timestamp": f"2024-05-01T{position:02d}:00:00+00:00",
+                    "metadata": {},
+                },
+            )
+            # Audits stored before CNPJs were normalized keep the raw form.
+            for position, cnpj in enumerate(
+                ["12345678000199", "12345678000199", "12.345.678/0001-99"]
+            )
+        ),
+    )
+    archive.replace_month(application="billing", month="2024.05", staging="run")
+
+    for cnpj, expected in (("12.345.678/0001-99", 3), ("12345678000199", 2)):
+        audits = archive.search(
+            AuditSearchFilters(application="billing", cnpj=cnpj),
+            size=10,
+            months=["2024.05"],
+        )
+        assert len(audits) == expected
@@ -0,0 +1,81 @@
+import pytest
+
+from core.shared.errors import RateLimitExceededError
+from infrastructure.metrics_sink import MetricsSink
+from infrastructure.rate_limiter import BucketLimit, RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def metrics_sink() -> MetricsSink:
+    return MetricsSink(namespace="audit", flush_interval_seconds=3600)
+
+
+def _limiter(metrics_sink, **overrides) -> RateLimiter:
+    options = {
+        "enabled": True,
+        "application_limit": BucketLimit(rate=1, burst=1),
+        "application_overrides": {},
+        "cnpj_limit": None,
+        "max_buckets": 100,
+        "metrics_sink": metrics_sink,
+        **overrides,
+    }
+    return RateLimiter(**options)
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0)])
+def test_rejects_non_positive_limits(rate, burst):
+    with pytest.raises(ValueError):
+        BucketLimit(rate=rate, burst=burst)
+
+
+def test_rejects_a_bucket_that_never_refills():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+
+def test_shares_the_bucket_of_every_application_spelling(metrics_sink):
+    limiter = _limiter(metrics_sink)
+    limiter.admit(application="Billing_Api", cnpj="12345678000199")
+
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        limiter.admit(application="billing-api", cnpj="12345678000199")
+
+    assert exc_info.value.retry_after == 1
+
+
+def test_applies_the_overrides_of_the_normalized_application(metrics_sink):
+    limiter = _limiter(
+        metrics_sink,
+        application_overrides={"billing-api": BucketLimit(rate=1, burst=2)},
+    )
+
+    limiter.admit(application="Billing_Api", cnpj="12345678000199")
+    limiter.admit(application="billing-api", cnpj="12345678000199")
+
+
+def test_shares_the_bucket_of_every_cnpj_spelling(metrics_sink):
+    limiter = _limiter(
+        metrics_sink,
+        application_limit=BucketLimit(rate=100, burst=100),
+        cnpj_limit=BucketLimit(rate=1, burst=1),
+    )
+    limiter.admit(application="billing-api", cnpj="12.345.678/0001-99")
+
+    with pytest.raises(RateLimitExceededError):
+        limiter.admit(application="billing-api", cnpj="12345678000199")
+
+
+def test_does_not_tag_throttling_with_the_tenant(metrics_sink):
+    limiter = _limiter(
+        metrics_sink,
+        application_limit=BucketLimit(rate=100, burst=100),
+        cnpj_limit=BucketLimit(rate=1, burst=1),
+    )
+    limiter.admit(application="billing-api", cnpj="12345678000199")
+
+    with pytest.raises(RateLimitExceededError):
+        limiter.admit(application="billing-api", cnpj="12345678000199")
+
+    assert ("rate_limit.throttled", ("scope:cnpj",)) in metrics_sink._counters
+    assert not any("12345678000199" in str(key) for key in metrics_sink._counters)
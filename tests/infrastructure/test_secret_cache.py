@@ -0,0 +1,75 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from infrastructure.secret_cache import SecretCache, secret_cache_resource
+
+
+@dataclass
+class _SecretsManager:
+    """Answers after `delay` seconds, counting the lookups."""
+
+    delay: float = 0.0
+    lookups: int = 0
+    closed: bool = False
+
+    def get_secret_value(self, SecretId: str) -> dict:
+        self.lookups += 1
+        time.sleep(self.delay)
+        return {"SecretString": json.dumps({"arn": SecretId})}
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def secrets_manager() -> _SecretsManager:
+    return _SecretsManager()
+
+
+def _cache(secrets_manager, ttl_seconds: int = 60) -> SecretCache:
+    cache = SecretCache(ttl_seconds=ttl_seconds)
+    cache._client = secrets_manager
+
+    return cache
+
+
+def test_fetches_a_secret_once_for_concurrent_misses(secrets_manager):
+    secrets_manager.delay = 0.05
+    cache = _cache(secrets_manager)
+    values = []
+
+    threads = [
+        threading.Thread(target=lambda: values.append(cache.get("arn:secret")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert secrets_manager.lookups == 1
+    assert values == [{"arn": "arn:secret"}] * 8
+
+
+def test_fetches_an_expired_secret_again(secrets_manager):
+    cache = _cache(secrets_manager, ttl_seconds=0)
+
+    cache.get("arn:secret")
+    cache.get("arn:secret")
+
+    assert secrets_manager.lookups == 2
+
+
+def test_closes_its_client_with_the_resource(secrets_manager):
+    resource = secret_cache_resource(ttl_seconds=60)
+    cache = next(resource)
+    cache._client = secrets_manager
+
+    with pytest.raises(StopIteration):
+        next(resource)
+
+    assert secrets_manager.closed
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from gunicorn.glogging import Logger
+
+from presentation.api import boot_server
+from presentation.api.boot_server import (
+    APP_URI,
+    AuditAPIServer,
+    AuditAPIWorker,
+    server_options,
+)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    for name, value in {
+        "server_host": "0.0.0.0",
+        "server_port": 8000,
+        "server_workers": 4,
+        "server_graceful_timeout_seconds": 25,
+        "server_worker_timeout_seconds": 60,
+        "server_keepalive_seconds": 5,
+        "server_max_requests": 1000,
+        "live_tail_enabled": False,
+    }.items():
+        monkeypatch.setattr(boot_server.settings, name, value)
+
+    return boot_server.settings
+
+
+def test_configures_gunicorn_from_the_settings(settings):
+    cfg = AuditAPIServer(APP_URI, server_options()).cfg
+
+    assert cfg.bind == ["0.0.0.0:8000"]
+    assert cfg.workers == 4
+    assert cfg.worker_class is AuditAPIWorker
+    assert cfg.preload_app
+    assert cfg.graceful_timeout == 25
+    assert cfg.timeout == 60
+    assert cfg.keepalive == 5
+    assert (cfg.max_requests, cfg.max_requests_jitter) == (1000, 100)
+
+
+def test_drains_the_workers_for_the_graceful_timeout(settings):
+    cfg = AuditAPIServer(APP_URI, server_options()).cfg
+
+    worker = AuditAPIWorker(
+        age=1,
+        ppid=os.getpid(),
+        sockets=[],
+        app=None,
+        timeout=cfg.timeout,
+        cfg=cfg,
+        log=Logger(cfg),
+    )
+
+    assert worker.config.loop == "uvloop"
+    assert worker.config.http == "httptools"
+    assert worker.config.lifespan == "on"
+    assert worker.config.timeout_graceful_shutdown == 25
+
+
+def test_refuses_the_live_tail_on_several_workers(settings):
+    settings.live_tail_enabled = True
+
+    with pytest.raises(RuntimeError, match="SERVER_WORKERS=1"):
+        server_options()
+
+    settings.server_workers = 1
+    assert server_options()["workers"] == 1
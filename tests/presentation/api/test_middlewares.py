@@ -0,0 +1,39 @@
+import pytest
+
+from presentation.api import middlewares
+from presentation.api.middlewares import CompressionMiddleware
+
+
+def _scope(accept_encoding: str) -> dict:
+    return {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+
+@pytest.fixture
+def middleware() -> CompressionMiddleware:
+    return CompressionMiddleware(app=None)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("gzip;q=0, br;q=0", None),
+        ("gzip, br;q=0", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("*", "br"),
+        ("*, br;q=0", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiates_encoding_by_quality(middleware, accept_encoding, encoding):
+    assert middleware._negotiate_encoding(_scope(accept_encoding)) == encoding
+
+
+def test_skips_brotli_when_not_installed(middleware, monkeypatch):
+    monkeypatch.setattr(middlewares, "brotli", None)
+
+    assert middleware._negotiate_encoding(_scope("br, gzip;q=0.5")) == "gzip"
+    assert middleware._negotiate_encoding(_scope("br")) is None
@@ -0,0 +1,26 @@
+from datetime import date
+from decimal import Decimal
+
+import orjson
+
+from presentation.api.responses import FastJSONResponse
+
+
+class _Detail:
+    def __init__(self):
+        self.field = "cnpj"
+        self.since = date(2024, 5, 1)
+
+
+def test_renders_objects_pydantic_cannot_dump():
+    response = FastJSONResponse(content={"message": {"value": Decimal("1.5")}})
+
+    assert orjson.loads(response.body) == {"message": {"value": 1.5}}
+
+
+def test_renders_plain_objects_through_the_fastapi_encoder():
+    response = FastJSONResponse(content={"message": _Detail()})
+
+    assert orjson.loads(response.body) == {
+        "message": {"field": "cnpj", "since": "2024-05-01"}
+    }
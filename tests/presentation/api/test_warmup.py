@@ -0,0 +1,33 @@
+import pytest
+
+from presentation.api.warmup import warm_up
+from presentation.di_container import Container, shutdown_container
+
+
+@pytest.fixture
+def container():
+    container = Container()
+    yield container
+    shutdown_container(container)
+
+
+def test_primes_the_container_without_reading_secrets(container):
+    report = warm_up(container, steps=["container"])
+
+    assert report["failed"] == {}
+    assert "container" in report["primed"]
+    assert container.search_engine_client().client is container.open_search()
+    assert not container.secret_cache.initialized
+
+
+def test_leaves_the_resources_of_disabled_features_alone(container):
+    warm_up(container, steps=["container"])
+
+    assert not container.integrity_chain.initialized
+    assert not container.audit_coalescer.initialized
+
+
+def test_reports_unknown_steps(container):
+    report = warm_up(container, steps=["unknown"])
+
+    assert report["failed"] == {"unknown": "unknown warm-up step"}
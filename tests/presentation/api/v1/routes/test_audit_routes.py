@@ -0,0 +1,114 @@
+import pytest
+from dependency_injector import providers
+from fastapi.testclient import TestClient
+
+from core.models import EventSchema
+from presentation.api.main import Main
+from presentation.di_container import Container, shutdown_container
+from tests.fake_search_engine_client import FakeSearchEngineClient
+
+
+@pytest.fixture
+def search_engine_client() -> FakeSearchEngineClient:
+    return FakeSearchEngineClient()
+
+
+@pytest.fixture
+def container(search_engine_client):
+    # A container wires the routes to itself when created.
+    container = Container()
+    with container.search_engine_client.override(
+        providers.Object(search_engine_client)
+    ):
+        yield container
+    shutdown_container(container)
+
+
+@pytest.fixture
+def api(container) -> TestClient:
+    container.schema_registry().register(
+        EventSchema(
+            application="billing",
+            event_type="invoice.paid",
+            fields={"amount": "number"},
+            required=["amount"],
+        )
+    )
+
+    return TestClient(Main.app)
+
+
+def _payload(metadata: dict) -> dict:
+    return {
+        "actor": "alice",
+        "event_type": "invoice.paid",
+        "application": "billing",
+        "cnpj": "12.345.678/0001-99",
+        "resource_id": "invoice-1",
+        "timestamp": "2024-05-10T12:00:00+00:00",
+        "metadata": metadata,
+    }
+
+
+def test_creates_an_audit_with_valid_metadata(api, search_engine_client):
+    response = api.post("/v1/audit", json=_payload({"amount": "10.5"}))
+
+    assert response.status_code == 201
+    assert [
+        document["metadata"]
+        for *_, document in search_engine_client.documents(["audit-billing-*"])
+    ] == [{"amount": 10.5}]
+
+
+def test_rejects_invalid_metadata_with_422(api, search_engine_client):
+    response = api.post("/v1/audit", json=_payload({"amount": "ten"}))
+
+    assert response.status_code == 422
+    assert response.json()["message"].startswith(
+        "Invalid metadata for invoice.paid: metadata.amount:"
+    )
+    assert list(search_engine_client.documents(["audit-billing-*"])) == []
+
+
+def test_projects_the_searched_audits(api):
+    api.post("/v1/audit", json=_payload({"amount": 10, "currency": "BRL"}))
+
+    response = api.get(
+        "/v1/audit",
+        params={"application": "billing", "fields": "actor,metadata.amount"},
+    )
+
+    assert response.status_code == 200
+    [item] = response.json()["items"]
+    assert item.keys() == {"id", "actor", "metadata"}
+    assert item["metadata"] == {"amount": 10}
+
+
+@pytest.mark.parametrize(
+    "params, count, exists",
+    [
+        ({"application": "billing"}, 2, True),
+        ({"application": "billing", "actor": "bob"}, 1, True),
+        ({"application": "billing", "actor": "carol"}, 0, False),
+    ],
+)
+def test_counts_and_checks_audits_without_fetching_them(api, params, count, exists):
+    api.post("/v1/audit", json=_payload({"amount": 10}))
+    api.post("/v1/audit", json={**_payload({"amount": 20}), "actor": "bob"})
+
+    assert api.get("/v1/audit/count", params=params).json() == {"count": count}
+    assert api.get("/v1/audit/exists", params=params).json() == {"exists": exists}
+
+
+@pytest.mark.parametrize("path", ["/v1/audit/count", "/v1/audit/exists"])
+def test_rejects_an_inverted_date_range(api, path):
+    response = api.get(
+        path,
+        params={
+            "application": "billing",
+            "start_date": "2024-05-11",
+            "end_date": "2024-05-10",
+        },
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,42 @@
+import pytest
+
+from presentation.di_container import Container, shutdown_container
+
+
+@pytest.fixture
+def container():
+    container = Container()
+    container.init_resources()
+    yield container
+    shutdown_container(container)
+
+
+def test_shares_the_started_resources(container):
+    client = container.search_engine_client()
+
+    assert client.client is container.open_search()
+    assert container.search_audits_use_case() is container.search_audits_use_case()
+    assert container.search_audits_use_case().search_engine_client is client
+
+
+def test_closes_the_resources_on_shutdown(container):
+    open_search = container.open_search()
+    closed = []
+    open_search.close = lambda: closed.append(True)
+
+    shutdown_container(container)
+
+    assert closed == [True]
+    assert not container.open_search.initialized
+
+
+def test_never_hands_out_a_closed_client_after_a_restart(container):
+    client = container.search_engine_client()
+    use_case = container.search_audits_use_case()
+
+    shutdown_container(container)
+    container.init_resources()
+
+    assert container.search_engine_client() is not client
+    assert container.search_engine_client().client is container.open_search()
+    assert container.search_audits_use_case() is not use_case